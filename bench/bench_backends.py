@@ -0,0 +1,92 @@
+"""
+File: bench_backends.py
+Module: bench
+Function: Compare the board storage backends (src/backends.py) on the same games: mine generation, a flood
+          fill click, a numbered-cell click, the win check and single-cell reads.
+Inputs:
+    - Optional board sizes (ROWSxCOLS) on the command line.
+    - --density: mine density of the flood fill boards (low, so one click opens most of the board).
+Outputs:
+    - A table of best-of-repeat milliseconds per operation and backend, printed to stdout.
+Usage:
+    python -m bench.bench_backends
+    python -m bench.bench_backends 2000x2000 --repeat 1
+"""
+import argparse
+import time
+
+from src.backends import BACKENDS, new_game_manager
+
+DEFAULT_SIZES = ["100x100", "1000x1000"]
+DENSITY = 0.15          # Mine density for the generation / click / win check boards
+FLOOD_DENSITY = 0.01    # Sparse boards, so a click opens one large flood fill
+CELL_READS = 1000       # Cells read one at a time by the cell_reads benchmark
+
+def generated(backend, rows, cols, density):
+    """A game of the given backend with its mines placed (first click at the center)"""
+    game = new_game_manager(backend, seed=0, rows=rows, cols=cols)
+    mines = max(int(rows * cols * density), 1)
+    game.set_total_mines(mines)
+    game.total_flags = game.remaining_flag_count = mines
+    game.handle_first_click(rows // 2, cols // 2)
+    return game
+
+def click_target(game, want_zero):
+    """The first safe cell with (want_zero=True) or without 0 adjacent mines. Found through the byte counts."""
+    for index, count in enumerate(game.adjacent):
+        if (count == 0) == want_zero and not game.mines[index]:
+            return divmod(index, game.cols)
+    return (game.rows // 2, game.cols // 2)
+
+def read_cells(game):
+    """Read the hidden/flagged/mine state of CELL_READS cells spread over the board, one at a time"""
+    step = max(game.size // CELL_READS, 1)
+    for index in range(0, game.size, step):
+        game.hidden[index], game.flagged[index], game.mines[index]
+
+def cases(backend, rows, cols, density):
+    """(name, setup, run) triples for one backend and board size. Only run(setup()) is timed."""
+    def clickable(board_density, want_zero):
+        game = generated(backend, rows, cols, board_density)
+        return game, click_target(game, want_zero)
+
+    return [
+        ("generate_mines", lambda: new_game_manager(backend, seed=0, rows=rows, cols=cols),
+            lambda g: (g.set_total_mines(int(rows * cols * DENSITY)), g.generate_mines(rows // 2, cols // 2))),
+        ("click.flood_fill", lambda: clickable(density, True), lambda s: s[0].handle_clicked_cell(*s[1])),
+        ("click.number", lambda: clickable(DENSITY, False), lambda s: s[0].handle_clicked_cell(*s[1])),
+        ("check_win", lambda: generated(backend, rows, cols, DENSITY), lambda g: g.check_win()),
+        (f"cell_reads[{CELL_READS}]", lambda: generated(backend, rows, cols, DENSITY), read_cells),
+    ]
+
+def best_time(setup, run, repeat):
+    """Best-of-repeat seconds for run(setup())"""
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Board backend comparison benchmark")
+    parser.add_argument("sizes", nargs="*", default=DEFAULT_SIZES, help="board sizes as ROWSxCOLS")
+    parser.add_argument("--density", type=float, default=FLOOD_DENSITY, help="mine density of the flood fill boards")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    names = sorted(BACKENDS)
+    print(f"{'board':>12} {'operation':<18}" + "".join(f" {name + ' (ms)':>15}" for name in names))
+    for text in args.sizes:
+        rows, cols = (int(n) for n in text.lower().split("x"))
+        timings = {name: cases(name, rows, cols, args.density) for name in names}
+        for position, (operation, _, _) in enumerate(timings[names[0]]):
+            row = f"{text:>12} {operation:<18}"
+            for name in names:
+                _, setup, run = timings[name][position]
+                row += f" {best_time(setup, run, args.repeat) * 1000:>15.3f}"
+            print(row)
+
+if __name__ == "__main__":
+    main()
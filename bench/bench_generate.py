@@ -0,0 +1,78 @@
+"""
+File: bench_generate.py
+Module: bench
+Function: Time GameManager.generate_mines across board sizes and mine densities, next to the old
+          per-mine generation loop (resample on a first-click hit, then a 3x3 Python loop per mine).
+Inputs:
+    - Optional board sizes (ROWSxCOLS) and --densities on the command line.
+    - --legacy-limit: largest cell count the old loop is timed for (it gets slow on huge boards).
+Outputs:
+    - A table of seconds per generation, printed to stdout.
+Usage:
+    python -m bench.bench_generate
+    python -m bench.bench_generate 2000x2000 --densities 0.1 0.5 0.9
+"""
+import argparse
+import random
+import time
+
+from src.classes import GameManager
+
+DEFAULT_SIZES = ["100x100", "1000x1000", "3000x3000"]
+DEFAULT_DENSITIES = [0.12, 0.2, 0.5, 0.9]
+
+def legacy_generate(game, i, j):
+    """The generate_mines loop as it was before bulk generation, run against the flat buffers."""
+    rows, cols = game.rows, game.cols
+    seed_num = random.Random(game.seed)
+    mine_positions = seed_num.sample(range(rows * cols), game.total_mines)
+    while any(pos == i * cols + j for pos in mine_positions):
+        mine_positions = seed_num.sample(range(rows * cols), game.total_mines)
+    for pos in mine_positions:
+        row, col = divmod(pos, cols)
+        game.mines[pos] = 1
+        for adj_row in (-1, 0, 1):
+            for adj_col in (-1, 0, 1):
+                if adj_row == 0 and adj_col == 0:
+                    continue
+                temp_row, temp_col = row + adj_row, col + adj_col
+                if 0 <= temp_row < rows and 0 <= temp_col < cols:
+                    neighbor = temp_row * cols + temp_col
+                    if not game.mines[neighbor]:
+                        game.adjacent[neighbor] += 1
+
+def time_generation(generate, rows, cols, mines, repeat):
+    """Best-of-repeat seconds for one generation on a fresh board with the first click in the middle."""
+    best = float("inf")
+    for seed in range(repeat):
+        game = GameManager(seed=seed, rows=rows, cols=cols)
+        game.set_total_mines(mines)
+        start = time.perf_counter()
+        generate(game, rows // 2, cols // 2)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mine generation benchmark")
+    parser.add_argument("sizes", nargs="*", default=DEFAULT_SIZES, help="board sizes as ROWSxCOLS")
+    parser.add_argument("--densities", nargs="*", type=float, default=DEFAULT_DENSITIES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--legacy-limit", type=int, default=1_000_000,
+                        help="largest cell count the old loop is timed for")
+    args = parser.parse_args(argv)
+
+    print(f"{'board':>12} {'density':>8} {'mines':>10} {'legacy (s)':>11} {'bulk (s)':>10} {'speedup':>8}")
+    for text in args.sizes:
+        rows, cols = (int(n) for n in text.lower().split("x"))
+        for density in args.densities:
+            mines = min(int(rows * cols * density), rows * cols - 1)
+            bulk = time_generation(GameManager.generate_mines, rows, cols, mines, args.repeat)
+            if rows * cols <= args.legacy_limit:
+                legacy = time_generation(legacy_generate, rows, cols, mines, args.repeat)
+                legacy_text, speedup = f"{legacy:.4f}", f"{legacy / bulk:.1f}x"
+            else:
+                legacy_text, speedup = "skipped", "-"
+            print(f"{text:>12} {density:>8.2f} {mines:>10,} {legacy_text:>11} {bulk:>10.4f} {speedup:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+File: bench_input.py
+Module: bench
+Function: Measure input-to-display latency of the Frontend game loop under a synthetic burst of keys (like key
+          auto-repeat or a scroll wheel), drawing a frame per event (the old loop) vs. one frame per batch.
+          "move" bursts stay inside the viewport; "scroll" bursts scroll it on every key.
+Inputs:
+    - --burst: keys in each burst, --bursts: number of bursts, --size: board size (ROWSxCOLS)
+Outputs:
+    - Mean and worst latency from a burst arriving to each key being on screen, and frames drawn, per loop
+Usage:
+    python -m bench.bench_input
+    python -m bench.bench_input --burst 100 --size 1000x1000
+"""
+import argparse
+import curses
+import time
+
+from bench.fake_screen import FakeScreen
+from bench.run_benchmarks import generated
+from src.tui.run_tui import Frontend
+
+DENSITY = 0.15
+
+def make_frontend(rows, cols, scroll):
+    """
+    A Frontend on a FakeScreen with mines placed and one frame drawn. With scroll set the cursor starts on the
+    last visible row, so every KEY_DOWN scrolls the viewport (and needs a full redraw), like a scroll wheel.
+    """
+    fe = Frontend(FakeScreen(40, 120), rows, cols)
+    fe.attach_game(generated(rows, cols, DENSITY))
+    if scroll:
+        fe.cur_r = fe.viewport(40, 120)[2] - 1
+    fe.draw_board()
+    return fe
+
+def burst_keys(count, scroll):
+    """Held-down arrow keys: straight down when scrolling, otherwise alternating right/down inside the view"""
+    if scroll:
+        return [curses.KEY_DOWN] * count
+    return [curses.KEY_DOWN if i % 2 else curses.KEY_RIGHT for i in range(count)]
+
+def per_event_loop(fe, keys):
+    """The old loop: process and draw each event. Returns the latency of every key."""
+    fe.stdscr.push_keys(keys)
+    start = time.perf_counter()
+    latencies = []
+    frames = 0
+    for _ in keys:
+        fe.process_input(fe.get_input())
+        fe.draw_board()
+        frames += 1
+        latencies.append(time.perf_counter() - start)
+    return latencies, frames
+
+def coalesced_loop(fe, keys):
+    """The batched loop: Frontend.step() until the burst is consumed. Returns the latency of every key."""
+    fe.stdscr.push_keys(keys)
+    start = time.perf_counter()
+    latencies = []
+    frames = 0
+    while fe.stdscr.keys:
+        pending = len(fe.stdscr.keys)
+        fe.step()
+        frames += 1
+        # Every key applied in this step is on screen once the step's single frame is drawn
+        latencies += [time.perf_counter() - start] * (pending - len(fe.stdscr.keys))
+    return latencies, frames
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Frontend input latency benchmark")
+    parser.add_argument("--burst", type=int, default=60, help="keys per burst")
+    parser.add_argument("--bursts", type=int, default=5, help="number of bursts to average over")
+    parser.add_argument("--size", default="500x500", help="board size as ROWSxCOLS")
+    args = parser.parse_args(argv)
+    rows, cols = (int(n) for n in args.size.lower().split("x"))
+
+    # Worst latency is the time until the screen has caught up with the whole burst
+    print(f"{'burst':<8} {'loop':<12} {'mean latency ms':>16} {'worst latency ms':>17} {'frames/burst':>13}")
+    for scroll in (False, True):
+        for name, loop in (("per-event", per_event_loop), ("coalesced", coalesced_loop)):
+            latencies, frames = [], 0
+            for _ in range(args.bursts):
+                burst_latencies, burst_frames = loop(make_frontend(rows, cols, scroll), burst_keys(args.burst, scroll))
+                latencies += burst_latencies
+                frames += burst_frames
+            print(f"{'scroll' if scroll else 'move':<8} {name:<12} {sum(latencies) / len(latencies) * 1000:>16.2f} "
+                  f"{max(latencies) * 1000:>17.2f} {frames / args.bursts:>13.1f}")
+
+if __name__ == "__main__":
+    main()
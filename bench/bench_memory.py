@@ -0,0 +1,88 @@
+"""
+File: bench_memory.py
+Module: bench
+Function: Compare the memory used by the old list-of-lists of Cell objects against the flat buffers
+          now used by GameManager to store the board.
+Inputs:
+    - Optional board sizes on the command line (e.g. 100x100 1000x1000). Defaults to 100x100, 1000x1000, 5000x5000.
+    - --legacy-limit: largest number of cells the old layout is actually built for. Bigger boards are extrapolated
+      from the per-cell cost of the largest measured board, since building tens of millions of objects takes several GB.
+Outputs:
+    - A table of bytes used per layout, printed to stdout.
+Usage:
+    python -m bench.bench_memory
+    python -m bench.bench_memory 2000x2000 --legacy-limit 4000000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from src.classes import GameManager
+
+DEFAULT_SIZES = ["100x100", "1000x1000", "5000x5000"]
+
+class LegacyCell:
+    """Copy of the attributes the old Cell class stored per square (one full object per cell)."""
+    def __init__(self, gameManager, col, row):
+        self.state = None
+        self.adjacent = 0
+        self.hidden = True
+        self.flagged = False
+        self.row = row
+        self.col = col
+        self.manager = gameManager
+
+def measure(build):
+    """Return the number of bytes still allocated after build() runs, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    gc.collect()
+    return after - before
+
+def legacy_grid(rows, cols):
+    """Build the board the way GameManager used to: rows lists of cols Cell objects."""
+    return [[LegacyCell(None, col, row) for col in range(cols)] for row in range(rows)]
+
+def parse_size(text):
+    rows, cols = text.lower().split("x")
+    return int(rows), int(cols)
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:,.1f} {unit}"
+        n /= 1024
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Board storage memory benchmark")
+    parser.add_argument("sizes", nargs="*", default=DEFAULT_SIZES, help="board sizes as ROWSxCOLS")
+    parser.add_argument("--legacy-limit", type=int, default=1_000_000,
+                        help="largest cell count the legacy layout is built for (bigger boards are extrapolated)")
+    args = parser.parse_args(argv)
+
+    per_cell = None
+    print(f"{'board':>12} {'legacy Cell grid':>22} {'flat buffers':>14} {'ratio':>8}")
+    for text in args.sizes:
+        rows, cols = parse_size(text)
+        cells = rows * cols
+
+        flat = measure(lambda: GameManager(seed=0, rows=rows, cols=cols))
+
+        # Build the legacy grid for real when it is small enough, otherwise scale the measured per-cell cost
+        if cells <= args.legacy_limit or per_cell is None:
+            legacy = measure(lambda: legacy_grid(rows, cols))
+            per_cell = legacy / cells
+            note = ""
+        else:
+            legacy = int(per_cell * cells)
+            note = " (est.)"
+
+        print(f"{text:>12} {format_bytes(legacy) + note:>22} {format_bytes(flat):>14} {legacy / flat:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
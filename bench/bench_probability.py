@@ -0,0 +1,77 @@
+"""
+File: bench_probability.py
+Module: bench
+Function: Time the mine-probability engine on dense boards at the point where the solver gets stuck.
+Inputs:
+    - Board presets (expert = 16x30 with 99 mines, plus larger dense boards) and the number of seeds to try.
+Outputs:
+    - Per preset: the components found, the largest component, time for a cold computation
+      (empty cache) and time for a warm one (same position, cache filled), printed to stdout.
+Usage:
+    python -m bench.bench_probability
+    python -m bench.bench_probability --seeds 50
+"""
+import argparse
+import time
+
+from src.classes import GameStatus
+from src.probability import ProbabilityEngine
+from src.simulate import new_game
+from src.solver import Solver
+
+PRESETS = {
+    "expert": (16, 30, 99),
+    "dense-50": (50, 50, 500),
+    "dense-100": (100, 100, 2000),
+}
+
+def stuck_position(seed, rows, cols, mines):
+    """Play the solver's certain moves from a middle opening until no certain move is left"""
+    game = new_game(seed, rows, cols, mines)
+    solver = Solver(game)
+    solver.observe(game.handle_clicked_cell(rows // 2, cols // 2))
+    while game.game_status == GameStatus.PLAYING:
+        hint = solver.hint()
+        if hint is None:
+            break
+        solver.observe(game.handle_clicked_cell(*hint))
+    return game
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mine probability engine benchmark")
+    parser.add_argument("presets", nargs="*", default=list(PRESETS), help=f"any of {list(PRESETS)}")
+    parser.add_argument("--seeds", type=int, default=20, help="number of seeded boards per preset")
+    args = parser.parse_args(argv)
+
+    print(f"{'preset':>10} {'boards':>7} {'components':>11} {'largest':>8} {'cold ms':>9} {'warm ms':>9} {'max cold ms':>12}")
+    for name in args.presets:
+        rows, cols, mines = PRESETS[name]
+        boards = components = largest = 0
+        cold_total = warm_total = cold_max = 0.0
+        for seed in range(args.seeds):
+            game = stuck_position(seed, rows, cols, mines)
+            if game.game_status != GameStatus.PLAYING:
+                continue
+            engine = ProbabilityEngine(game)
+            found = engine.components()
+            boards += 1
+            components += len(found)
+            largest = max([largest] + [len(cells) for cells, _ in found])
+
+            start = time.perf_counter()
+            engine.compute()
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            engine.compute()
+            warm = time.perf_counter() - start
+
+            cold_total += cold
+            warm_total += warm
+            cold_max = max(cold_max, cold)
+
+        if boards:
+            print(f"{name:>10} {boards:>7} {components / boards:>11.1f} {largest:>8} "
+                  f"{cold_total / boards * 1000:>9.2f} {warm_total / boards * 1000:>9.2f} {cold_max * 1000:>12.2f}")
+
+if __name__ == "__main__":
+    main()
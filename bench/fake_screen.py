@@ -0,0 +1,51 @@
+"""
+File: fake_screen.py
+Module: bench
+Function: In-memory stand-in for a curses window, so the Frontend can be driven and timed without a terminal.
+Inputs:
+    - Screen size, and optionally a list of key codes for getch() to return
+Outputs:
+    - The text drawn at each (y, x) position, readable through text_at()
+"""
+
+class FakeScreen:
+    """
+    FakeScreen Class:
+        Implements the curses window methods the Frontend uses. Drawing is stored in a dict keyed by (y, x).
+        getch() returns queued keys and -1 (no input) once the queue is empty, like a non-blocking window.
+    """
+    def __init__(self, height=40, width=120, keys=()):
+        """Constructor function for the FakeScreen class"""
+        self.height = height
+        self.width = width
+        self.cells = {}
+        self.keys = list(keys)
+
+    def getmaxyx(self):
+        return (self.height, self.width)
+
+    def addstr(self, y, x, text, *attrs):
+        self.cells[(y, x)] = text
+
+    def erase(self):
+        self.cells.clear()
+
+    def text_at(self, y, x):
+        """Return the text last drawn at (y, x), or an empty string"""
+        return self.cells.get((y, x), "")
+
+    def getch(self):
+        return self.keys.pop(0) if self.keys else -1
+
+    def push_keys(self, keys):
+        """Queue more key codes for getch()"""
+        self.keys.extend(keys)
+
+    # Attribute, cursor and refresh calls have no visible effect on the in-memory screen
+    def attron(self, *args): pass
+    def attroff(self, *args): pass
+    def clrtoeol(self): pass
+    def refresh(self): pass
+    def keypad(self, *args): pass
+    def nodelay(self, *args): pass
+    def timeout(self, *args): pass
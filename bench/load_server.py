@@ -0,0 +1,123 @@
+"""
+File: load_server.py
+Module: bench
+Function: Load test for the game server: many concurrent clients play games through it, and the latency of
+          every moves request and the overall move throughput are measured.
+Inputs:
+    - --clients: concurrent connections, --games: games per client, --batch: moves per request,
+      --size / --mines: board settings, --unix / --port: a running server to use instead of starting one
+Outputs:
+    - p50/p99/max latency of a moves request, moves and requests per second, and the server's final stats
+      (including the CPU time it used, so its moves per CPU second do not depend on the clients' share of the CPU)
+Usage:
+    python -m bench.load_server
+    python -m bench.load_server --clients 200 --games 20 --batch 16 --size 30x30 --mines 150
+
+Unless --port or --unix is given, the server is started as a separate process (`python -m src.server --port 0`),
+so the numbers are for a server on one core, with the clients running in this process.
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+# Connection Class:
+    # One client connection, sending a request line and waiting for its response
+class Connection:
+    def __init__(self, reader, writer):
+        """Constructor function for the Connection Class"""
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, **request):
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        response = json.loads(await self.reader.readline())
+        if "error" in response:
+            raise RuntimeError(f"server error for {request.get('op')}: {response['error']}")
+        return response
+
+async def connect(args):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix, limit=1 << 20)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port, limit=1 << 20)
+    return Connection(reader, writer)
+
+async def play_client(args, client, latencies):
+    """Play this client's games: reveals of random cells not tried or seen revealed yet, `batch` per request"""
+    connection = await connect(args)
+    rng = random.Random(client)
+    cells = args.rows * args.cols
+    moves = 0
+    for game in range(args.games):
+        session = (await connection.request(op="new", rows=args.rows, cols=args.cols, mines=args.mines,
+                                            seed=client * args.games + game, safe_first_click=True))["session"]
+        tried = set()
+        status = "PLAYING"
+        while status == "PLAYING" and len(tried) < cells:
+            batch = []
+            while len(tried) < cells and len(batch) < args.batch:
+                index = rng.randrange(cells)
+                if index not in tried:
+                    tried.add(index)
+                    batch.append(["reveal", *divmod(index, args.cols)])
+            start = time.perf_counter()
+            response = await connection.request(op="moves", session=session, moves=batch)
+            latencies.append(time.perf_counter() - start)
+            tried.update(r * args.cols + c for r, c in response["revealed"])
+            status = response["status"]
+            moves += response["applied"]
+        await connection.request(op="close", session=session)
+    connection.writer.close()
+    return moves
+
+async def load_test(args):
+    latencies = []
+    start = time.perf_counter()
+    moves = sum(await asyncio.gather(*(play_client(args, client, latencies) for client in range(args.clients))))
+    elapsed = time.perf_counter() - start
+
+    connection = await connect(args)
+    stats = await connection.request(op="stats")
+    connection.writer.close()
+
+    print(f"{args.clients} clients x {args.games} games on {args.rows}x{args.cols} with {args.mines} mines, "
+          f"{args.batch} moves per request")
+    print(f"moves request latency: p50={percentile(latencies, 0.5) * 1000:.3f}ms "
+          f"p99={percentile(latencies, 0.99) * 1000:.3f}ms max={max(latencies) * 1000:.3f}ms")
+    print(f"{moves} moves in {elapsed:.2f}s: {moves / elapsed:.0f} moves/s, {len(latencies) / elapsed:.0f} requests/s")
+    print(f"server: {stats['cpu'] and stats['moves'] / stats['cpu']:.0f} moves per CPU second; {stats}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Minesweeper game server")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--games", type=int, default=10, help="games per client")
+    parser.add_argument("--batch", type=int, default=8, help="moves per request")
+    parser.add_argument("--size", default="16x30", help="board size ROWSxCOLS")
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="use the server already listening on this port")
+    parser.add_argument("--unix", default=None, help="use the server already listening on this Unix socket")
+    args = parser.parse_args(argv)
+    args.rows, args.cols = map(int, args.size.split("x"))
+
+    server = None
+    if args.port is None and args.unix is None:
+        server = subprocess.Popen([sys.executable, "-m", "src.server", "--port", "0"], stdout=subprocess.PIPE, text=True)
+        args.port = int(server.stdout.readline().rsplit(":", 1)[1])
+    try:
+        asyncio.run(load_test(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
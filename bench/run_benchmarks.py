@@ -0,0 +1,185 @@
+"""
+File: run_benchmarks.py
+Module: bench
+Function: Benchmark suite for the GameManager and Frontend hot paths. Times each operation (best of several
+          runs) and measures its peak memory with tracemalloc, saves the results as JSON, and can compare them
+          against an earlier run to fail on regressions.
+Inputs:
+    - --sizes: board sizes to run the GameManager benchmarks at (ROWSxCOLS)
+    - --output: JSON file to write the results to
+    - --baseline / --threshold: an earlier results file, and the allowed slowdown (0.25 = 25%)
+Outputs:
+    - A results table on stdout, the JSON results file, and exit code 1 if any benchmark regressed
+Usage:
+    python -m bench.run_benchmarks --output bench_results.json
+    python -m bench.run_benchmarks --baseline bench_results.json --threshold 0.25
+"""
+import argparse
+import curses
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from bench.fake_screen import FakeScreen
+from src.classes import GameManager
+from src.tui.run_tui import Frontend
+
+DEFAULT_SIZES = ["10x10", "100x100", "1000x1000"]
+DENSITY = 0.15          # Mine density for the general benchmarks
+FLOOD_DENSITY = 0.01    # Sparse boards, so a click opens one large flood fill
+
+def make_game(rows, cols, density, seed=0):
+    """A fresh game with the flag counts set up like the TUI does"""
+    game = GameManager(seed=seed, rows=rows, cols=cols)
+    mines = max(int(rows * cols * density), 1)
+    game.set_total_mines(mines)
+    game.total_flags = game.remaining_flag_count = mines
+    return game
+
+def first_cell(game, want_zero):
+    """A safe cell with (want_zero=True) or without 0 adjacent mines, for predictable clicks"""
+    for index in range(game.size):
+        if not game.mines[index] and (game.adjacent[index] == 0) == want_zero:
+            return divmod(index, game.cols)
+    return divmod(next(i for i in range(game.size) if not game.mines[i]), game.cols)
+
+def generated(rows, cols, density):
+    """A game whose mines are already placed (first click at the center)"""
+    game = make_game(rows, cols, density)
+    game.is_first_click = False
+    game.change_state(game.game_status.PLAYING)
+    game.generate_mines(rows // 2, cols // 2)
+    return game
+
+def clickable(rows, cols, density, want_zero):
+    """A generated game plus the cell to click on it"""
+    game = generated(rows, cols, density)
+    return game, first_cell(game, want_zero)
+
+def frontend(rows, cols, screen_size=(40, 120)):
+    """A Frontend on a FakeScreen with mines placed and one frame drawn"""
+    fe = Frontend(FakeScreen(*screen_size), rows, cols)
+    fe.attach_game(generated(rows, cols, DENSITY))
+    fe.draw_board()
+    return fe
+
+def benchmarks(rows, cols):
+    """(name, setup, run) triples for one board size. setup() builds fresh state; run(state) is what gets timed."""
+    size = f"{rows}x{cols}"
+    return [
+        (f"GameManager.__init__[{size}]", lambda: None, lambda _: GameManager(seed=0, rows=rows, cols=cols)),
+        (f"generate_mines[{size}]", lambda: make_game(rows, cols, DENSITY),
+            lambda g: g.generate_mines(rows // 2, cols // 2)),
+        (f"handle_clicked_cell.number[{size}]", lambda: clickable(rows, cols, DENSITY, want_zero=False),
+            lambda state: state[0].handle_clicked_cell(*state[1])),
+        (f"handle_clicked_cell.flood_fill[{size}]", lambda: clickable(rows, cols, FLOOD_DENSITY, want_zero=True),
+            lambda state: state[0].handle_clicked_cell(*state[1])),
+        (f"check_win[{size}]", lambda: generated(rows, cols, DENSITY), lambda g: g.check_win()),
+        (f"reveal_all[{size}]", lambda: generated(rows, cols, DENSITY), lambda g: g.reveal_all()),
+    ]
+
+def frontend_benchmarks():
+    """Frontend benchmarks against the in-memory screen, on a small board and one much larger than the screen"""
+    cases = []
+    for rows, cols in ((10, 10), (500, 500)):
+        size = f"{rows}x{cols}"
+
+        def full_frame(fe):
+            fe.full_redraw = True
+            fe.draw_board()
+
+        def cursor_frame(fe):
+            fe.process_input(curses.KEY_RIGHT)
+            fe.draw_board()
+
+        cases += [
+            (f"Frontend.draw_board.full[{size}]", lambda r=rows, c=cols: frontend(r, c), full_frame),
+            (f"Frontend.draw_board.cursor_move[{size}]", lambda r=rows, c=cols: frontend(r, c), cursor_frame),
+            (f"Frontend.process_input.move[{size}]", lambda r=rows, c=cols: frontend(r, c),
+                lambda fe: fe.process_input(curses.KEY_DOWN)),
+            (f"Frontend.process_input.reveal[{size}]", lambda r=rows, c=cols: frontend(r, c),
+                lambda fe: fe.process_input(ord(' '))),
+        ]
+    return cases
+
+def measure(setup, run, repeat):
+    """Best-of-repeat seconds for run(setup()), then the peak bytes allocated by one more traced run"""
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+
+    # Trace memory separately, since tracemalloc slows the code down
+    state = setup()
+    tracemalloc.start()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+# Differences smaller than these are timer/allocator noise and never count as regressions
+MIN_DELTA = {"seconds": 50e-6, "peak_bytes": 4096}
+
+def compare(results, baseline, threshold):
+    """Return a list of (name, metric, old, new) for every benchmark that got worse by more than threshold"""
+    regressions = []
+    for name, new in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if new[metric] - old[metric] < MIN_DELTA[metric]:
+                continue
+            if new[metric] > old[metric] * (1 + threshold):
+                regressions.append((name, metric, old[metric], new[metric]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GameManager / Frontend benchmark suite")
+    parser.add_argument("--sizes", nargs="*", default=DEFAULT_SIZES, help="board sizes as ROWSxCOLS")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark (the best one is kept)")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    cases = []
+    for text in args.sizes:
+        rows, cols = (int(n) for n in text.lower().split("x"))
+        cases += benchmarks(rows, cols)
+    cases += frontend_benchmarks()
+
+    results = {}
+    print(f"{'benchmark':<48} {'best ms':>10} {'peak KB':>10}")
+    for name, setup, run in cases:
+        if args.filter not in name:
+            continue
+        results[name] = measure(setup, run, args.repeat)
+        print(f"{name:<48} {results[name]['seconds'] * 1000:>10.3f} {results[name]['peak_bytes'] / 1024:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} {metric}: {old:.6g} -> {new:.6g} ({(new / old - 1) * 100:+.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.threshold:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+File: __main__.py
+Module: src
+Function: Headless command line for the game engine (`python -m src`). Never imports curses; the terminal game
+          itself is still started with `python -m src.main`.
+Inputs:
+    - A subcommand and its options:
+        play      play a list of moves on a seeded board and print the result
+        simulate  batch simulation (same options as `python -m src.simulate`)
+        bench     time board generation and the first reveal
+        infinite  play a list of moves on an infinite board and print a window of it
+Outputs:
+    - The command's results on stdout
+Usage:
+    python -m src play --seed 7 --rows 9 --cols 9 --mines 10 moves.txt
+    echo "reveal 4 4" | python -m src play --seed 7 --rows 9 --cols 9 --mines 10
+    python -m src simulate --games 10000 --policy solver
+    python -m src bench --rows 1000 --cols 1000 --mines 150000 --games 5
+    python -m src infinite --seed 7 --top -10 --left -20 --height 20 --width 40 moves.txt
+    python -m src --profile bench.folded bench --rows 1000 --cols 1000 --mines 150000
+"""
+import argparse
+import sys
+import time
+
+from src import engine
+from src.backends import BACKENDS
+from src.classes import GameStatus
+
+def add_board_arguments(parser):
+    """Board settings shared by the play and bench subcommands"""
+    parser.add_argument("--rows", type=int, default=engine.DEFAULT_ROWS)
+    parser.add_argument("--cols", type=int, default=engine.DEFAULT_COLS)
+    parser.add_argument("--mines", type=int, default=10)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=engine.DEFAULT_BACKEND)
+    parser.add_argument("--safe-first-click", action="store_true", help="keep the 3x3 block around the first click clear")
+
+def play(args):
+    """Play the moves from a file (or stdin) and print the board, status and flag count"""
+    game = engine.new_game(args.seed, args.rows, args.cols, args.mines, args.backend, args.safe_first_click)
+    if args.moves == "-":
+        engine.play_moves(game, engine.parse_moves(sys.stdin))
+    else:
+        with open(args.moves) as f:
+            engine.play_moves(game, engine.parse_moves(f))
+    print(engine.render(game))
+    print(f"status={game.game_status.name} seed={game.seed} hidden_safe_cells={game.hidden_safe_cells} "
+          f"remaining_flags={game.remaining_flag_count}")
+
+def simulate(args):
+    """Hand the remaining arguments to the simulator's own command line"""
+    # Imported here: the simulator pulls in the solver, probability engine and process pools
+    from src import simulate as simulator
+    simulator.main(args.options)
+
+def bench(args):
+    """Time a fresh game's mine generation and first reveal, best and mean over several seeds"""
+    times = []
+    for seed in range(args.games):
+        game = engine.new_game(seed, args.rows, args.cols, args.mines, args.backend, args.safe_first_click)
+        start = time.perf_counter()
+        game.handle_clicked_cell(args.rows // 2, args.cols // 2)
+        times.append(time.perf_counter() - start)
+    print(f"{args.rows}x{args.cols} mines={args.mines} backend={args.backend}: first reveal "
+          f"best={min(times) * 1000:.3f}ms mean={sum(times) / len(times) * 1000:.3f}ms over {len(times)} games")
+
+def play_infinite(board, lines):
+    """Apply the moves read from lines to an infinite board until they run out or a mine is hit"""
+    actions = {"reveal": board.reveal, "flag": board.place_flag, "unflag": board.remove_flag}
+    for move, r, c in engine.parse_moves(lines):
+        if board.game_status == GameStatus.LOSE:
+            break
+        if move not in actions:
+            raise ValueError(f"an infinite board has no {move!r} move, expected one of {sorted(actions)}")
+        actions[move](r, c)
+
+def infinite(args):
+    """Play the moves on an infinite board and print the window asked for, the status and the chunk counters"""
+    from src.infinite import CHUNK_MINES, CHUNK_SIZE, InfiniteBoard
+    chunk_size = CHUNK_SIZE if args.chunk_size is None else args.chunk_size
+    chunk_mines = CHUNK_MINES if args.chunk_mines is None else args.chunk_mines
+    with InfiniteBoard(args.seed, chunk_size, chunk_mines) as board:
+        if args.moves == "-":
+            play_infinite(board, sys.stdin)
+        else:
+            with open(args.moves) as f:
+                play_infinite(board, f)
+        print("\n".join(board.view(args.top, args.left, args.height, args.width)))
+        print(f"status={board.game_status.name} seed={board.seed} revealed={board.revealed_cells} "
+              f"flags={board.placed_flags} pending_chunks={len(board.pending_chunks)} chunks_created={board.chunks_created}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src", description="Headless Minesweeper engine tools")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="write a sampling profile of the command (collapsed stacks, plus PATH.top.txt)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play_parser = commands.add_parser("play", help="play moves ('reveal|flag|unflag|chord ROW COL' per line)")
+    add_board_arguments(play_parser)
+    play_parser.add_argument("--seed", type=int, default=0)
+    play_parser.add_argument("moves", nargs="?", default="-", help="file of moves, or - for stdin (default)")
+    play_parser.set_defaults(handler=play)
+
+    # The simulator parses its own options, so it is only imported when this subcommand runs
+    simulate_parser = commands.add_parser("simulate", add_help=False,
+                                          help="play many games with a move policy (options: python -m src simulate --help)")
+    simulate_parser.set_defaults(handler=simulate)
+
+    bench_parser = commands.add_parser("bench", help="time board generation and the first reveal")
+    add_board_arguments(bench_parser)
+    bench_parser.add_argument("--games", type=int, default=5)
+    bench_parser.set_defaults(handler=bench)
+
+    infinite_parser = commands.add_parser("infinite", help="play moves ('reveal|flag|unflag ROW COL') on an infinite board")
+    infinite_parser.add_argument("--seed", type=int, default=0)
+    # The chunk defaults live in src.infinite, which is only imported when this subcommand runs
+    infinite_parser.add_argument("--chunk-size", type=int, default=None, help="cells per chunk side (default: CHUNK_SIZE)")
+    infinite_parser.add_argument("--chunk-mines", type=int, default=None, help="mines per chunk (default: CHUNK_MINES)")
+    infinite_parser.add_argument("--top", type=int, default=-10, help="first row of the window printed")
+    infinite_parser.add_argument("--left", type=int, default=-20, help="first column of the window printed")
+    infinite_parser.add_argument("--height", type=int, default=20)
+    infinite_parser.add_argument("--width", type=int, default=40)
+    infinite_parser.add_argument("moves", nargs="?", default="-", help="file of moves, or - for stdin (default)")
+    infinite_parser.set_defaults(handler=infinite)
+
+    # Options the subcommand does not know are passed on to the simulator (and rejected for the others)
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != "simulate":
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.options = extra
+    if args.profile is None:
+        args.handler(args)
+    else:
+        from src.profiler import profiled
+        with profiled(args.profile):
+            args.handler(args)
+
+if __name__ == "__main__":
+    main()
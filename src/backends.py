@@ -0,0 +1,36 @@
+"""
+File: backends.py
+Module: src
+Function: Select which GameManager implementation (board storage backend) a game uses.
+Inputs:
+    - A backend name: "bytes" (one byte per cell, the default) or "bitboard" (big-integer bitmasks)
+Outputs:
+    - The GameManager class for that backend, or a new game manager built with it
+"""
+from src.bitboard import BitboardGameManager
+from src.classes import GameManager
+
+DEFAULT_BACKEND = "bytes"
+
+# Backend name -> GameManager class. Every backend has the same API.
+BACKENDS = {
+    "bytes": GameManager,
+    "bitboard": BitboardGameManager,
+}
+
+def game_manager_class(backend=DEFAULT_BACKEND):
+    """Return the GameManager class of the named backend"""
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}, expected one of {sorted(BACKENDS)}")
+    return BACKENDS[backend]
+
+def new_game_manager(backend=DEFAULT_BACKEND, seed=None, rows=10, cols=10, debug=False):
+    """Create a game manager with the named backend"""
+    return game_manager_class(backend)(seed=seed, rows=rows, cols=cols, debug=debug)
+
+def backend_name(game):
+    """Return the name of the backend a game manager was built with"""
+    for name, cls in BACKENDS.items():
+        if type(game) is cls:
+            return name
+    raise ValueError(f"{type(game).__name__} is not a registered backend")
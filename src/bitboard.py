@@ -0,0 +1,171 @@
+"""
+File: bitboard.py
+Module: src
+Function: A GameManager backend that keeps the mine, hidden and flagged layers as big-integer bitmasks.
+Inputs:
+    - The same arguments as GameManager
+Outputs:
+    - BitboardGameManager objects, usable anywhere a GameManager is
+
+Bit i of each mask is the cell at index i = row * cols + col (the same order as GameManager's byte buffers).
+The flood fill grows the revealed region by dilating it with shifts and masking it with the cells it may
+spread into, until nothing changes, and the win check is a single compare of the masks. Each step is a handful
+of big-integer operations that run in C over the whole board instead of a Python loop per cell.
+
+The trade-off is single-cell access: reading or writing one bit of a big integer costs time proportional to
+the board size, so code that walks the board cell by cell (the solver, rendering) is slower on this backend.
+See bench/bench_backends.py for the numbers.
+"""
+from functools import lru_cache
+
+from src.bitpack import int_to_layer, layer_to_int
+from src.classes import GameManager, GameStatus
+
+# Translation table marking the cells with 0 adjacent mines in an adjacency buffer
+ZERO_CELLS = bytes([1]) + bytes(255)
+
+# Bit masks of every cell outside the first column and outside the last column. They stop the
+    # left/right shifts of the dilation from wrapping from one row's edge onto the next row.
+@lru_cache(maxsize=2)
+def column_masks(rows, cols):
+    not_first_col = layer_to_int((b"\x00" + b"\x01" * (cols - 1)) * rows)
+    not_last_col = layer_to_int((b"\x01" * (cols - 1) + b"\x00") * rows)
+    return not_first_col, not_last_col
+
+# Returns the indices of the set bits of a mask, lowest first
+def set_bits(mask):
+    digits = format(mask, "b")[::-1]
+    positions = []
+    index = digits.find("1")
+    while index != -1:
+        positions.append(index)
+        index = digits.find("1", index + 1)
+    return positions
+
+# BitLayer Class:
+    # Indexable view of one of the manager's bitmasks, so code written against the byte buffers
+    # (layer[index], layer[index] = 1, len, iteration, bytes) keeps working on this backend.
+class BitLayer:
+    __slots__ = ("manager", "name")
+
+    def __init__(self, manager, name):
+        self.manager = manager
+        self.name = name
+
+    def __getitem__(self, index):
+        return getattr(self.manager, self.name) >> index & 1
+
+    def __setitem__(self, index, value):
+        mask = getattr(self.manager, self.name)
+        bit = 1 << index
+        setattr(self.manager, self.name, mask | bit if value else mask & ~bit)
+
+    def __len__(self):
+        return self.manager.size
+
+    def __iter__(self):
+        return iter(int_to_layer(getattr(self.manager, self.name), self.manager.size))
+
+    def __bytes__(self):
+        return bytes(int_to_layer(getattr(self.manager, self.name), self.manager.size))
+
+# BitboardGameManager Class:
+    # GameManager with bitmask layers. Adjacency counts stay in a byte buffer since they are not single bits.
+class BitboardGameManager(GameManager):
+    def __init__(self, seed=None, rows=10, cols=10, debug=False):
+        """Constructor function for the BitboardGameManager Class"""
+        # Bitmask of every cell on the board
+        self.full = (1 << (rows * cols)) - 1
+
+        # Cells with no mine and no adjacent mines: the cells a flood fill spreads from
+        self.zero_mask = 0
+
+        # GameManager.__init__ assigns the byte layers, which the property setters below turn into masks
+        super().__init__(seed=seed, rows=rows, cols=cols, debug=debug)
+
+    # The mines, hidden and flagged layers, as BitLayer views over mine_mask, hidden_mask and flagged_mask.
+        # Assigning a byte layer (as GameManager does) replaces the whole mask.
+    @property
+    def mines(self):
+        return BitLayer(self, "mine_mask")
+
+    @mines.setter
+    def mines(self, layer):
+        self.mine_mask = layer_to_int(layer)
+
+    @property
+    def hidden(self):
+        return BitLayer(self, "hidden_mask")
+
+    @hidden.setter
+    def hidden(self, layer):
+        self.hidden_mask = layer_to_int(layer)
+
+    @property
+    def flagged(self):
+        return BitLayer(self, "flagged_mask")
+
+    @flagged.setter
+    def flagged(self, layer):
+        self.flagged_mask = layer_to_int(layer)
+
+    # Places the mines like GameManager, then marks the cells the flood fill can spread from
+    def generate_mines(self, i, j):
+        super().generate_mines(i, j)
+        self.zero_mask = layer_to_int(self.adjacent.translate(ZERO_CELLS)) & ~self.mine_mask
+
+    # Installs a layout like GameManager, then marks the cells the flood fill can spread from
+    def set_layout(self, mines, adjacent):
+        super().set_layout(mines, adjacent)
+        self.zero_mask = layer_to_int(self.adjacent.translate(ZERO_CELLS)) & ~self.mine_mask
+
+    # Returns mask plus every cell touching it (its 3x3 neighborhood), clipped to the board
+    def dilate(self, mask):
+        not_first_col, not_last_col = column_masks(self.rows, self.cols)
+        row = mask | ((mask << 1) & not_first_col) | ((mask >> 1) & not_last_col)
+        return (row | (row << self.cols) | (row >> self.cols)) & self.full
+
+    def rec_reveal(self, i, j):
+        """
+        Same result as GameManager.rec_reveal: reveal (i, j) and, from every 0 cell reached, all hidden,
+        unflagged neighbors. Returns the list of (row, col) cells that were newly revealed.
+
+        Grows the region one ring at a time: only the cells added in the last step (the frontier) are
+        dilated, so each step costs a few big-integer operations however many cells it adds.
+        """
+        start = 1 << (i * self.cols + j)
+        if not self.hidden_mask & start or self.flagged_mask & start:
+            return []
+
+        # Cells the fill may reveal, and the cells it spreads from
+        open_cells = self.hidden_mask & ~self.flagged_mask
+        zero = self.zero_mask
+
+        region = frontier = start
+        while frontier:
+            frontier = self.dilate(frontier & zero) & open_cells & ~region
+            region |= frontier
+
+        # Every cell reached by the fill is safe, so they all come off the hidden safe cell count
+        self.hidden_mask &= ~region
+        self.hidden_safe_cells -= region.bit_count()
+        return [divmod(index, self.cols) for index in set_bits(region)]
+
+    # Won once every cell is either revealed or a mine
+    def check_win(self):
+        if self.game_status == GameStatus.LOSE:
+            return False
+        if self.debug:
+            super().check_win()
+        revealed = self.full ^ self.hidden_mask
+        return revealed | self.mine_mask == self.full
+
+    def count_hidden_safe_cells(self):
+        return (self.hidden_mask & ~self.mine_mask).bit_count()
+
+    # Reveal all the cells on the grid, handing every placed flag back
+    def reveal_all(self):
+        self.remaining_flag_count += self.placed_flags
+        self.placed_flags = 0
+        self.hidden_mask = 0
+        self.flagged_mask = 0
@@ -15,10 +15,13 @@ Creation Date: 9/14/2025
 NOTE: All code in the file was authored by 1 or more of the authors. No outside sources were used for code
 """
 
-# Import enum and random
+# Import Enum, random and lru_cache
 from enum import Enum
-import enum
+from functools import lru_cache
 import random
+import threading
+
+from src.events import CellsRevealed, FlagChanged, MinesGenerated, StatusChanged, batched
 
 # Create a CellState class which is used to represent the current state of the cell
     # Determines some of the behavior that Cells can have occur
@@ -55,30 +58,63 @@ class GameStatus(Enum):
     END = 5
 
 # Creates a Cell class. Each individual square on the board is a Cell.
-    # Each Cell object has its own attributes which keep track of various characteristics about the cell.
+    # A Cell is a lightweight view over the GameManager's flat board buffers. It is created on demand
+    # (e.g. by grid[r][c]) and reads/writes its attributes straight through to those buffers.
 class Cell:
+    __slots__ = ("row", "col", "index", "manager")
+
     def __init__(self, gameManager, col, row):
-        # value >= 0 --> number of mines in a 9x9 are around the cell
-        self.state : None | CellState = None
-        # Number of mines in adjacent cells
-        self.adjacent : int = 0
-        # Bool whether the cell is "hidden" or not yet visible to the player
-        self.hidden : bool = True
-        # Bool for whether the player currently has a flag on the cell
-        self.flagged : bool = False
         # The row and column indices of the Cell. Its position on the board
         self.row = row
         self.col = col
-        # The game manager object that manages the Cell
+        # Position of the Cell inside the manager's flat (row-major) buffers
+        self.index = row * gameManager.cols + col
+        # The game manager object that owns the board buffers
         self.manager = gameManager
 
+    # MINED if the Cell has a mine on it, otherwise None
+    @property
+    def state(self):
+        return CellState.MINED if self.manager.mines[self.index] else None
+
+    @state.setter
+    def state(self, value):
+        self.manager.mines[self.index] = 1 if value == CellState.MINED else 0
+
+    # Number of mines in adjacent cells
+    @property
+    def adjacent(self):
+        return self.manager.adjacent[self.index]
+
+    @adjacent.setter
+    def adjacent(self, value):
+        self.manager.adjacent[self.index] = value
+
+    # Bool whether the cell is "hidden" or not yet visible to the player
+    @property
+    def hidden(self):
+        return self.manager.hidden[self.index] == 1
+
+    @hidden.setter
+    def hidden(self, value):
+        self.manager.hidden[self.index] = 1 if value else 0
+
+    # Bool for whether the player currently has a flag on the cell
+    @property
+    def flagged(self):
+        return self.manager.flagged[self.index] == 1
+
+    @flagged.setter
+    def flagged(self, value):
+        self.manager.flagged[self.index] = 1 if value else 0
+
     # Function returning whether the Cell has been "initialized" when the game begins
     def is_valid(self):
         return True if self.adjacent >= 0 else False
     
     # Function returning a bool corresponding to whether or not the Cell contains a mine
     def has_mine(self):
-        return self.state == CellState.MINED
+        return self.manager.mines[self.index] == 1
     
     # Function returning a bool if the Cell is still hidden from the user
     def is_hidden(self):
@@ -90,7 +126,7 @@ class Cell:
     
     # Overloads how a Cell is represented as a string
     def __str__(self):
-        return "X" if self.hidden else "M" if self.state == CellState.MINED else str(self.adjacent)
+        return "X" if self.hidden else "M" if self.has_mine() else str(self.adjacent)
     
     # Overloads the text representation of a Cell
     def __repr__(self):
@@ -99,34 +135,186 @@ class Cell:
     # Function returning a bool corresponding to if the cell currently has a flag on it
     def has_flag(self):
         return self.flagged
+
+# Row of the board returned by grid[r]. Indexing it with [c] creates the Cell view for (r, c).
+class GridRow:
+    __slots__ = ("manager", "row")
+
+    def __init__(self, gameManager, row):
+        self.manager = gameManager
+        self.row = row
+
+    def __len__(self):
+        return self.manager.cols
+
+    def __getitem__(self, col):
+        cols = self.manager.cols
+        if col < 0:
+            col += cols
+        if not 0 <= col < cols:
+            raise IndexError("column index out of range")
+        return Cell(self.manager, col, self.row)
+
+    def __iter__(self):
+        for col in range(self.manager.cols):
+            yield Cell(self.manager, col, self.row)
+
+# Stand-in for the old list-of-lists of Cells so that grid[r][c], len(grid) and iteration keep working.
+    # No Cell objects are stored; they are built when indexed.
+class Grid:
+    __slots__ = ("manager",)
+
+    def __init__(self, gameManager):
+        self.manager = gameManager
+
+    def __len__(self):
+        return self.manager.rows
+
+    def __getitem__(self, row):
+        rows = self.manager.rows
+        if row < 0:
+            row += rows
+        if not 0 <= row < rows:
+            raise IndexError("row index out of range")
+        return GridRow(self.manager, row)
+
+    def __iter__(self):
+        for row in range(self.manager.rows):
+            yield GridRow(self.manager, row)
     
+# Returns the flat positions of the 3x3 block around (i, j) that lie on a rows x cols board
+def surrounding_positions(i, j, rows, cols):
+    return [r * cols + c
+            for r in range(max(i - 1, 0), min(i + 2, rows))
+            for c in range(max(j - 1, 0), min(j + 2, cols))]
+
+# Picks total_mines distinct positions out of range(size), never choosing one in excluded
+def sample_mine_positions(rng, size, total_mines, excluded=()):
+    """
+    Sample once from the size - len(excluded) allowed positions, then shift each pick past the
+    excluded positions at or below it. This never has to throw a sample away and retry, however
+    dense the board is. Gives the same positions for the same rng state every time.
+    """
+    excluded = sorted(set(excluded))
+    picks = rng.sample(range(size - len(excluded)), total_mines)
+    if not excluded:
+        return picks
+
+    positions = []
+    for pos in picks:
+        # The pick is the pos-th allowed position: step over every excluded position up to it
+        for skipped in excluded:
+            if skipped > pos:
+                break
+            pos += 1
+        positions.append(pos)
+    return positions
+
+# Masks used by count_adjacent to stop neighbor sums from wrapping from one row's edge onto the next row
+    # (each lane is 0x00 in the first/last column and 0xff elsewhere). Cached since boards are regenerated at the same size.
+@lru_cache(maxsize=2)
+def edge_masks(rows, cols):
+    not_first_col = int.from_bytes((b"\x00" + b"\xff" * (cols - 1)) * rows, "little")
+    not_last_col = int.from_bytes((b"\xff" * (cols - 1) + b"\x00") * rows, "little")
+    return not_first_col, not_last_col
+
+# Counts the mines around every cell of the board in one batched operation
+def count_adjacent(mines, rows, cols):
+    """
+    Returns a bytearray with the number of mines in the 8 neighbors of each cell.
+
+    The mine buffer (one 0/1 byte per cell) is read as a single big integer with one byte lane per
+    cell. Adding copies shifted one lane left/right (masked at the row edges) gives each cell's row
+    sum, and adding that shifted one board row up/down gives the 3x3 sum. Subtracting the mine
+    layer leaves the neighbor count. Every step is a big-integer operation, so the work is done in C
+    rather than in a Python loop per mine. Lane values never exceed 9, so lanes cannot overflow.
+    """
+    size = rows * cols
+    if size == 0:
+        return bytearray()
+
+    lane_bits = 8
+    layer = int.from_bytes(mines, "little")
+    not_first_col, not_last_col = edge_masks(rows, cols)
+
+    # Each cell plus its left and right neighbors
+    row_sum = layer + ((layer << lane_bits) & not_first_col) + ((layer >> lane_bits) & not_last_col)
+
+    # Add the row sums of the rows above and below and remove the cell itself
+    row_shift = lane_bits * cols
+    block_sum = row_sum + (row_sum << row_shift) + (row_sum >> row_shift) - layer
+
+    # The upward shift spills one row past the end of the board; drop it
+    adjacent = bytearray(block_sum.to_bytes(size + cols, "little"))
+    del adjacent[size:]
+    return adjacent
+
 # Class for a GameManager object which keeps track of what is and has happened in the game
 class GameManager:
-    def __init__(self, seed=None):
+    def __init__(self, seed=None, rows=10, cols=10, debug=False):
         """Constructor function for the GamerManager Class"""
         self.is_first_click = True
 
+        # When True, the first click also keeps its 8 neighbors free of mines (so it always opens an area)
+        self.safe_first_click = False
+
+        # In debug mode check_win cross-checks the hidden safe cell counter against a full board scan
+        self.debug = debug
+
         self.should_quit = False
 
         # Save number of rows & cols on the board
-        self.rows = 10
-        self.cols = 10
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
 
         # Save number of mines & mines left
         # Defaults to 10. We need to call set_total_mines to actually update it.
         self.total_mines = 10
         self.remaining_mine_count = self.total_mines
 
+        # Running count of cells without a mine that are still hidden. The player wins when it reaches 0.
+        self.hidden_safe_cells = self.size - self.total_mines
+
         # Set default values for the number of placed flags, total flags, and remaining flags
         self.placed_flags = 0
         self.total_flags = 0
         self.remaining_flag_count = 0
         
-        # Generate grid of Cell objects to create the game board
-        self.grid = [[Cell(self, col,row) for col in range(self.cols)] for row in range(self.rows)]
+        # Board state lives in flat, row-major buffers with one byte per cell (index = row * cols + col)
+            # mines: 1 if the cell has a mine, adjacent: number of adjacent mines,
+            # hidden: 1 while the cell is not revealed, flagged: 1 while the player has a flag on it
+        self.mines = bytearray(self.size)
+        self.adjacent = bytearray(self.size)
+        self.hidden = bytearray(b"\x01") * self.size
+        self.flagged = bytearray(self.size)
+
+        # grid[r][c] hands out Cell views over the buffers above
+        self.grid = Grid(self)
 
         # Set game state to 'WELCOME'
         self.game_status = GameStatus.WELCOME
+
+        # Optional recorder (see src/event_log.py) that player actions are written to
+        self.event_log = None
+
+        # Event subscribers (see src/events.py), and the events of the action in progress (None outside an action)
+        self.subscribers = []
+        self.pending_events = None
+
+        # Optional LayoutCache (see src/layout_cache.py) shared by games that regenerate the same seeded boards
+        self.layout_cache = None
+
+        # Pregeneration (see start_pregeneration): when pregenerate is set the board is built before the first
+            # click, with no cell excluded, and the first click only moves the mines that are in its way
+        self.pregenerate = False
+        self.pregen_thread = None
+        self.pregen_layout = None
+        self.pregen_progress = 0.0
+
+        # No-guess boards (see src/no_guess.py) are only solvable from their start cell, so the first reveal
+            # always happens there wherever the player clicks. None = the first reveal goes where it is clicked.
+        self.start_cell = None
         
         # Generate Seed 
         if seed is not None:
@@ -134,42 +322,91 @@ class GameManager:
         else:
             self.seed = random.randrange(1 << 30)
 
+    def subscribe(self, callback):
+        """Call callback(events) with the list of events (see src/events.py) of every action from now on"""
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    # Queues an event for the action in progress, or hands it to the subscribers right away outside an action
+    def emit(self, event):
+        if not self.subscribers:
+            return
+        if self.pending_events is not None:
+            self.pending_events.append(event)
+        else:
+            self.deliver([event])
+
+    def deliver(self, events):
+        for callback in list(self.subscribers):
+            callback(events)
+
+    # Returns a Cell view for the square at row r, column c
+    def cell(self, r, c):
+        return Cell(self, c, r)
+
     # Sets the number of mines equal to the number the user gives
     def set_total_mines(self, total_mines):
         self.total_mines = total_mines
         self.remaining_mine_count = total_mines
+        self.hidden_safe_cells = self.size - total_mines
 
     # Function which places a flag on a square that has yet to be revealed
+    @batched
     def place_flag(self, r, c):
+        # Record the action if this game is being logged
+        if self.event_log is not None:
+            self.event_log.flag(r, c)
+
+        index = r * self.cols + c
+
         # Checks if the user still has flags to place and if the Cell is already flagged
             # If either is true, do not place a flag
-        if self.remaining_flag_count <= 0 or self.grid[r][c].flagged:
+        if self.remaining_flag_count <= 0 or self.flagged[index]:
             return
 
         # Change the state of the Cell to represent it being flagged and update the counts of flags placed and flags remaining
-        self.grid[r][c].flagged = True
+        self.flagged[index] = 1
         self.placed_flags += 1
         self.remaining_flag_count -= 1
+        self.emit(FlagChanged(r, c, True))
 
     # Function handling flag removal. Only works if the current Cell is already flagged
+    @batched
     def remove_flag(self, r, c):
-        if not self.grid[r][c].flagged:
+        # Record the action if this game is being logged
+        if self.event_log is not None:
+            self.event_log.unflag(r, c)
+
+        index = r * self.cols + c
+        if not self.flagged[index]:
             return
 
         # Update the flagged status of the Cell and flag counts accordingly
-        self.grid[r][c].flagged = False
+        self.flagged[index] = 0
         self.placed_flags -= 1
         self.remaining_flag_count += 1
+        self.emit(FlagChanged(r, c, False))
 
     # Function used to reveal a Cell when it is left clicked
     def reveal_cell(self, r, c):
-        # Sets the Cells status to no longer be hidden and call the remove flag function
-        self.grid[r][c].hidden = False
-        self.remove_flag(r,c)
+        # Sets the Cells status to no longer be hidden and removes any flag on it
+        index = r * self.cols + c
+        if self.hidden[index] and not self.mines[index]:
+            self.hidden_safe_cells -= 1
+        self.hidden[index] = 0
+
+        # Clear the flag here rather than through remove_flag, which is a player action and gets logged
+        if self.flagged[index]:
+            self.flagged[index] = 0
+            self.placed_flags -= 1
+            self.remaining_flag_count += 1
 
     # Function which returns a bool for if a Cell at a certain position if flagged or not
     def is_flagged(self, r, c):
-        return self.grid[r][c].flagged
+        return self.flagged[r * self.cols + c] == 1
 
     # Debug function to print our cell grid
     def print_grid(self):
@@ -182,6 +419,7 @@ class GameManager:
 
     # Function used to change status of the game in the GameManager
     def change_state(self, status):
+        old = self.game_status
         match status:
             case GameStatus.WELCOME:
                 self.game_status = GameStatus.WELCOME
@@ -195,57 +433,153 @@ class GameManager:
                 self.game_status = GameStatus.END
             case _:
                 pass
+        if self.game_status != old:
+            self.emit(StatusChanged(old, self.game_status))
 
     # Function which randomly generates the mine locations and places them on the grid        
     def generate_mines(self, i, j):
-        """Randomly places mines on the grid"""
+        """
+        Randomly places mines on the grid, never on the first click at (i, j).
+        With safe_first_click set, the 3x3 block around the first click is also kept clear when the board has room.
+        The same seed, board size, mine count and first click always give the same board.
+
+        With a layout_cache set, a layout already generated for the same seed, size, mine count and first click
+        is reused instead of rebuilt. The cache keeps its buffers read-only and each game gets its own writable
+        copy (one memcpy per layer, far cheaper than generating the board).
+        """
+        if self.pregenerate:
+            self.mines, self.adjacent = self.fix_up_layout(i, j)
+            return
+        if self.layout_cache is not None:
+            key = (self.seed, self.rows, self.cols, self.total_mines, (i, j), self.safe_first_click)
+            mines, adjacent = self.layout_cache.lookup(key, lambda: self.build_layout(i, j))
+            self.mines, self.adjacent = bytearray(mines), bytearray(adjacent)
+            return
+        self.mines, self.adjacent = self.build_layout(i, j)
+
+    # Installs a finished mine layer and its adjacency counts (e.g. a layout restored from a snapshot)
+    def set_layout(self, mines, adjacent):
+        self.mines = mines
+        self.adjacent = adjacent
 
+    # Builds the mine layer and adjacency counts of the board for a first click at (i, j)
+    def build_layout(self, i, j):
         # Retrieves the number of rows and columns on the game board
-        rows = len(self.grid)
-        cols = len(self.grid[0])
+        rows = self.rows
+        cols = self.cols
 
         # Use a seeded RNG if a seed was provided, otherwise use system randomness
         seed_num = random.Random(self.seed)
 
-        # Select unique mine positions across the grid
-        mine_positions = seed_num.sample(range(rows * cols), self.total_mines)
+        # Positions that must stay mine-free: the first click, plus its neighbors if requested and possible
+        excluded = [i * cols + j]
+        if self.safe_first_click:
+            safe_zone = surrounding_positions(i, j, rows, cols)
+            if self.size - len(safe_zone) >= self.total_mines:
+                excluded = safe_zone
 
-        while(sum(1 for pos in mine_positions if pos // cols == i and pos % cols == j) >= 1): # ensure we don't create mines on first click position
-            mine_positions = seed_num.sample(range(rows * cols), self.total_mines)
+        # Select unique mine positions across the rest of the grid in a single pass
+        mine_positions = sample_mine_positions(seed_num, self.size, self.total_mines, excluded)
 
-        # Goes through all the positions where mines should be places and places a mine
+        # Place the mines, then count every cell's neighboring mines for the whole board at once
+        layer = bytearray(self.size)
         for pos in mine_positions:
-            # Convert 1D position -> (row, col)
-            row = pos // cols
-            col = pos % cols
-
-            # Place a mine
-            self.grid[row][col].state = CellState.MINED
-
-            # Update all neighbors to increase their adjacent count
-            for adj_row in [-1, 0, 1]:
-                for adj_col in [-1, 0, 1]:
-                    # Skip the mine itself
-                    if adj_row == 0 and adj_col == 0:
-                        continue
-
-                    # Uses a temporary row and column index to check if the cells neighbor is on the board
-                        # Ex: A cell in row 0 might have a "neighbor" in row -1 which is not actually a square and must be prevented from being indexed
-                    temp_row = row + adj_row
-                    temp_col = col + adj_col
-
-                    # Only update if neighbor is inside grid bounds
-                    if 0 <= temp_row < rows and 0 <= temp_col < cols:
-                        # Also do not update adjacent count if the cell has a mine.
-                        if self.grid[temp_row][temp_col].has_mine() == False:
-                            self.grid[temp_row][temp_col].adjacent += 1
+            layer[pos] = 1
+        return layer, count_adjacent(layer, rows, cols)
+
+    # Starts building the board on a background thread, so the first click does not have to wait for it
+    def start_pregeneration(self):
+        self.pregenerate = True
+        self.pregen_progress = 0.0
+        self.pregen_thread = threading.Thread(target=self.build_base_layout, daemon=True)
+        self.pregen_thread.start()
+
+    # Returns True while the background thread is still building the board
+    def pregeneration_running(self):
+        return self.pregen_thread is not None and self.pregen_thread.is_alive()
+
+    def build_base_layout(self):
+        """
+        Place the mines with no cell excluded and count the adjacency field (the expensive part of generating a
+        board, done before the first click is known). pregen_progress goes from 0 to 1 as it runs.
+        """
+        rng = random.Random(self.seed)
+        positions = rng.sample(range(self.size), self.total_mines)
+        self.pregen_progress = 0.5
+
+        layer = bytearray(self.size)
+        for pos in positions:
+            layer[pos] = 1
+        self.pregen_progress = 0.7
+
+        self.pregen_layout = (layer, count_adjacent(layer, self.rows, self.cols))
+        self.pregen_progress = 1.0
+
+    def fix_up_layout(self, i, j):
+        """
+        Finish a pregenerated board for the first click at (i, j): wait for the base layout, then move every mine
+        on the click (or, with safe_first_click and room on the board, in its 3x3 block) to a free cell drawn uniformly,
+        and patch the adjacency counts around the old and new positions. Only a few cells change, so this is cheap.
+        The same seed, board size, mine count and first click always give the same board.
+        """
+        if self.pregen_thread is not None:
+            self.pregen_thread.join()
+        if self.pregen_layout is None:
+            # Not started in the background (e.g. when replaying a log), so build it now
+            self.build_base_layout()
+        mines, adjacent = self.pregen_layout
+        self.pregen_layout = None
+
+        rows = self.rows
+        cols = self.cols
+        excluded = {i * cols + j}
+        if self.safe_first_click:
+            safe_zone = surrounding_positions(i, j, rows, cols)
+            if self.size - len(safe_zone) >= self.total_mines:
+                excluded = set(safe_zone)
+        if self.size - len(excluded) < self.total_mines:
+            raise ValueError("too many mines for the board")
+
+        rng = random.Random(self.seed * self.size + i * cols + j)
+        displaced = [pos for pos in sorted(excluded) if mines[pos]]
+
+        # Each mine moves to a cell drawn uniformly from the free ones. While at least half the board is free,
+            # drawing any cell and redrawing on a taken one needs under two draws per mine on average; denser
+            # boards list their free cells once instead.
+        free = None
+        if displaced and 2 * (self.total_mines + len(excluded)) > self.size:
+            free = [pos for pos in range(self.size) if not mines[pos] and pos not in excluded]
+        for pos in displaced:
+            if free is None:
+                target = rng.randrange(self.size)
+                while mines[target] or target in excluded:
+                    target = rng.randrange(self.size)
+            else:
+                # Swap the drawn cell with the last one so it is removed in constant time
+                pick = rng.randrange(len(free))
+                target = free[pick]
+                free[pick] = free[-1]
+                free.pop()
+
+            # Move the mine and update the counts of the cells around both positions
+            mines[pos] = 0
+            mines[target] = 1
+            for neighbor in surrounding_positions(pos // cols, pos % cols, rows, cols):
+                if neighbor != pos:
+                    adjacent[neighbor] -= 1
+            for neighbor in surrounding_positions(target // cols, target % cols, rows, cols):
+                if neighbor != target:
+                    adjacent[neighbor] += 1
+        return mines, adjacent
 
     # Function which is called when the user makes their first valid left click. This places the mines and ensures mines are only generated once
     def handle_first_click(self, i, j):
             self.is_first_click = False
             self.generate_mines(i, j)
+            self.emit(MinesGenerated(i, j))
 
     # Main function which handles the logic of when a user left clicks on a cell and tries to reveal it
+    @batched
     def handle_clicked_cell(self, i, j):
         """
         Once cell is left clicked, take the appropreate action based on the current state of the cell.
@@ -259,22 +593,29 @@ class GameManager:
                 4: A cell with 1-8 adjacent mines is picked
                     Action: Reveal just this cell
                 5: A cell with 0 adjacent mines
-                    Use recursive backtracking to continually reveal all adjacent squares with 0 mines
+                    Flood fill to reveal all connected squares with 0 mines and their numbered borders
 
         Order to check:
             Flagged? -> Already revealed? -> Has mine? -> Not 0 adj Mines? -> At least 1 adj mines?
+
+        Returns the list of (row, col) cells newly revealed by this click so callers can update just those.
+        When the click ends the game the whole board is revealed, which callers detect through game_status.
         """
 
-        # Retrieve the cell that was clicked from the grid.
-        clicked_cell = (self.grid[i][j])
+        # The first reveal of a no-guess board is moved to its start cell (before logging, so replays see it there)
+        if self.is_first_click and self.start_cell is not None:
+            i, j = self.start_cell
+
+        # Record the action if this game is being logged
+        if self.event_log is not None:
+            self.event_log.reveal(i, j)
 
-        # Determine whether the cell clicked on is still hidden and if it is flagged or not.
-        hidden_cell = clicked_cell.is_hidden()
-        is_flagged = clicked_cell.has_flag()
+        # Position of the clicked cell in the board buffers.
+        index = i * self.cols + j
 
         # If the cell has a flag on it, ignore.
-        if is_flagged == True:
-            return
+        if self.flagged[index]:
+            return []
         
         # If this is the first left click that takes an action, change the game state to playing and take the actions for the first click (set mines, etc.)
         if(self.is_first_click == True):
@@ -282,25 +623,25 @@ class GameManager:
             self.handle_first_click(i, j)
         
         # If the cell is already revealed, ignore.
-        if hidden_cell == False:
-            return
-
-        # Checks if the cell has a mine.
-        is_a_mine = clicked_cell.has_mine()
+        if not self.hidden[index]:
+            return []
 
         # If the cell is a mine, reveal all the cells, change GameStatus to LOSE.
-        if is_a_mine == True:
+        if self.mines[index]:
+            self.emit(CellsRevealed([(i, j)]))
             self.reveal_all()
             self.change_state(GameStatus.LOSE)
-            return
+            return [(i, j)]
 
         # Reveal the cell if it has at least one adjacent mine.
-        if clicked_cell.adjacent > 0:
+        if self.adjacent[index] > 0:
             # Reveal the square and its bomb count.
             self.reveal_cell(i, j)
-        # If it has no adjacent mines, recursively reveal other adjacent squares with 0 adjacent mines.
+            revealed = [(i, j)]
+        # If it has no adjacent mines, flood fill the other adjacent squares with 0 adjacent mines.
         else:
-            self.rec_reveal(i, j)
+            revealed = self.rec_reveal(i, j)
+        self.emit(CellsRevealed(revealed))
 
         # After the appropreate action has been taken, check if the user has won the game.
             # If so, change status to win showing the whole board
@@ -308,63 +649,149 @@ class GameManager:
         if self.check_win():
             self.reveal_all()
             self.change_state(GameStatus.WIN)
-            return
 
-        return
+        return revealed
     
+    @batched
+    def chord(self, i, j):
+        """
+        Chord on a revealed number at (i, j): once as many flags surround it as its number, reveal every other
+        hidden, unflagged neighbor in one batch. Neighbors with 0 adjacent mines flood fill, and the fills merge
+        (a cell one fill reached is skipped by the others). The win/loss check runs once for the whole batch.
+        A wrongly placed flag means one of the neighbors is a mine, which loses the game.
+
+        Returns the list of (row, col) cells newly revealed, like handle_clicked_cell. Does nothing (and
+        returns []) on a hidden cell, a 0 cell, or when the flag count does not match.
+        """
+
+        # Record the action if this game is being logged
+        if self.event_log is not None:
+            self.event_log.chord(i, j)
+
+        index = i * self.cols + j
+        if self.game_status != GameStatus.PLAYING or self.hidden[index] or self.adjacent[index] == 0:
+            return []
+
+        # Split the neighbors into flags and the hidden cells the chord would reveal
+        flags = 0
+        targets = []
+        for neighbor in surrounding_positions(i, j, self.rows, self.cols):
+            if self.flagged[neighbor]:
+                flags += 1
+            elif self.hidden[neighbor]:
+                targets.append(neighbor)
+        if flags != self.adjacent[index] or not targets:
+            return []
+
+        # A mine among the targets means a flag was wrong: the game is lost
+        for neighbor in targets:
+            if self.mines[neighbor]:
+                self.emit(CellsRevealed([divmod(neighbor, self.cols)]))
+                self.reveal_all()
+                self.change_state(GameStatus.LOSE)
+                return [divmod(neighbor, self.cols)]
+
+        revealed = []
+        for neighbor in targets:
+            r, c = divmod(neighbor, self.cols)
+            if self.adjacent[neighbor] > 0:
+                # Skip numbered cells an earlier fill of this chord already revealed
+                if self.hidden[neighbor]:
+                    self.reveal_cell(r, c)
+                    revealed.append((r, c))
+            else:
+                revealed += self.rec_reveal(r, c)
+        self.emit(CellsRevealed(revealed))
+
+        # One win check for the whole batch
+        if self.check_win():
+            self.reveal_all()
+            self.change_state(GameStatus.WIN)
+
+        return revealed
+
     # Checks if the player has won the game
         # If every cell without a mine has been revealed they have won, otherwise they have not.
+        # Uses the running hidden_safe_cells counter, so this is a constant-time check.
     def check_win(self):
-        for row in self.grid:
-            for cell in row:
-                if cell.is_hidden() and not cell.has_mine():
-                    return False
-        return True
+        # A lost game has its board revealed, but it is not won
+        if self.game_status == GameStatus.LOSE:
+            return False
+        if self.debug:
+            scanned = self.count_hidden_safe_cells()
+            if scanned != self.hidden_safe_cells:
+                raise RuntimeError(
+                    f"hidden safe cell counter is {self.hidden_safe_cells} but the board has {scanned}"
+                )
+        return self.hidden_safe_cells == 0
+
+    # Counts the hidden cells without a mine by scanning the whole board. Used to verify hidden_safe_cells.
+    def count_hidden_safe_cells(self):
+        # Every buffer byte is 0 or 1, so AND-ing the buffers as big integers and counting the set bits
+            # gives the number of cells that are hidden and not mined
+        hidden = int.from_bytes(self.hidden, "little")
+        mines = int.from_bytes(self.mines, "little")
+        return (hidden & ~mines).bit_count()
 
     def rec_reveal(self, i, j):
-        # Recursively reveal all the cells around the current cell that have 0 adjacent mines in the 8 nearby directions
-            # Must ensure that no out of bounds errors occur
-        
-        # Get the cell object from coordinate i,j
-        current_cell = self.grid[i][j]
+        """
+        Reveal the cell at i,j and, if it has 0 adjacent mines, every connected cell with 0 adjacent mines plus
+        the numbered cells bordering them. Returns the list of (row, col) cells that were newly revealed.
 
-        # If the cell has already been revealed, nothing needs to be done.
-        if not current_cell.hidden or current_cell.has_flag():
-            return
-        
-        # Since current cell has not been revealed, reveal it.
-        self.reveal_cell(i, j)
+        Uses an explicit stack instead of recursion, so large open areas cannot hit Python's recursion limit.
+        A cell is marked revealed as soon as it is pushed, so each cell is visited at most once.
+        """
 
-        # If the cell has an adjacent mine, do not recurse on it. Just return since it has already been revealed.
-        if current_cell.adjacent > 0:
-            return
+        # Local names for the buffers and board size (avoids repeated attribute lookups in the loop)
+        rows = self.rows
+        cols = self.cols
+        hidden = self.hidden
+        flagged = self.flagged
+        adjacent = self.adjacent
 
-        # This uses similar behavior to updating the mines counts, but instead of adding counts, calls rec_reveal on the adjacent squares, if their adjacent bomb count is also 0
-        
-        # Get the row value, col value, # of rows, # of cols
-        row = i
-        col = j
-        rows = len(self.grid)
-        cols = len(self.grid[0])
-
-        # Check the adjacent 8 cells to the current cell to see if they are in bounds, are not revealed
-            # If so, reveals it
-                # Then if that cell also has 0 adjacent mines, recursively reveal it and its neighbors
-
-        for adj_row in [-1, 0, 1]:
-            for adj_col in [-1, 0, 1]:
-            # Check to make sure not adjusting the count of where the mine is
-                if (adj_row != 0 or adj_col != 0):
-                    temp_row = row + adj_row
-                    temp_col = col + adj_col
-                    # Check if temp_row and temp_col are in bounds. If so, recursively reveal
-                    if ((0 <= temp_row < rows) and (0 <= temp_col < cols)):
-                        self.rec_reveal(temp_row, temp_col)
-        return
+        # If the cell has already been revealed or is flagged, nothing needs to be done.
+        start = i * cols + j
+        if not hidden[start] or flagged[start]:
+            return []
+
+        # Since current cell has not been revealed, reveal it.
+        hidden[start] = 0
+        stack = [start]
+        revealed = []
+
+        while stack:
+            index = stack.pop()
+            revealed.append(index)
+
+            # Numbered cells are revealed but do not spread the fill any further
+            if adjacent[index] > 0:
+                continue
+
+            # Reveal the in-bounds neighbors that are still hidden and not flagged, and queue them up
+                # Neighbors of a 0 cell can never be mines, so there is no need to check for one
+            row, col = divmod(index, cols)
+            for temp_row in range(max(row - 1, 0), min(row + 2, rows)):
+                base = temp_row * cols
+                for temp_col in range(max(col - 1, 0), min(col + 2, cols)):
+                    neighbor = base + temp_col
+                    if hidden[neighbor] and not flagged[neighbor]:
+                        hidden[neighbor] = 0
+                        stack.append(neighbor)
+
+        # Every cell reached by the fill is safe, so they all come off the hidden safe cell count
+        self.hidden_safe_cells -= len(revealed)
+        return [divmod(index, cols) for index in revealed]
 
     # Reveal all the cells on the grid. Gets called when a mine is pressed
     def reveal_all(self):
-        for row in range(self.rows):
-            for col in range(self.cols):
-                self.reveal_cell(row, col)
-        return
\ No newline at end of file
+        # Revealing a cell also removes its flag, so every placed flag is handed back
+        self.remaining_flag_count += self.placed_flags
+        self.placed_flags = 0
+
+        # hidden_safe_cells is left alone: after a loss it still counts the safe cells the player never found,
+            # so the revealed board does not read as a win
+
+        # Clear the hidden and flagged buffers in one step instead of cell by cell
+        self.hidden[:] = bytes(self.size)
+        self.flagged[:] = bytes(self.size)
+        return
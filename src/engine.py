@@ -0,0 +1,86 @@
+"""
+File: engine.py
+Module: src
+Function: Import-light entry point to the game logic, for tools that do not need the terminal UI.
+Inputs:
+    - Board settings (seed, size, mine count, backend) and player moves
+Outputs:
+    - GameManager objects, and text renderings of their boards
+
+Only the game logic is imported here (no curses, no process pools, no solver), so `import src.engine` stays fast.
+Keep it that way: test/test_engine.py fails if importing this module pulls in curses or gets slow.
+"""
+from src.backends import DEFAULT_BACKEND, new_game_manager
+from src.classes import GameStatus
+
+# Default board size, shared with the TUI
+DEFAULT_ROWS, DEFAULT_COLS = 10, 10
+
+# Move names accepted by apply_move / play_moves
+MOVES = ("reveal", "flag", "unflag", "chord")
+
+def new_game(seed=None, rows=DEFAULT_ROWS, cols=DEFAULT_COLS, mines=10, backend=DEFAULT_BACKEND,
+             safe_first_click=False):
+    """Create a game set up the same way the TUI sets one up after the mine count prompt"""
+    game = new_game_manager(backend, seed=seed, rows=rows, cols=cols)
+    game.safe_first_click = safe_first_click
+    game.set_total_mines(mines)
+    game.total_flags = mines
+    game.remaining_flag_count = mines
+    return game
+
+def apply_move(game, move, r, c):
+    """Apply one named move to a game. Returns the (row, col) cells it revealed."""
+    if not (0 <= r < game.rows and 0 <= c < game.cols):
+        raise ValueError(f"cell ({r}, {c}) is off the {game.rows}x{game.cols} board")
+    if move == "reveal":
+        return game.handle_clicked_cell(r, c)
+    if move == "chord":
+        return game.chord(r, c)
+    if move == "flag":
+        game.place_flag(r, c)
+    elif move == "unflag":
+        game.remove_flag(r, c)
+    else:
+        raise ValueError(f"unknown move {move!r}, expected one of {MOVES}")
+    return []
+
+def parse_moves(lines):
+    """
+    Parse moves written one per line as "<move> <row> <col>" (e.g. "reveal 3 4"). Blank lines and lines
+    starting with "#" are skipped. Yields (move, row, col).
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.replace(",", " ").split()
+        if len(parts) != 3 or parts[0] not in MOVES:
+            raise ValueError(f"line {number}: expected '<move> <row> <col>' with move one of {MOVES}, got {line!r}")
+        yield parts[0], int(parts[1]), int(parts[2])
+
+def play_moves(game, moves):
+    """Apply (move, row, col) moves in order until they run out or the game is decided. Returns the game."""
+    for move, r, c in moves:
+        if game.game_status in (GameStatus.WIN, GameStatus.LOSE):
+            break
+        apply_move(game, move, r, c)
+    return game
+
+def render(game):
+    """Return the board as text, one line per row: "#" hidden, "F" flagged, "*" mine, "." empty, or the count"""
+    lines = []
+    for r in range(game.rows):
+        line = []
+        for c in range(game.cols):
+            index = r * game.cols + c
+            if game.flagged[index]:
+                line.append("F")
+            elif game.hidden[index]:
+                line.append("#")
+            elif game.mines[index]:
+                line.append("*")
+            else:
+                line.append(str(game.adjacent[index]) if game.adjacent[index] else ".")
+        lines.append("".join(line))
+    return "\n".join(lines)
@@ -0,0 +1,193 @@
+"""
+File: event_log.py
+Module: src
+Function: Record a game as a compact append-only binary log and replay it deterministically.
+          A game is fully determined by its seed, settings and the sequence of player actions,
+          so the log stores exactly that: one header, then one fixed-size record per action.
+          Every call is recorded, including ones that change nothing (a reveal of a revealed cell, a second
+          flag on a flagged cell): a replay makes the same calls, which change nothing again.
+Inputs:
+    - A GameManager to record (its handle_clicked_cell, chord, place_flag and remove_flag calls)
+    - A log file to replay
+Outputs:
+    - .mslog files, and GameManager objects rebuilt from them
+
+File format (little endian):
+    header  (32 bytes): magic b"MSWL", version (u16), options (u8), pad, seed (i64),
+                        rows (u32), cols (u32), total_mines (u32), total_flags (u32)
+    records (9 bytes each): action (u8), row (u32), col (u32)
+    A partly written last record (e.g. after a crash) is ignored.
+Usage:
+    python -m src.event_log FILE...      (replays each log and prints the outcome)
+    python -m src.event_log --profile replay.folded FILE...    (also writes a sampling profile)
+"""
+import argparse
+import mmap
+import os
+import struct
+
+from src.classes import GameManager
+from src.layout_cache import LayoutCache
+from src.profiler import profiled
+
+MAGIC = b"MSWL"
+VERSION = 1
+HEADER = struct.Struct("<4sHBxqIIII")
+RECORD = struct.Struct("<BII")
+
+# Record action codes
+REVEAL = 1
+FLAG = 2
+UNFLAG = 3
+CHORD = 4
+
+# Header option bits
+OPTION_SAFE_FIRST_CLICK = 1
+OPTION_PREGENERATE = 2
+
+class EventLog:
+    """
+    EventLog Class:
+        Append-only writer for one game's log. Attach it with record_game() so the GameManager
+        writes a record for every reveal, chord and flag call.
+    """
+    def __init__(self, path, game, autoflush=False):
+        """Constructor function for the EventLog class. Writes the header from the game's current settings."""
+        self.path = path
+        self.autoflush = autoflush
+        self.file = open(path, "wb")
+        options = (OPTION_SAFE_FIRST_CLICK if game.safe_first_click else 0) | \
+                  (OPTION_PREGENERATE if game.pregenerate else 0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, options, game.seed, game.rows, game.cols,
+                                    game.total_mines, game.total_flags))
+        if autoflush:
+            self.file.flush()
+
+    def write(self, action, r, c):
+        """Append one record"""
+        self.file.write(RECORD.pack(action, r, c))
+        if self.autoflush:
+            self.file.flush()
+
+    def reveal(self, r, c):
+        self.write(REVEAL, r, c)
+
+    def flag(self, r, c):
+        self.write(FLAG, r, c)
+
+    def unflag(self, r, c):
+        self.write(UNFLAG, r, c)
+
+    def chord(self, r, c):
+        self.write(CHORD, r, c)
+
+    def close(self):
+        self.file.close()
+
+def record_game(game, path, autoflush=False):
+    """Start logging every player action of `game` to `path`. Call once the game's settings are final."""
+    game.event_log = EventLog(path, game, autoflush)
+    return game.event_log
+
+def new_game_from_header(values, layout_cache=None):
+    """Create a GameManager with the settings stored in a log header (optionally sharing a LayoutCache)"""
+    magic, version, options, seed, rows, cols, total_mines, total_flags = values
+    if magic != MAGIC:
+        raise ValueError("not a Minesweeper event log")
+    if version != VERSION:
+        raise ValueError(f"unsupported event log version {version}")
+    game = GameManager(seed=seed, rows=rows, cols=cols)
+    game.layout_cache = layout_cache
+    game.safe_first_click = bool(options & OPTION_SAFE_FIRST_CLICK)
+    game.pregenerate = bool(options & OPTION_PREGENERATE)
+    game.set_total_mines(total_mines)
+    game.total_flags = total_flags
+    game.remaining_flag_count = total_flags
+    return game
+
+def apply(game, action, r, c):
+    """Apply one recorded action to a game"""
+    if action == REVEAL:
+        game.handle_clicked_cell(r, c)
+    elif action == FLAG:
+        game.place_flag(r, c)
+    elif action == UNFLAG:
+        game.remove_flag(r, c)
+    elif action == CHORD:
+        game.chord(r, c)
+    else:
+        raise ValueError(f"unknown event log action {action}")
+
+class Replayer:
+    """
+    Replayer Class:
+        Rebuilds a game from a log. The file is memory-mapped, so records are decoded straight from the
+        page cache and even very large logs are never read into memory as a whole.
+    """
+    def __init__(self, path):
+        """Constructor function for the Replayer class"""
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        if size < HEADER.size:
+            raise ValueError("event log is too short to hold a header")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = HEADER.unpack_from(self.map, 0)
+
+        # Whole records only: a torn last record is ignored
+        self.records = (size - HEADER.size) // RECORD.size
+
+        # Seeking backwards replays from a fresh game; the cache keeps it from regenerating the same board
+        self.layouts = LayoutCache()
+        self.game = new_game_from_header(self.header, self.layouts)
+        self.position = 0
+
+    def advance(self, count=None):
+        """Apply the next `count` records (all remaining ones by default). Returns the game."""
+        end = self.records if count is None else min(self.position + count, self.records)
+        if end > self.position:
+            start = HEADER.size + self.position * RECORD.size
+            view = memoryview(self.map)[start:HEADER.size + end * RECORD.size]
+            game = self.game
+            for action, r, c in RECORD.iter_unpack(view):
+                apply(game, action, r, c)
+            view.release()
+            self.position = end
+        return self.game
+
+    def seek(self, position):
+        """Rebuild the game as it was after `position` records (replaying from the start if going back)"""
+        if position < self.position:
+            self.game = new_game_from_header(self.header, self.layouts)
+            self.position = 0
+        return self.advance(position - self.position)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def replay(path, upto=None):
+    """Return the GameManager rebuilt from a log, after `upto` records (or all of them)"""
+    with Replayer(path) as replayer:
+        return replayer.advance(upto)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay Minesweeper event logs")
+    parser.add_argument("paths", nargs="+", help=".mslog files to replay")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="write a sampling profile (collapsed stacks, plus PATH.top.txt) of this process")
+    args = parser.parse_args(argv)
+    with profiled(args.profile):
+        for path in args.paths:
+            with Replayer(path) as replayer:
+                game = replayer.advance()
+                print(f"{path}: {replayer.records} actions, seed={game.seed}, "
+                      f"{game.rows}x{game.cols} with {game.total_mines} mines -> {str(game.game_status)[11:]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+File: events.py
+Module: src
+Function: Typed game events, and the batching that groups the events of one player action.
+Inputs:
+    - Emitted by GameManager (see GameManager.subscribe)
+Outputs:
+    - Lists of events handed to each subscriber, one list per action
+Usage:
+    def on_events(events):
+        for event in events:
+            match event:
+                case CellsRevealed(cells): ...
+                case FlagChanged(row, col, flagged): ...
+                case StatusChanged(old, new): ...
+                case MinesGenerated(row, col): ...
+    game.subscribe(on_events)
+
+Every player action (a reveal, chord, flag or unflag) hands each subscriber one list with all the events it
+caused, in order, once the action is done and the board is consistent again. An event emitted outside an
+action (e.g. a status change made directly) is handed over on its own, as a list of one.
+With no subscribers nothing is collected, so games that nobody watches run as before.
+"""
+from functools import wraps
+from typing import NamedTuple
+
+# CellsRevealed Class:
+    # Cells the player's action revealed, as (row, col) pairs (not the rest of the board revealed at a win or loss)
+class CellsRevealed(NamedTuple):
+    cells: list
+
+# FlagChanged Class:
+    # A flag was placed on (flagged=True) or removed from the cell at row, col
+class FlagChanged(NamedTuple):
+    row: int
+    col: int
+    flagged: bool
+
+# StatusChanged Class:
+    # The game status changed. On a change to WIN or LOSE the whole board has been revealed.
+class StatusChanged(NamedTuple):
+    # GameStatus values (named as strings: src.classes imports this module)
+    old: "GameStatus"
+    new: "GameStatus"
+
+# MinesGenerated Class:
+    # The mines were placed, around the first reveal at row, col
+class MinesGenerated(NamedTuple):
+    row: int
+    col: int
+
+def batched(method):
+    """
+    Decorator for the GameManager methods that are player actions: the events emitted while the method runs
+    are collected and handed to the subscribers as one list when it returns.
+    """
+    @wraps(method)
+    def action(self, *args, **kwargs):
+        # Nobody listening, or already inside an action (which delivers the batch): run the method as is
+        if not self.subscribers or self.pending_events is not None:
+            return method(self, *args, **kwargs)
+        self.pending_events = []
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            events, self.pending_events = self.pending_events, None
+            if events:
+                self.deliver(events)
+    return action
@@ -0,0 +1,352 @@
+"""
+File: infinite.py
+Module: src
+Function: An unbounded ("infinite") Minesweeper board that is generated lazily, one fixed-size chunk at a time.
+Inputs:
+    - A seed, the chunk size, the number of mines per chunk and how many chunks may stay in memory
+Outputs:
+    - InfiniteBoard objects the player can reveal and flag on at any (row, col), including negative ones
+Usage:
+    python -m src.main --infinite --seed 7         (play it in the terminal, see src/tui/infinite_tui.py)
+    python -m src infinite --seed 7 moves.txt      (play moves on an infinite board and print a window of it)
+
+The mines of chunk (chunk_row, chunk_col) come from a hash of (seed, chunk_row, chunk_col), so any chunk can be
+rebuilt at any time without storing it and without generating the chunks around it first. A chunk is only
+created when a reveal, a flood fill or a view first touches it. Its adjacency counts are taken over the 3x3
+block of chunks around it, so counts along chunk borders are correct.
+
+A reveal uncovers at most fill_limit cells. When a flood fill reaches that limit, the 0 cells it uncovered but
+did not expand yet are marked in a pending layer of their chunk, and every later reveal spends what is left of
+its own limit continuing the fill from there, so a large empty area still opens completely over a few clicks.
+The pending cells live in the chunks, so they are evicted to disk with them: the board itself only remembers
+which chunks have pending cells.
+
+Only the most recently used chunks stay in memory. When one is evicted, its mines and counts are simply
+dropped (they are rebuilt from the hash), and if the player has revealed or flagged anything in it, its
+hidden, flagged and pending layers are written to disk as packed bitsets (3 * chunk_size**2 / 8 bytes).
+"""
+import hashlib
+import os
+import random
+import shutil
+import struct
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
+
+from src.bitpack import pack_layer, unpack_layer
+from src.classes import GameStatus, count_adjacent, sample_mine_positions
+
+# Defaults: 32x32 chunks with 160 mines each (about the density of an intermediate board)
+CHUNK_SIZE = 32
+CHUNK_MINES = 160
+MAX_CHUNKS = 256
+
+# A single reveal uncovers at most about this many cells. At low mine densities the empty area around a
+    # click can be unbounded, so the fill has to stop somewhere; later reveals continue it (see the docstring).
+FILL_LIMIT = 100_000
+
+# Returns the mine layer (one 0/1 byte per cell) of a chunk, derived only from the seed and the chunk position
+@lru_cache(maxsize=64)
+def chunk_mines(seed, chunk_row, chunk_col, size=CHUNK_SIZE, mines=CHUNK_MINES):
+    """
+    The chunk's RNG is seeded from a blake2b hash of (seed, chunk_row, chunk_col), so neighboring chunks get
+    unrelated mine layouts and the same chunk always gets the same one. The 3x3 block around (0, 0) is kept
+    free of mines so the first click at the origin always opens an area.
+    """
+    key = hashlib.blake2b(struct.pack("<qqq", seed, chunk_row, chunk_col), digest_size=16).digest()
+    rng = random.Random(key)
+    layer = bytearray(size * size)
+    for pos in sample_mine_positions(rng, size * size, mines):
+        row = chunk_row * size + pos // size
+        col = chunk_col * size + pos % size
+        if abs(row) <= 1 and abs(col) <= 1:
+            continue
+        layer[pos] = 1
+    return bytes(layer)
+
+# A single chunk of the board. Holds the same flat, row-major layers as GameManager for chunk_size**2 cells.
+class Chunk:
+    __slots__ = ("mines", "adjacent", "hidden", "flagged", "pending", "modified")
+
+    def __init__(self, mines, adjacent, hidden, flagged, pending):
+        self.mines = mines
+        self.adjacent = adjacent
+        self.hidden = hidden
+        self.flagged = flagged
+
+        # Uncovered 0 cells whose neighbors a fill has not uncovered yet, because it reached fill_limit
+        self.pending = pending
+
+        # True once the player has changed the hidden/flagged layers, i.e. the chunk has to be saved on eviction
+        self.modified = False
+
+# InfiniteBoard Class:
+    # The unbounded board. Cells are addressed by global (row, col); chunk (row // size, col // size) holds each one.
+class InfiniteBoard:
+    def __init__(self, seed=None, chunk_size=CHUNK_SIZE, mines_per_chunk=CHUNK_MINES, max_chunks=MAX_CHUNKS,
+                 store_dir=None, fill_limit=FILL_LIMIT):
+        """Constructor function for the InfiniteBoard Class"""
+        if not 0 <= mines_per_chunk <= chunk_size * chunk_size:
+            raise ValueError(f"mines_per_chunk must be between 0 and {chunk_size * chunk_size}")
+
+        # Eviction needs a little room: a chunk is rebuilt while the ones being worked on stay resident
+        if max_chunks < 4:
+            raise ValueError("max_chunks must be at least 4")
+
+        self.seed = seed if seed is not None else random.randrange(1 << 30)
+        self.chunk_size = chunk_size
+        self.mines_per_chunk = mines_per_chunk
+        self.max_chunks = max_chunks
+        self.fill_limit = fill_limit
+        self.game_status = GameStatus.WELCOME
+        self.placed_flags = 0
+        self.revealed_cells = 0
+
+        # Chunks (resident or evicted) with pending cells, i.e. fills cut short that later reveals continue
+        self.pending_chunks = set()
+
+        # Resident chunks, least recently used first
+        self.chunks = OrderedDict()
+
+        # Evicted chunks with player state are saved here as <chunk_row>_<chunk_col>.chunk files.
+            # Without a store_dir a temporary directory is used and removed again by close().
+        self.owns_store = store_dir is None
+        self.store_dir = tempfile.mkdtemp(prefix="minesweeper-chunks-") if store_dir is None else store_dir
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        # Counters for how often chunks were built from the hash, loaded back from disk and evicted
+        self.chunks_created = 0
+        self.chunks_loaded = 0
+        self.chunks_evicted = 0
+
+    # Returns the path of the on-disk form of a chunk
+    def chunk_path(self, chunk_row, chunk_col):
+        return os.path.join(self.store_dir, f"{chunk_row}_{chunk_col}.chunk")
+
+    # Returns the resident chunk at (chunk_row, chunk_col), creating or loading it first if needed
+    def chunk(self, chunk_row, chunk_col):
+        key = (chunk_row, chunk_col)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        # Make room before building the new chunk
+        while len(self.chunks) >= self.max_chunks:
+            self.evict()
+
+        chunk = self.build_chunk(chunk_row, chunk_col)
+        self.chunks[key] = chunk
+        return chunk
+
+    def build_chunk(self, chunk_row, chunk_col):
+        """Build a chunk from the hash, restoring the player's hidden/flagged layers from disk if it was evicted"""
+        size = self.chunk_size
+        area = size * size
+        mines = chunk_mines(self.seed, chunk_row, chunk_col, size, self.mines_per_chunk)
+
+        # Lay the 3x3 block of chunks around this one out as one board and count it in a single batched
+            # step, then keep the counts of the middle chunk. This makes counts along the chunk borders see
+            # the mines of the neighboring chunks without creating those chunks.
+        block = [[chunk_mines(self.seed, chunk_row + dr, chunk_col + dc, size, self.mines_per_chunk)
+                  for dc in (-1, 0, 1)] for dr in (-1, 0, 1)]
+        layout = bytearray()
+        for block_row in block:
+            for r in range(size):
+                for layer in block_row:
+                    layout += layer[r * size:(r + 1) * size]
+        counts = count_adjacent(layout, 3 * size, 3 * size)
+        adjacent = bytearray()
+        for r in range(size, 2 * size):
+            start = r * 3 * size + size
+            adjacent += counts[start:start + size]
+
+        path = self.chunk_path(chunk_row, chunk_col)
+        if os.path.exists(path):
+            # Reload the player's state saved when the chunk was evicted
+            with open(path, "rb") as f:
+                data = f.read()
+            packed = (area + 7) // 8
+            hidden = unpack_layer(data[:packed], area)
+            flagged = unpack_layer(data[packed:2 * packed], area)
+            pending = unpack_layer(data[2 * packed:3 * packed], area)
+            chunk = Chunk(mines, adjacent, hidden, flagged, pending)
+            chunk.modified = True
+            self.chunks_loaded += 1
+        else:
+            chunk = Chunk(mines, adjacent, bytearray(b"\x01") * area, bytearray(area), bytearray(area))
+            self.chunks_created += 1
+        return chunk
+
+    # Drops the least recently used chunk, writing it to disk first if the player has changed it
+    def evict(self):
+        (chunk_row, chunk_col), chunk = self.chunks.popitem(last=False)
+        if chunk.modified:
+            with open(self.chunk_path(chunk_row, chunk_col), "wb") as f:
+                f.write(pack_layer(chunk.hidden) + pack_layer(chunk.flagged) + pack_layer(chunk.pending))
+        self.chunks_evicted += 1
+
+    # Returns the chunk holding the cell at (r, c) and the cell's position inside that chunk's layers
+    def locate(self, r, c):
+        size = self.chunk_size
+        chunk_row, local_row = divmod(r, size)
+        chunk_col, local_col = divmod(c, size)
+        return self.chunk(chunk_row, chunk_col), local_row * size + local_col
+
+    # Functions returning the state of the cell at (r, c)
+    def has_mine(self, r, c):
+        chunk, index = self.locate(r, c)
+        return chunk.mines[index] == 1
+
+    def adjacent_count(self, r, c):
+        chunk, index = self.locate(r, c)
+        return chunk.adjacent[index]
+
+    def is_hidden(self, r, c):
+        chunk, index = self.locate(r, c)
+        return chunk.hidden[index] == 1
+
+    def is_flagged(self, r, c):
+        chunk, index = self.locate(r, c)
+        return chunk.flagged[index] == 1
+
+    # Places a flag on a hidden cell. There is no flag limit on an unbounded board.
+    def place_flag(self, r, c):
+        chunk, index = self.locate(r, c)
+        if chunk.flagged[index] or not chunk.hidden[index]:
+            return
+        chunk.flagged[index] = 1
+        chunk.modified = True
+        self.placed_flags += 1
+
+    # Removes the flag from a cell, if it has one
+    def remove_flag(self, r, c):
+        chunk, index = self.locate(r, c)
+        if not chunk.flagged[index]:
+            return
+        chunk.flagged[index] = 0
+        chunk.modified = True
+        self.placed_flags -= 1
+
+    def reveal(self, r, c):
+        """
+        Reveal the cell at (r, c) like GameManager.handle_clicked_cell: flagged or revealed cells are ignored,
+        a mine loses the game and a cell with 0 adjacent mines flood fills across chunk borders.
+        Whatever is left of the fill limit then continues the fills cut short earlier, if there are any, so
+        revealing any cell (an already revealed one included) keeps opening an area cut short earlier.
+        Returns the list of (row, col) cells newly revealed. Nothing happens once the game is lost.
+        """
+        if self.game_status == GameStatus.LOSE:
+            return []
+
+        chunk, index = self.locate(r, c)
+        revealed = []
+        if not chunk.flagged[index] and chunk.hidden[index]:
+            self.game_status = GameStatus.PLAYING
+            chunk.hidden[index] = 0
+            chunk.modified = True
+            if chunk.mines[index]:
+                self.game_status = GameStatus.LOSE
+                self.revealed_cells += 1
+                return [(r, c)]
+            revealed.append((r, c))
+            revealed += self.fill([(r, c)], self.fill_limit - 1)
+
+        # Resume the pending cells, one chunk at a time, with the rest of this reveal's limit
+        while self.pending_chunks and len(revealed) < self.fill_limit:
+            revealed += self.fill(self.take_pending(*self.pending_chunks.pop()), self.fill_limit - len(revealed))
+
+        self.revealed_cells += len(revealed)
+        return revealed
+
+    def fill(self, stack, limit):
+        """
+        Flood fill from the uncovered cells on stack, uncovering at most about limit more cells (the neighbors of
+        the last cell expanded may overshoot it by up to 8). Returns the cells uncovered. The 0 cells left
+        unexpanded once the limit is reached are marked pending in their chunks.
+        """
+        # Iterative fill with an explicit stack, marking cells revealed as they are pushed (see GameManager.rec_reveal).
+            # Chunks are looked up for every cell instead of being held on to, since the fill may evict them.
+        uncovered = []
+        while stack:
+            row, col = stack.pop()
+            if self.adjacent_count(row, col) > 0:
+                continue
+            if len(uncovered) >= limit:
+                self.mark_pending(row, col)
+                continue
+
+            # Neighbors of a 0 cell can never be mines
+            for temp_row in (row - 1, row, row + 1):
+                for temp_col in (col - 1, col, col + 1):
+                    neighbor, neighbor_index = self.locate(temp_row, temp_col)
+                    if neighbor.hidden[neighbor_index] and not neighbor.flagged[neighbor_index]:
+                        neighbor.hidden[neighbor_index] = 0
+                        neighbor.modified = True
+                        uncovered.append((temp_row, temp_col))
+                        stack.append((temp_row, temp_col))
+        return uncovered
+
+    # Marks an uncovered 0 cell whose neighbors still have to be uncovered
+    def mark_pending(self, r, c):
+        size = self.chunk_size
+        chunk, index = self.locate(r, c)
+        chunk.pending[index] = 1
+        chunk.modified = True
+        self.pending_chunks.add((r // size, c // size))
+
+    # Clears the pending cells of a chunk and returns them as (row, col) cells
+    def take_pending(self, chunk_row, chunk_col):
+        size = self.chunk_size
+        chunk = self.chunk(chunk_row, chunk_col)
+        cells = []
+        index = chunk.pending.find(1)
+        while index != -1:
+            cells.append((chunk_row * size + index // size, chunk_col * size + index % size))
+            index = chunk.pending.find(1, index + 1)
+        chunk.pending[:] = bytes(len(chunk.pending))
+        return cells
+
+    def view(self, top, left, height, width):
+        """
+        Return the window of the board with its top-left corner at (top, left) as a list of strings, one per row:
+        "#" hidden, "F" flagged, "*" revealed mine, "." revealed with no adjacent mines, otherwise the count.
+        Chunks under the window are created if they do not exist yet.
+        """
+        size = self.chunk_size
+        lines = []
+        for r in range(top, top + height):
+            chunk_row, local_row = divmod(r, size)
+            line = []
+            c = left
+            # Copy the row one chunk-wide run at a time
+            while c < left + width:
+                chunk_col, local_col = divmod(c, size)
+                chunk = self.chunk(chunk_row, chunk_col)
+                run = min(size - local_col, left + width - c)
+                base = local_row * size + local_col
+                for index in range(base, base + run):
+                    if chunk.flagged[index]:
+                        line.append("F")
+                    elif chunk.hidden[index]:
+                        line.append("#")
+                    elif chunk.mines[index]:
+                        line.append("*")
+                    else:
+                        line.append(str(chunk.adjacent[index]) if chunk.adjacent[index] else ".")
+                c += run
+            lines.append("".join(line))
+        return lines
+
+    # Removes the on-disk chunk store if this board created it
+    def close(self):
+        self.chunks.clear()
+        if self.owns_store:
+            shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
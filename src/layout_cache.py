@@ -0,0 +1,104 @@
+"""
+File: layout_cache.py
+Module: src
+Function: Bounded LRU cache of generated board layouts (mine layer + adjacency counts), so tools that replay
+          or re-simulate the same seeded boards skip regenerating them.
+Inputs:
+    - Layout keys (seed, rows, cols, total_mines, first_click, safe_first_click) and a function that builds
+      the layout on a miss
+Outputs:
+    - Shared, immutable (mines, adjacent) bytes pairs, plus hit/miss/eviction statistics
+
+Games only keep their own hidden/flagged buffers; every game started from the same key points at the same two
+bytes objects. The cache is bounded by the bytes those layouts take up, not by the number of entries, since a
+1000x1000 layout is ten thousand times the size of a 10x10 one.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+# Default memory cap: 64 MiB of cached layouts
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Returns the bytes a cached (mines, adjacent) pair takes up
+def layout_bytes(layout):
+    return sum(sys.getsizeof(layer) for layer in layout)
+
+# LayoutCache Class:
+    # Least recently used layouts are evicted first once the cached layouts exceed max_bytes.
+    # Lookups are guarded by a lock so games generated on other threads can share one cache.
+class LayoutCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """Constructor function for the LayoutCache Class"""
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key, build):
+        """
+        Return the cached (mines, adjacent) layout for key. On a miss, build() makes it and the result is
+        stored as immutable bytes. A layout bigger than the whole cap is returned without being cached.
+        """
+        with self.lock:
+            layout = self.entries.get(key)
+            if layout is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return layout
+            self.misses += 1
+
+        # Build outside the lock so other threads are not held up by a large board
+        layout = tuple(bytes(layer) for layer in build())
+        self.store(key, layout)
+        return layout
+
+    def store(self, key, layout):
+        """Add a layout to the cache, evicting the least recently used ones to stay under max_bytes"""
+        size = layout_bytes(layout)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            # Another thread may have stored the same key in the meantime
+            if key in self.entries:
+                return
+            while self.entries and self.current_bytes + size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.current_bytes -= layout_bytes(evicted)
+                self.evictions += 1
+            self.entries[key] = layout
+            self.current_bytes += size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Return the cache statistics as a dict"""
+        return {
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def __str__(self):
+        return (f"layouts={len(self.entries)} bytes={self.current_bytes} hits={self.hits} misses={self.misses} "
+                f"evictions={self.evictions} hit_rate={self.hit_rate:.2%}")
@@ -15,8 +15,12 @@ Authors:
 Date: 9/3/2025
 NOTE: All code in the file was authored by 1 or more of the authors. No outside sources were used for code
 """
+import argparse # Parses the optional command line settings (board size).
 import curses # This is our terminal interface library. It's how we setup our UI.
-from src.tui.run_tui import Frontend # This class "runs" the actual game.
+from src.backends import BACKENDS, DEFAULT_BACKEND # Board storage backends that can be picked with --backend.
+from src import metrics # Optional hot-path timings, switched on with --metrics.
+from src.profiler import profiled # Optional sampling profile of the whole session, switched on with --profile.
+from src.tui.run_tui import Frontend, ROWS, COLS # This class "runs" the actual game.
 
 def setup_curses(stdscr):
     """Setup some basic curses settings that are required for our app to function."""
@@ -28,17 +32,67 @@ def setup_curses(stdscr):
     curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
     curses.mouseinterval(150)
 
-def main(stdscr):
+def main(stdscr, rows=ROWS, cols=COLS, record_path=None, save_path=None, backend=DEFAULT_BACKEND, no_guess_dir=None,
+         spectate_path=None):
     """Initialize the UI environment and pass control to the frontend."""
-    # Setup curses, create the Frontend object, set the number of mines for the game, 
-    # refresh the UI, and start the game.
+    # Setup curses, create the Frontend object, set the number of mines for the game
+    # (unless a saved game is resumed), refresh the UI, and start the game.
     setup_curses(stdscr)
-    frontend = Frontend(stdscr)
-    frontend.set_num_mines()
+    frontend = Frontend(stdscr, rows, cols, record_path, backend, no_guess_dir, spectate_path)
+    if not (save_path and frontend.resume_game(save_path)):
+        frontend.set_num_mines()
     stdscr.refresh()
     frontend.start_game()
+    frontend.stop_recording()
+    frontend.stop_spectating()
+
+    # Keep an unfinished game so the next run with the same --save resumes it
+    if save_path:
+        frontend.save_game(save_path)
+
+def main_infinite(stdscr, seed=None):
+    """Play on an unbounded, lazily generated board (see src/infinite.py) until the player quits."""
+    # Imported here: only this mode needs the chunked board and its on-disk store
+    from src.infinite import InfiniteBoard
+    from src.tui.infinite_tui import InfiniteFrontend
+    setup_curses(stdscr)
+    with InfiniteBoard(seed) as board:
+        InfiniteFrontend(stdscr, board).run()
+
+def parse_args(argv=None):
+    """Read the optional board size from the command line. Boards larger than the terminal scroll."""
+    parser = argparse.ArgumentParser(description="Terminal Minesweeper")
+    parser.add_argument("--rows", type=int, default=ROWS, help=f"number of board rows (default {ROWS})")
+    parser.add_argument("--cols", type=int, default=COLS, help=f"number of board columns (default {COLS})")
+    parser.add_argument("--record", metavar="PATH", help="write a replayable event log of each game (see src/event_log.py)")
+    parser.add_argument("--save", metavar="PATH", help="save an unfinished game here on quit, and resume it on the next start")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND, help="board storage backend (default bytes)")
+    parser.add_argument("--no-guess", metavar="POOL_DIR", help="play boards that never need a guess, drawn from pools kept in POOL_DIR")
+    parser.add_argument("--spectate", metavar="SOCKET", help="stream the game to spectators on this Unix socket (watch with python -m src.spectate SOCKET)")
+    parser.add_argument("--profile", metavar="PATH", help="profile the session and write collapsed stacks here (and a hotspot summary to PATH.top.txt) on exit")
+    parser.add_argument("--infinite", action="store_true", help="play on an unbounded board that is generated as you explore it")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the --infinite board (random by default)")
+    parser.add_argument("--metrics", metavar="PATH", help="time the game's hot paths and write the histograms here on exit (.json for JSON, else Prometheus text)")
+    args = parser.parse_args(argv)
+    if args.rows < 1 or args.cols < 1:
+        parser.error("the board needs at least one row and one column")
+    return args
 
 # Actually run the program.
 if __name__ == "__main__":
-    # Use a curses handler function so that terminal state is restored properly on application exit.
-    curses.wrapper(main)
\ No newline at end of file
+    args = parse_args()
+    # Instrumentation is only switched on when asked for; otherwise the game runs unmeasured
+    session_metrics = metrics.enable() if args.metrics else None
+    try:
+        # Use a curses handler function so that terminal state is restored properly on application exit.
+            # The profile is written to files once the terminal is back, never to the screen.
+        with profiled(args.profile):
+            if args.infinite:
+                curses.wrapper(main_infinite, args.seed)
+            else:
+                curses.wrapper(main, args.rows, args.cols, args.record, args.save, args.backend, args.no_guess,
+                               args.spectate)
+    finally:
+        if session_metrics is not None:
+            metrics.disable()
+            session_metrics.write(args.metrics)
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""
+File: metrics.py
+Module: src
+Function: Optional instrumentation of the game's hot paths: call counts and timings kept in in-process
+          histograms, exported as JSON or Prometheus text when the game exits.
+Inputs:
+    - The GameManager classes of every backend and (optionally) the curses Frontend
+Outputs:
+    - A Metrics object holding one histogram per measurement, and its JSON / Prometheus text dumps
+Usage:
+    python -m src.main --metrics metrics.prom     (or metrics.json)
+
+    metrics = enable(frontend=False)    # headless: only the game logic is measured
+    ... play ...
+    print(metrics.to_prometheus())
+    disable()
+
+Nothing is measured until enable() is called: it swaps timing wrappers in for the measured methods on the
+classes themselves, and disable() puts the original methods back. While disabled the game runs the exact
+code it always did, so instrumentation costs nothing unless it is switched on.
+
+Measurements (each is a histogram with a count, sum, max and buckets):
+    generate_mines_seconds, handle_clicked_cell_seconds, rec_reveal_seconds, check_win_seconds,
+    reveal_all_seconds          time per call
+    rec_reveal_cells            cells revealed by one flood fill
+    rec_reveal_depth            how far one flood fill spread from its start cell (in rings of cells)
+    draw_board_seconds          frame time (Frontend.draw_frame: the rendering only, not the win/loss screen after it)
+    draw_board_curses_calls     curses calls per frame
+    process_input_seconds       latency of handling one input event
+"""
+import bisect
+import json
+import time
+from functools import wraps
+
+from src.backends import BACKENDS, game_manager_class
+
+# Bucket upper bounds: 1-2.5-5 steps from 1 microsecond to 10 seconds for timings, powers of 4 for sizes
+TIME_BUCKETS = tuple(base * 10.0 ** exponent for exponent in range(-6, 1) for base in (1, 2.5, 5)) + (10.0,)
+SIZE_BUCKETS = tuple(4 ** exponent for exponent in range(13))
+
+# Prefix of every exported metric name
+PREFIX = "minesweeper_"
+
+# Histogram Class:
+    # Counts observations into fixed buckets (each bucket counts the values <= its bound, plus one overflow bucket)
+class Histogram:
+    def __init__(self, bounds, help_text=""):
+        """Constructor function for the Histogram Class"""
+        self.bounds = bounds
+        self.help_text = help_text
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (the largest value seen, past the last bound)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {"count": self.count, "sum": self.sum, "max": self.max, "mean": self.mean,
+                "p50": self.quantile(0.5), "p99": self.quantile(0.99),
+                "buckets": {str(bound): count for bound, count in zip(self.bounds, self.buckets)},
+                "overflow": self.buckets[-1]}
+
+# Metrics Class:
+    # The histograms of one instrumented session, by measurement name
+class Metrics:
+    def __init__(self):
+        """Constructor function for the Metrics Class"""
+        self.histograms = {}
+
+        # Names of the timed calls in progress, so a method that calls its parent class's version
+        # (e.g. BitboardGameManager.generate_mines) is only measured once
+        self.active = set()
+
+    def histogram(self, name, bounds=TIME_BUCKETS, help_text=""):
+        """Return the named histogram, creating it on first use"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(bounds, help_text)
+        return histogram
+
+    def observe(self, name, value):
+        self.histograms[name].observe(value)
+
+    def to_json(self):
+        return json.dumps({name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())}, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format: one histogram (cumulative buckets, sum and count) per measurement"""
+        lines = []
+        for name, histogram in sorted(self.histograms.items()):
+            metric = PREFIX + name
+            if histogram.help_text:
+                lines.append(f"# HELP {metric} {histogram.help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, histogram.buckets):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+            lines.append(f"{metric}_sum {histogram.sum:g}")
+            lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the metrics to a file: JSON for a .json path, Prometheus text for anything else"""
+        with open(path, "w") as f:
+            f.write(self.to_json() if path.endswith(".json") else self.to_prometheus())
+
+    def __str__(self):
+        """One summary line per measurement"""
+        return "\n".join(f"{name}: count={h.count} mean={h.mean:.6g} p99<={h.quantile(0.99):.6g} max={h.max:.6g}"
+                         for name, h in sorted(self.histograms.items()))
+
+# The Metrics of the current session (None while disabled), and the (class, name, original method) patches applied
+METRICS = None
+PATCHES = []
+
+def timed(metrics, name, method, after=None):
+    """
+    Wrap a method so each call's duration is observed in the `<name>_seconds` histogram. `after` is called as
+    after(self, args, kwargs, result) to observe further measurements from the call's result.
+    """
+    seconds = metrics.histogram(name + "_seconds", help_text=f"Time per {name} call in seconds")
+    active = metrics.active
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # Nested call of the same measurement (a subclass calling its parent): only the outer call counts
+        if name in active:
+            return method(self, *args, **kwargs)
+        active.add(name)
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            seconds.observe(time.perf_counter() - start)
+            active.discard(name)
+        if after is not None:
+            after(self, args, kwargs, result)
+        return result
+    return wrapper
+
+def patch(cls, name, wrapper):
+    """Replace a method defined on cls itself, remembering the original for disable()"""
+    original = cls.__dict__[name]
+    PATCHES.append((cls, name, original))
+    setattr(cls, name, wrapper(original))
+
+def enable(metrics=None, frontend=True):
+    """
+    Start measuring into `metrics` (a new Metrics by default) and return it. With frontend=False the curses
+    frontend is left alone, so headless tools never import curses.
+    """
+    global METRICS
+    disable()
+    METRICS = metrics = metrics or Metrics()
+    cells = metrics.histogram("rec_reveal_cells", SIZE_BUCKETS, "Cells revealed by one flood fill")
+    depth = metrics.histogram("rec_reveal_depth", SIZE_BUCKETS, "Rings of cells one flood fill spread from its start")
+
+    def observe_fill(game, args, kwargs, revealed):
+        i, j = (*args, *(kwargs[name] for name in ("i", "j") if name in kwargs))
+        cells.observe(len(revealed))
+        depth.observe(max((max(abs(r - i), abs(c - j)) for r, c in revealed), default=0))
+
+    # Every backend's own versions of the measured GameManager methods
+    for cls in {game_manager_class(backend) for backend in BACKENDS}:
+        for name in ("generate_mines", "handle_clicked_cell", "check_win", "reveal_all"):
+            if name in cls.__dict__:
+                patch(cls, name, lambda method, name=name: timed(metrics, name, method))
+        if "rec_reveal" in cls.__dict__:
+            patch(cls, "rec_reveal", lambda method: timed(metrics, "rec_reveal", method, observe_fill))
+
+    if frontend:
+        # Imported here: the frontend pulls in curses
+        from src.tui.run_tui import Frontend
+        calls = metrics.histogram("draw_board_curses_calls", SIZE_BUCKETS, "Curses calls per frame")
+        # Only the frame itself is timed: draw_board goes on to the win/loss screen, which waits for the player
+        patch(Frontend, "draw_frame",
+              lambda method: timed(metrics, "draw_board", method,
+                                   lambda ui, args, kwargs, result: calls.observe(ui.frame_calls)))
+        patch(Frontend, "process_input", lambda method: timed(metrics, "process_input", method))
+    return metrics
+
+def disable():
+    """Stop measuring and put the original methods back. Returns the Metrics collected (or None)."""
+    global METRICS
+    while PATCHES:
+        cls, name, original = PATCHES.pop()
+        setattr(cls, name, original)
+    metrics, METRICS = METRICS, None
+    return metrics
@@ -0,0 +1,222 @@
+"""
+File: no_guess.py
+Module: src
+Function: No-guess boards: layouts the solver can finish from their start cell without ever guessing,
+          kept in an on-disk pool per board configuration and refilled by a process pool.
+Inputs:
+    - A board configuration (rows, cols, mines) and the directory the pools are kept in
+Outputs:
+    - Pool files, and (seed, start cell) pairs that games are started from
+Usage:
+    python -m src.no_guess POOL_DIR --rows 16 --cols 30 --mines 99 --count 200
+        (fills the pool to 200 boards and prints the generation rate)
+    python -m src.no_guess POOL_DIR --workers 1 --profile fill.folded
+        (also writes a sampling profile, see src/profiler.py)
+
+A board is fully determined by its seed, settings and first click (with safe_first_click on), so a pool entry
+only has to store the seed and the start cell: 16 bytes per board, whatever its size. Finding one takes many
+generate-and-solve attempts; the game that draws it only regenerates that one layout.
+
+Pool file format: <POOL_DIR>/no_guess-<rows>x<cols>-<mines>.pool, a sequence of records (little endian):
+    seed (i64), start_row (u32), start_col (u32)
+Boards are taken from the end of the file, which is then truncated, so the pool never has to be rewritten.
+"""
+import argparse
+import os
+import random
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src import engine
+from src.classes import GameStatus
+from src.profiler import profiled
+from src.solver import Solver
+
+RECORD = struct.Struct("<qII")
+
+# Seeds are drawn from the same range as GameManager's own random seeds
+SEED_RANGE = 1 << 30
+
+def new_no_guess_game(seed, rows, cols, mines, start=None):
+    """Create a game set up like the TUI does, with the 3x3 block around the start cell kept free of mines"""
+    game = engine.new_game(seed, rows, cols, mines, safe_first_click=True)
+    game.start_cell = start
+    return game
+
+def start_cell_for(seed, rows, cols):
+    """The start cell tried for a seed (random, but fixed by the seed)"""
+    rng = random.Random(seed)
+    return rng.randrange(rows), rng.randrange(cols)
+
+def is_no_guess(seed, rows, cols, mines):
+    """Return the start cell if the solver can win the seed's board from it without guessing, otherwise None"""
+    start = start_cell_for(seed, rows, cols)
+    game = new_no_guess_game(seed, rows, cols, mines)
+    solver = Solver(game)
+    solver.observe(game.handle_clicked_cell(*start))
+    while game.game_status == GameStatus.PLAYING:
+        hint = solver.hint()
+        if hint is None:
+            return None
+        solver.observe(game.handle_clicked_cell(*hint))
+    return start if game.game_status == GameStatus.WIN else None
+
+def search(seeds, rows, cols, mines):
+    """Worker entry point: try every seed in the range and return the no-guess (seed, row, col) records found"""
+    found = []
+    for seed in seeds:
+        start = is_no_guess(seed, rows, cols, mines)
+        if start is not None:
+            found.append((seed, *start))
+    return found
+
+# NoGuessPool Class:
+    # The pool of no-guess boards for one board configuration, plus generation and hit statistics
+class NoGuessPool:
+    def __init__(self, pool_dir, rows, cols, mines):
+        """Constructor function for the NoGuessPool Class"""
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        os.makedirs(pool_dir, exist_ok=True)
+        self.path = os.path.join(pool_dir, f"no_guess-{rows}x{cols}-{mines}.pool")
+
+        # The pool file is shared by take() and the background refill thread
+        self.lock = threading.Lock()
+        self.refill_thread = None
+
+        # Statistics: boards taken from the pool vs. generated on the spot, and generation work done
+        self.hits = 0
+        self.misses = 0
+        self.attempts = 0
+        self.generated = 0
+        self.generate_seconds = 0.0
+
+    def __len__(self):
+        """Number of boards in the pool"""
+        try:
+            return os.path.getsize(self.path) // RECORD.size
+        except FileNotFoundError:
+            return 0
+
+    def add(self, records):
+        """Append (seed, start_row, start_col) records to the pool"""
+        with self.lock, open(self.path, "ab") as f:
+            f.write(b"".join(RECORD.pack(*record) for record in records))
+
+    def pop(self):
+        """Remove and return the last record of the pool, or None if it is empty"""
+        with self.lock:
+            try:
+                f = open(self.path, "r+b")
+            except FileNotFoundError:
+                return None
+            with f:
+                end = f.seek(0, os.SEEK_END) // RECORD.size * RECORD.size
+                if end == 0:
+                    return None
+                f.seek(end - RECORD.size)
+                record = RECORD.unpack(f.read(RECORD.size))
+                f.truncate(end - RECORD.size)
+                return record
+
+    def take(self):
+        """
+        Return (seed, (start_row, start_col)) for a no-guess board. Boards come from the pool when it has one
+        (a hit); otherwise one is searched for right here (a miss), which is what the pool exists to avoid.
+        """
+        record = self.pop()
+        if record is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            start = time.perf_counter()
+            attempts = 0
+            while record is None:
+                seed = random.randrange(SEED_RANGE)
+                attempts += 1
+                found = is_no_guess(seed, self.rows, self.cols, self.mines)
+                if found is not None:
+                    record = (seed, *found)
+            self.record_generation(attempts, 1, time.perf_counter() - start)
+        seed, row, col = record
+        return seed, (row, col)
+
+    def new_game(self):
+        """Take a board and return a GameManager for it, with its start cell set"""
+        seed, start = self.take()
+        return new_no_guess_game(seed, self.rows, self.cols, self.mines, start)
+
+    def record_generation(self, attempts, generated, seconds):
+        self.attempts += attempts
+        self.generated += generated
+        self.generate_seconds += seconds
+
+    def fill(self, target, workers=None, batch_size=50, seed=None):
+        """
+        Search for no-guess boards on a process pool until the pool holds `target` boards.
+        With a seed the searched seeds (and so the boards found) are reproducible.
+        """
+        rng = random.Random(seed)
+        workers = workers or os.cpu_count() or 1
+        start = time.perf_counter()
+        attempts = generated = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while len(self) < target:
+                # One round of batches across every worker, each from a random run of seeds
+                bases = [rng.randrange(SEED_RANGE - batch_size) for _ in range(workers)]
+                futures = [pool.submit(search, range(base, base + batch_size), self.rows, self.cols, self.mines)
+                           for base in bases]
+                for future in futures:
+                    found = future.result()
+                    attempts += batch_size
+                    generated += len(found)
+                    self.add(found[:max(target - len(self), 0)])
+        self.record_generation(attempts, generated, time.perf_counter() - start)
+
+    def refill_async(self, minimum, target, workers=None):
+        """Refill the pool to `target` in the background once it drops below `minimum` (one refill at a time)"""
+        if len(self) >= minimum or (self.refill_thread is not None and self.refill_thread.is_alive()):
+            return
+        self.refill_thread = threading.Thread(target=self.fill, args=(target, workers), daemon=True)
+        self.refill_thread.start()
+
+    @property
+    def hit_rate(self):
+        taken = self.hits + self.misses
+        return self.hits / taken if taken else 0.0
+
+    @property
+    def generation_rate(self):
+        """No-guess boards found per second of generation"""
+        return self.generated / self.generate_seconds if self.generate_seconds else 0.0
+
+    def __str__(self):
+        solvable = self.generated / self.attempts if self.attempts else 0.0
+        return (f"pool={len(self)} generated={self.generated} attempts={self.attempts} "
+                f"solvable={solvable:.2%} rate={self.generation_rate:.1f}/s "
+                f"hits={self.hits} misses={self.misses} hit_rate={self.hit_rate:.2%}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill a pool of no-guess Minesweeper boards")
+    parser.add_argument("pool_dir", help="directory the pool files are kept in")
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--count", type=int, default=100, help="number of boards the pool should hold")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=None, help="make the searched seeds reproducible")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="write a sampling profile (collapsed stacks, plus PATH.top.txt) of this process; "
+                             "use --workers 1 to profile the search itself")
+    args = parser.parse_args(argv)
+
+    pool = NoGuessPool(args.pool_dir, args.rows, args.cols, args.mines)
+    with profiled(args.profile):
+        pool.fill(args.count, args.workers, seed=args.seed)
+    print(pool)
+
+if __name__ == "__main__":
+    main()
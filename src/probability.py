@@ -0,0 +1,322 @@
+"""
+File: probability.py
+Module: src
+Function: Exact per-cell mine probabilities for a GameManager board, for when no certain move exists.
+Inputs:
+    - A GameManager (and optionally the Solver already tracking its frontier)
+Outputs:
+    - A ProbabilityMap giving the chance that each hidden cell holds a mine
+
+How it works:
+    1. The Solver settles every certain cell first, so only the genuinely uncertain frontier is left.
+    2. The frontier cells are split into independent components: two cells are in the same component
+       when some revealed number constrains both of them.
+    3. Each component is counted on its own with a forward/backward dynamic program over its cells.
+       The state is the number of mines each partly-assigned constraint still needs. For every possible
+       mine count k it records how many arrangements exist and how often each cell is a mine.
+       Results are memoized by the component's shape, so components a move did not touch are free.
+    4. Components are combined with the global total_mines constraint: an arrangement that uses K
+       frontier mines leaves C(other cells, remaining mines - K) ways to place the rest. All counting
+       is done with exact Python integers and only divided at the very end.
+"""
+from collections import OrderedDict, deque
+from math import comb
+
+from src.classes import GameStatus
+from src.solver import Solver
+
+class ProbabilityMap:
+    """
+    ProbabilityMap Class:
+        Result of a probability computation. Frontier cells have their own probabilities; every other
+        hidden cell shares the same probability (other_probability).
+    """
+    def __init__(self, game, cells, other_probability, exact=True):
+        """Constructor function for the ProbabilityMap class"""
+        self.game = game
+        self.cells = cells                          # flat index -> probability for frontier/known cells
+        self.other_probability = other_probability  # probability for hidden cells no number touches
+        self.exact = exact                          # False if an oversized component had to be estimated
+
+    def probability(self, r, c):
+        """Chance that the cell at (r, c) holds a mine (0.0 for revealed cells)"""
+        index = r * self.game.cols + c
+        if not self.game.hidden[index]:
+            return 0.0
+        return self.cells.get(index, self.other_probability)
+
+    def safest(self):
+        """Return the hidden (row, col) cell least likely to hold a mine"""
+        hidden = self.game.hidden
+        best = min(((p, index) for index, p in self.cells.items() if hidden[index]), default=None)
+        if self.other_probability is not None and (best is None or self.other_probability < best[0]):
+            # Any hidden cell away from the frontier will do
+            for index in range(self.game.size):
+                if hidden[index] and index not in self.cells:
+                    return divmod(index, self.game.cols)
+        return divmod(best[1], self.game.cols) if best else None
+
+class ProbabilityEngine:
+    """
+    ProbabilityEngine Class:
+        Computes mine probabilities for one game, memoizing component counts between calls.
+    """
+    def __init__(self, game, solver=None, cache_size=4096, max_component_cells=400):
+        """Constructor function for the ProbabilityEngine class"""
+        self.game = game
+        self.solver = solver if solver is not None else Solver(game)
+        self.cache = OrderedDict()      # component shape -> (totals by mine count, per-cell counts by mine count)
+        self.cache_size = cache_size
+        self.max_component_cells = max_component_cells
+        self.hits = 0
+        self.misses = 0
+
+    def components(self):
+        """Split the uncertain frontier into independent (cells, constraints) components"""
+        solver = self.solver
+        solver.solve()
+
+        # Gather the still-uncertain constraints and union their cells together
+        constraints = []
+        parent = {}
+
+        def find(cell):
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+
+        for index in solver.frontier:
+            unknown, mines = solver.constraint(index)
+            if not unknown:
+                continue
+            constraints.append((unknown, mines))
+            cells = iter(unknown)
+            root = next(cells)
+            parent.setdefault(root, root)
+            root = find(root)
+            for cell in cells:
+                parent.setdefault(cell, cell)
+                other = find(cell)
+                if other != root:
+                    parent[other] = root
+
+        # Group the constraints (and their cells) by component root
+        groups = {}
+        for unknown, mines in constraints:
+            cells, cons = groups.setdefault(find(next(iter(unknown))), (set(), set()))
+            cells.update(unknown)
+            cons.add((tuple(sorted(unknown)), mines))
+        return [(sorted(cells), sorted(cons)) for cells, cons in groups.values()]
+
+    def count_component(self, cells, constraints):
+        """
+        Count the arrangements of one component. Returns (totals, cell_counts) where totals[k] is the number
+        of valid arrangements with k mines and cell_counts[k][i] how many of those put a mine on cells[i].
+        """
+        # Memoize on the component's shape relative to its first cell, so the same pattern anywhere hits the cache
+        base = cells[0]
+        key = (tuple(cell - base for cell in cells),
+               tuple((tuple(cell - base for cell in cons), mines) for cons, mines in constraints))
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        self.misses += 1
+
+        n = len(cells)
+        position = {cell: i for i, cell in enumerate(cells)}
+        var_constraints = [[] for _ in range(n)]
+        for ci, (cons, _) in enumerate(constraints):
+            for cell in cons:
+                var_constraints[position[cell]].append(ci)
+
+        # Visit cells in breadth-first order over shared constraints, so each constraint is only "open"
+        # (partly assigned) for a short stretch of the order and the DP state below stays small
+        order, seen = [], set()
+        for start in range(n):
+            if start in seen:
+                continue
+            seen.add(start)
+            queue = deque([start])
+            while queue:
+                v = queue.popleft()
+                order.append(v)
+                for ci in var_constraints[v]:
+                    for cell in constraints[ci][0]:
+                        w = position[cell]
+                        if w not in seen:
+                            seen.add(w)
+                            queue.append(w)
+
+        # For each constraint: the first and last step of the order that assigns one of its cells,
+        # and how many of its cells are still unassigned after each step
+        step_of = {v: step for step, v in enumerate(order)}
+        first = [n] * len(constraints)
+        last = [-1] * len(constraints)
+        for step, v in enumerate(order):
+            for ci in var_constraints[v]:
+                first[ci] = min(first[ci], step)
+                last[ci] = max(last[ci], step)
+        left_after = {}
+        for ci, (cons, _) in enumerate(constraints):
+            steps = sorted(step_of[position[cell]] for cell in cons)
+            for i, step in enumerate(steps):
+                left_after[ci, step] = len(steps) - i - 1
+
+        # Constraints that are partly assigned at each boundary (after `b` steps), in a fixed order.
+        # The DP state at a boundary is the number of mines each of these still needs.
+        open_at = [[ci for ci in range(len(constraints)) if first[ci] < b <= last[ci]] for b in range(n + 1)]
+
+        def advance(b, state, value):
+            """Assign `value` to the cell at step b. Returns the state at boundary b + 1, or None if invalid."""
+            needs = dict(zip(open_at[b], state))
+            for ci in var_constraints[order[b]]:
+                need = needs.get(ci, constraints[ci][1]) - value
+                if need < 0 or need > left_after[ci, b]:
+                    return None
+                needs[ci] = need
+            return tuple(needs[ci] for ci in open_at[b + 1])
+
+        # Forward pass: forward[b][(state, k)] = ways to assign the first b cells with k mines
+        forward = [{((), 0): 1}]
+        for b in range(n):
+            layer = {}
+            for (state, k), count in forward[b].items():
+                for value in (0, 1):
+                    after = advance(b, state, value)
+                    if after is not None:
+                        key_after = (after, k + value)
+                        layer[key_after] = layer.get(key_after, 0) + count
+            forward.append(layer)
+
+        # Backward pass: backward[b][state][k] = ways to finish from boundary b using k more mines
+        backward = [None] * n + [{(): {0: 1}}]
+        for b in range(n - 1, -1, -1):
+            layer = {}
+            for state in {state for state, _ in forward[b]}:
+                ways = {}
+                for value in (0, 1):
+                    after = advance(b, state, value)
+                    if after is None or after not in backward[b + 1]:
+                        continue
+                    for k, count in backward[b + 1][after].items():
+                        ways[k + value] = ways.get(k + value, 0) + count
+                if ways:
+                    layer[state] = ways
+            backward[b] = layer
+
+        # Combine the passes: arrangements by mine count, and how often each cell is a mine among them
+        totals = [0] * (n + 1)
+        for (state, k), count in forward[n].items():
+            totals[k] += count
+        cell_counts = [[0] * n for _ in range(n + 1)]
+        for b in range(n):
+            v = order[b]
+            for (state, k), count in forward[b].items():
+                after = advance(b, state, 1)
+                if after is None or after not in backward[b + 1]:
+                    continue
+                for k_rest, rest in backward[b + 1][after].items():
+                    cell_counts[k + 1 + k_rest][v] += count * rest
+
+        result = (totals, cell_counts)
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def estimate_component(self, cells, constraints):
+        """
+        Fallback for components too large to enumerate: give each cell the highest local density
+        (mines needed / cells) among its constraints and treat the component as one block.
+        """
+        density = {}
+        for cons, mines in constraints:
+            for cell in cons:
+                density[cell] = max(density.get(cell, 0.0), mines / len(cons))
+        return density
+
+    def compute(self):
+        """Compute the mine probability of every hidden cell and return a ProbabilityMap"""
+        game = self.game
+        solver = self.solver
+        components = self.components()
+
+        # Certain cells come straight from the solver
+        cells = {index: 1.0 for index in solver.known_mines}
+        cells.update((index, 0.0) for index in solver.known_safe)
+
+        exact = True
+        counted = []
+        frontier_cells = 0
+        estimated_mines = 0.0
+        for comp_cells, constraints in components:
+            frontier_cells += len(comp_cells)
+            if len(comp_cells) > self.max_component_cells:
+                exact = False
+                density = self.estimate_component(comp_cells, constraints)
+                cells.update(density)
+                estimated_mines += sum(density.values())
+                continue
+            counted.append((comp_cells, *self.count_component(comp_cells, constraints)))
+
+        # Cells no number touches, and the mines that must be somewhere on the board but not yet located
+        # (read from the counters, not a board scan: while the game runs every mine is still hidden,
+            # and a finished game has its whole board revealed)
+        if game.game_status in (GameStatus.WIN, GameStatus.LOSE):
+            hidden_count = 0
+        else:
+            hidden_count = game.hidden_safe_cells + game.total_mines
+        others = hidden_count - frontier_cells - len(solver.known_mines) - sum(1 for i in solver.known_safe if game.hidden[i])
+        remaining = game.total_mines - len(solver.known_mines) - round(estimated_mines)
+
+        # Convolve the per-component mine-count distributions (prefix and suffix, so each one can be left out)
+        def convolve(a, b):
+            out = [0] * (len(a) + len(b) - 1)
+            for i, x in enumerate(a):
+                if x:
+                    for j, y in enumerate(b):
+                        out[i + j] += x * y
+            return out
+
+        prefix = [[1]]
+        for _, totals, _ in counted:
+            prefix.append(convolve(prefix[-1], totals))
+        suffix = [[1]]
+        for _, totals, _ in reversed(counted):
+            suffix.append(convolve(suffix[-1], totals))
+        suffix.reverse()
+        everything = prefix[-1]
+
+        def ways_outside(mines_used):
+            """Ways to place the leftover mines on the cells no number touches"""
+            rest = remaining - mines_used
+            return comb(others, rest) if 0 <= rest <= others else 0
+
+        weight_total = sum(count * ways_outside(k) for k, count in enumerate(everything))
+        if weight_total == 0:
+            # Inconsistent board (e.g. a wrong total): fall back to the plain mine density
+            density = remaining / max(others + frontier_cells, 1)
+            return ProbabilityMap(game, cells, density, exact=False)
+
+        for i, (comp_cells, totals, cell_counts) in enumerate(counted):
+            rest = convolve(prefix[i], suffix[i + 1])
+            for k, count in enumerate(totals):
+                if not count:
+                    continue
+                # Number of full-board arrangements in which this component holds k mines
+                weight = sum(r * ways_outside(k + j) for j, r in enumerate(rest))
+                for v, cell in enumerate(comp_cells):
+                    cells[cell] = cells.get(cell, 0) + cell_counts[k][v] * weight
+            for cell in comp_cells:
+                cells[cell] = cells[cell] / weight_total
+
+        # Each cell away from the frontier is a mine in C(others - 1, rest - 1) of the C(others, rest) placements
+        if others > 0:
+            other_weight = sum(count * (comb(others - 1, remaining - k - 1) if 1 <= remaining - k <= others else 0)
+                               for k, count in enumerate(everything))
+            other_probability = other_weight / weight_total
+        else:
+            other_probability = None
+        return ProbabilityMap(game, cells, other_probability, exact)
@@ -0,0 +1,144 @@
+"""
+File: profiler.py
+Module: src
+Function: Opt-in sampling profiler for whole sessions (the curses game or a headless run), written to files only.
+Inputs:
+    - The code run while profiling is on, and a sampling interval
+Outputs:
+    - A collapsed-stack file (one "frame;frame;frame count" line per distinct stack, the input format of
+      flamegraph.pl, speedscope and similar tools), and a top-N hotspot summary next to it
+Usage:
+    python -m src.main --profile game.folded          (writes game.folded and game.folded.top.txt)
+    python -m src --profile sim.folded simulate --games 1000
+
+    with profiled("run.folded"):
+        ... code to profile ...
+
+A background thread looks at the Python stack of every other thread once per interval (sys._current_frames)
+and counts each distinct stack. The profiled code is not traced or changed, so its timings stay realistic,
+and nothing is printed: while curses owns the terminal, anything written to the screen would be lost or
+corrupt the game's display. Samples taken while a thread waits for input end in the function that waits
+(Frontend.get_input), which shows how much of a session was idle.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Seconds between samples. The sampler needs the GIL to take a sample, so while other threads run Python code
+    # it gets a turn about once per switch interval (sys.getswitchinterval(), 5 ms by default) however short this is.
+DEFAULT_INTERVAL = 0.005
+
+# Functions listed in the summary
+DEFAULT_TOP = 25
+
+def frame_label(code):
+    """'path/to/file.py:Class.function' for a code object, with paths shown relative to the working directory"""
+    filename = code.co_filename
+    if os.path.isabs(filename):
+        relative = os.path.relpath(filename)
+        if not relative.startswith(".."):
+            filename = relative
+    return f"{filename}:{code.co_qualname}"
+
+# SamplingProfiler Class:
+    # Samples the stacks of every thread but its own, and counts the distinct stacks seen
+class SamplingProfiler:
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        """Constructor function for the SamplingProfiler Class"""
+        self.interval = interval
+        self.stacks = Counter()     # (thread name, frame label, ...) outermost first -> samples
+        self.samples = 0
+        self.elapsed = 0.0
+        self.thread = None
+        self.stopping = threading.Event()
+
+        # Frame labels by code object, so each function's label is built once
+        self.labels = {}
+
+    def start(self):
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self.run, name="profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+
+    def run(self):
+        own = threading.get_ident()
+        start = time.perf_counter()
+        while not self.stopping.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self.sample(names.get(ident, str(ident)), frame)
+        self.elapsed = time.perf_counter() - start
+
+    def sample(self, thread_name, frame):
+        """Count one sample of the stack ending in frame"""
+        labels = self.labels
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = frame_label(code)
+            stack.append(label)
+            frame = frame.f_back
+        stack.append(thread_name)
+        stack.reverse()
+        self.stacks[tuple(stack)] += 1
+        self.samples += 1
+
+    def collapsed(self):
+        """The samples in collapsed-stack format, most sampled stack first"""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def hotspots(self):
+        """Samples per function: (own, total), own counting samples where it was running, total where it was on the stack"""
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            # A recursive function is counted once per sample
+            for label in set(stack[1:]):
+                total[label] += count
+        return own, total
+
+    def summary(self, top=DEFAULT_TOP):
+        """Text summary of the functions with the most samples, by own samples and by total samples"""
+        own, total = self.hotspots()
+        samples = self.samples or 1
+        lines = [f"{self.samples} samples every {self.interval * 1000:g} ms over {self.elapsed:.2f} s", ""]
+        for title, ranking in (("own", own), ("total", total)):
+            lines.append(f"Top {top} by {title} samples:")
+            lines.append(f"{'own%':>7} {'total%':>7}  function")
+            for label, _ in ranking.most_common(top):
+                lines.append(f"{own[label] / samples:7.1%} {total[label] / samples:7.1%}  {label}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def write(self, path, top=DEFAULT_TOP):
+        """Write the collapsed stacks to path and the summary to path + '.top.txt'"""
+        with open(path, "w") as f:
+            f.write(self.collapsed())
+        with open(path + ".top.txt", "w") as f:
+            f.write(self.summary(top))
+
+@contextmanager
+def profiled(path, interval=DEFAULT_INTERVAL, top=DEFAULT_TOP):
+    """Profile the body of the with statement and write the results to path (nothing at all if path is None)"""
+    if path is None:
+        yield None
+        return
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        profiler.write(path, top)
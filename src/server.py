@@ -0,0 +1,283 @@
+"""
+File: server.py
+Module: src
+Function: Asyncio game server hosting many GameManager sessions behind a line-delimited JSON protocol,
+          over TCP or a Unix socket. For bots, training runs and other tools that play many games at once.
+Inputs:
+    - Requests from clients, one JSON object per line
+Outputs:
+    - One JSON response line per request, in request order on each connection
+Usage:
+    python -m src.server --port 8765
+    python -m src.server --unix /tmp/minesweeper.sock --idle-timeout 60 --max-memory 512
+    python -m src.server --profile server.folded      (writes a sampling profile when the server stops)
+    python -m bench.load_server      (load test: p50/p99 move latency and moves per second)
+
+Protocol (every request may carry an "id", which is copied into its response):
+    {"op": "new", "rows": 16, "cols": 30, "mines": 99, "seed": 7, "backend": "bytes", "safe_first_click": true}
+        -> {"session": 1, "rows": 16, "cols": 30, "mines": 99, "seed": 7, "memory": 2123}
+    {"op": "moves", "session": 1, "moves": [["reveal", 3, 4], ["flag", 0, 0], ...]}
+        -> {"session": 1, "status": "PLAYING", "revealed": [[3, 4], ...], "applied": 2,
+            "hidden_safe_cells": 380, "remaining_flags": 98}
+    {"op": "state", "session": 1}   -> the same fields plus "board": one string per row (see engine.render)
+    {"op": "close", "session": 1}   -> {"session": 1, "closed": true}
+    {"op": "stats"}                 -> {"sessions": ..., "memory": ..., "evicted": ..., "requests": ..., "moves": ...,
+                                        "cpu": <CPU seconds used by the server process>}
+A request that fails gets {"error": "<message>"} instead. Moves are applied in order and stop early once the
+game is won or lost ("applied" counts the moves used). If a move is invalid, the moves before it stay applied
+and the response is an error. Sessions not used for --idle-timeout seconds are closed.
+A request that fails on a bug in the server gets an error too, and the traceback is logged to stderr.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import OrderedDict
+
+from src import engine
+from src.backends import backend_name
+from src.classes import GameStatus
+from src.profiler import profiled
+
+log = logging.getLogger(__name__)
+
+# Longest request line accepted (a large batch of moves)
+LINE_LIMIT = 1 << 20
+
+# Largest board a session may have
+MAX_CELLS = 4_000_000
+
+# The attributes holding each backend's board state: one byte per cell layers, or bitmasks plus the byte counts
+BOARD_STATE = {"bytes": ("mines", "adjacent", "hidden", "flagged"),
+               "bitboard": ("mine_mask", "hidden_mask", "flagged_mask", "zero_mask", "full", "adjacent")}
+
+def session_memory(game):
+    """Bytes held by a game's board state: the buffers or masks listed for its backend in BOARD_STATE"""
+    return sum(sys.getsizeof(getattr(game, name)) for name in BOARD_STATE[backend_name(game)])
+
+# Session Class:
+    # One hosted game, with its last use time and the memory it accounts for
+class Session:
+    def __init__(self, session_id, game):
+        """Constructor function for the Session Class"""
+        self.id = session_id
+        self.game = game
+        self.last_used = time.monotonic()
+        self.moves = 0
+        self.memory = session_memory(game)
+
+    def result(self):
+        """The fields every moves/state response carries"""
+        game = self.game
+        return {"session": self.id, "status": game.game_status.name,
+                "hidden_safe_cells": game.hidden_safe_cells, "remaining_flags": game.remaining_flag_count}
+
+# GameServer Class:
+    # The hosted sessions and the request handlers. handle() is plain synchronous code; the asyncio parts
+    # only move lines between the sockets and handle().
+class GameServer:
+    def __init__(self, idle_timeout=300.0, max_memory=None):
+        """Constructor function for the GameServer Class"""
+        # Sessions by id, least recently used first (a used session moves to the end)
+        self.sessions = OrderedDict()
+        self.next_id = 1
+
+        # Idle sessions are closed after idle_timeout seconds; new sessions are refused above max_memory bytes
+        self.idle_timeout = idle_timeout
+        self.max_memory = max_memory
+
+        # Running totals
+        self.memory = 0
+        self.evicted = 0
+        self.requests = 0
+        self.moves = 0
+
+        # Background task closing idle sessions, started with the server
+        self.eviction = None
+
+        self.handlers = {"new": self.new_session, "moves": self.apply_moves, "state": self.state,
+                         "close": self.close_session, "stats": self.stats}
+
+    def handle(self, request):
+        """Handle one decoded request and return its response"""
+        self.requests += 1
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+            handler = self.handlers.get(request.get("op"))
+            if handler is None:
+                raise ValueError(f"unknown op {request.get('op')!r}, expected one of {sorted(self.handlers)}")
+            response = handler(request)
+        except (ValueError, TypeError, KeyError) as error:
+            # A malformed or impossible request
+            response = {"error": str(error)}
+        except Exception as error:
+            # A bug: the client still gets an answer, and the connection and other sessions carry on
+            log.exception("request %r failed", request)
+            response = {"error": f"internal error: {type(error).__name__}: {error}"}
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def handle_line(self, line):
+        """Handle one request line and return its encoded response line"""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as error:
+            response = {"error": f"invalid JSON: {error}"}
+        else:
+            response = self.handle(request)
+        return json.dumps(response, separators=(",", ":")).encode() + b"\n"
+
+    def session(self, request):
+        """The session a request names, marked as just used"""
+        session = self.sessions.get(request.get("session"))
+        if session is None:
+            raise ValueError(f"no session {request.get('session')!r} (closed or evicted)")
+        session.last_used = time.monotonic()
+        self.sessions.move_to_end(session.id)
+        return session
+
+    def account(self, session):
+        """Update the memory accounted to a session after its game changed"""
+        memory = session_memory(session.game)
+        self.memory += memory - session.memory
+        session.memory = memory
+
+    def new_session(self, request):
+        rows = int(request.get("rows", engine.DEFAULT_ROWS))
+        cols = int(request.get("cols", engine.DEFAULT_COLS))
+        mines = int(request.get("mines", max(rows * cols // 10, 1)))
+        if not (0 < rows * cols <= MAX_CELLS and rows > 0 and cols > 0):
+            raise ValueError(f"board must have between 1 and {MAX_CELLS} cells")
+        if not 0 < mines < rows * cols:
+            raise ValueError(f"mines must be between 1 and {rows * cols - 1}")
+        if self.max_memory is not None and self.memory >= self.max_memory:
+            raise ValueError(f"server memory limit reached ({self.memory} of {self.max_memory} bytes in use)")
+
+        game = engine.new_game(request.get("seed"), rows, cols, mines, request.get("backend", engine.DEFAULT_BACKEND),
+                               bool(request.get("safe_first_click", False)))
+        session = Session(self.next_id, game)
+        self.next_id += 1
+        self.sessions[session.id] = session
+        self.memory += session.memory
+        return {"session": session.id, "rows": rows, "cols": cols, "mines": mines, "seed": game.seed,
+                "memory": session.memory}
+
+    def apply_moves(self, request):
+        session = self.session(request)
+        game = session.game
+        revealed = []
+        applied = 0
+        for move, r, c in request["moves"]:
+            if game.game_status in (GameStatus.WIN, GameStatus.LOSE):
+                break
+            revealed += engine.apply_move(game, move, int(r), int(c))
+            applied += 1
+        session.moves += applied
+        self.moves += applied
+        self.account(session)
+        response = session.result()
+        response["applied"] = applied
+        response["revealed"] = revealed
+        return response
+
+    def state(self, request):
+        session = self.session(request)
+        response = session.result()
+        response["board"] = engine.render(session.game).split("\n")
+        response["moves"] = session.moves
+        response["memory"] = session.memory
+        return response
+
+    def close_session(self, request):
+        session = self.session(request)
+        self.remove(session)
+        return {"session": session.id, "closed": True}
+
+    def stats(self, request):
+        return {"sessions": len(self.sessions), "memory": self.memory, "evicted": self.evicted,
+                "requests": self.requests, "moves": self.moves, "cpu": time.process_time()}
+
+    def remove(self, session):
+        del self.sessions[session.id]
+        self.memory -= session.memory
+
+    def evict_idle(self, now=None):
+        """Close every session unused for idle_timeout seconds. Returns how many were closed."""
+        deadline = (time.monotonic() if now is None else now) - self.idle_timeout
+        evicted = 0
+        # Least recently used first, so the scan stops at the first session still in use
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.last_used > deadline:
+                break
+            self.remove(session)
+            evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    async def evict_idle_loop(self):
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4, 0.1))
+            self.evict_idle()
+
+    async def serve_client(self, reader, writer):
+        """Answer one connection's request lines in order until it closes"""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Line longer than LINE_LIMIT: the stream cannot be resynchronized, so close it
+                    writer.write(json.dumps({"error": f"request line longer than {LINE_LIMIT} bytes"}).encode() + b"\n")
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    writer.write(self.handle_line(line))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        """Start listening (on the Unix socket if unix_path is given) and return the asyncio server"""
+        if unix_path:
+            server = await asyncio.start_unix_server(self.serve_client, unix_path, limit=LINE_LIMIT)
+        else:
+            server = await asyncio.start_server(self.serve_client, host, port, limit=LINE_LIMIT)
+        self.eviction = asyncio.create_task(self.evict_idle_loop())
+        return server
+
+async def serve(args):
+    game_server = GameServer(args.idle_timeout, args.max_memory * 1024 * 1024 if args.max_memory else None)
+    server = await game_server.start(args.host, args.port, args.unix)
+    address = args.unix or "%s:%d" % server.sockets[0].getsockname()[:2]
+    # The address line lets a parent process (like the load test) find a port picked with --port 0
+    print(f"listening on {address}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Line-delimited JSON Minesweeper game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (0 picks a free one)")
+    parser.add_argument("--unix", metavar="PATH", default=None, help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="close sessions unused for this many seconds")
+    parser.add_argument("--max-memory", type=float, default=None, help="refuse new sessions above this many MiB of boards")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="write a sampling profile (collapsed stacks, plus PATH.top.txt) of the server, written when it stops")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    with profiled(args.profile):
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
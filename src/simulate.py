@@ -0,0 +1,285 @@
+"""
+File: simulate.py
+Module: src
+Function: Play large numbers of seeded Minesweeper games headlessly (no curses) with a pluggable move policy,
+          spread across a process pool, and report aggregated results as batches finish.
+Inputs:
+    - Number of games, board size, mine count, base seed, move policy name and worker count
+Outputs:
+    - Running Summary objects (win rate, clicks per game, time per game)
+Usage:
+    python -m src.simulate --games 100000 --rows 16 --cols 30 --mines 99 --policy random --workers 8
+"""
+import abc
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import NamedTuple
+
+from src import engine
+from src.backends import BACKENDS, DEFAULT_BACKEND
+from src.classes import GameStatus
+from src.event_log import record_game
+from src.layout_cache import LayoutCache
+from src.profiler import profiled
+from src.probability import ProbabilityEngine
+from src.solver import Solver
+
+# Layouts generated in this process. Simulating the same seeds again (another policy, a rerun with
+    # different settings, the probability benchmark) reuses them instead of regenerating every board.
+LAYOUTS = LayoutCache(max_bytes=16 * 1024 * 1024)
+
+def new_game(seed, rows, cols, mines, backend=DEFAULT_BACKEND, layout_cache=LAYOUTS):
+    """Create a GameManager set up the same way the TUI sets one up after the mine count prompt"""
+    game = engine.new_game(seed, rows, cols, mines, backend)
+    game.layout_cache = layout_cache
+    return game
+
+class MovePolicy(abc.ABC):
+    """
+    MovePolicy Class:
+        Abstract base class for the move policies the simulator can play with: subclasses implement next_move.
+        A policy is created once per game and asked for moves until the game ends.
+    """
+    def __init__(self, game, rng):
+        """Constructor function for the MovePolicy class"""
+        self.game = game
+        self.rng = rng
+
+    @abc.abstractmethod
+    def next_move(self):
+        """Return the next move as ("reveal" | "flag", row, col), or None to give up"""
+
+    def observe(self, revealed):
+        """Called after each reveal with the (row, col) cells it newly revealed"""
+
+class RandomPolicy(MovePolicy):
+    """Reveals a uniformly random hidden, unflagged cell every turn"""
+    def next_move(self):
+        return self.random_reveal()
+
+    def random_reveal(self, avoid=()):
+        """Pick a random hidden, unflagged cell that is not in avoid"""
+        game = self.game
+        hidden, flagged = game.hidden, game.flagged
+
+        # Rejection sampling is cheap while most of the board is hidden
+        for _ in range(32):
+            index = self.rng.randrange(game.size)
+            if hidden[index] and not flagged[index] and index not in avoid:
+                return ("reveal", *divmod(index, game.cols))
+
+        # Late in the game, pick from the remaining hidden cells directly
+        choices = [index for index in range(game.size) if hidden[index] and not flagged[index] and index not in avoid]
+        if not choices:
+            return None
+        return ("reveal", *divmod(self.rng.choice(choices), game.cols))
+
+class SolverPolicy(RandomPolicy):
+    """Opens in the middle, then reveals cells the Solver proves safe and guesses randomly only when stuck"""
+    def __init__(self, game, rng):
+        super().__init__(game, rng)
+        self.solver = Solver(game)
+
+    def next_move(self):
+        if self.game.is_first_click:
+            return ("reveal", self.game.rows // 2, self.game.cols // 2)
+        hint = self.solver.hint()
+        if hint is not None:
+            return ("reveal", *hint)
+        return self.random_reveal(avoid=self.solver.known_mines)
+
+    def observe(self, revealed):
+        self.solver.observe(revealed)
+
+class ProbabilityPolicy(SolverPolicy):
+    """Like SolverPolicy, but when stuck it guesses the cell least likely to hold a mine"""
+    def __init__(self, game, rng):
+        super().__init__(game, rng)
+        self.engine = ProbabilityEngine(game, self.solver)
+
+    def next_move(self):
+        if self.game.is_first_click:
+            return super().next_move()
+        hint = self.solver.hint()
+        if hint is not None:
+            return ("reveal", *hint)
+        safest = self.engine.compute().safest()
+        return ("reveal", *safest) if safest is not None else None
+
+# Move policies by name. Names (not objects) are sent to the worker processes.
+POLICIES = {
+    "random": RandomPolicy,
+    "solver": SolverPolicy,
+    "probability": ProbabilityPolicy,
+}
+
+class GameResult(NamedTuple):
+    """Outcome of one simulated game"""
+    seed: int
+    won: bool
+    clicks: int
+    seconds: float
+
+class Summary:
+    """
+    Summary Class:
+        Aggregated results for a batch of games. Summaries from different workers are merged together.
+    """
+    def __init__(self):
+        """Constructor function for the Summary class"""
+        self.games = 0
+        self.wins = 0
+        self.clicks = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, result):
+        """Add one GameResult to the summary"""
+        self.games += 1
+        self.wins += result.won
+        self.clicks += result.clicks
+        self.seconds += result.seconds
+        self.max_seconds = max(self.max_seconds, result.seconds)
+
+    def merge(self, other):
+        """Add another Summary's totals to this one"""
+        self.games += other.games
+        self.wins += other.wins
+        self.clicks += other.clicks
+        self.seconds += other.seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def clicks_per_game(self):
+        return self.clicks / self.games if self.games else 0.0
+
+    @property
+    def seconds_per_game(self):
+        return self.seconds / self.games if self.games else 0.0
+
+    def __str__(self):
+        return (f"games={self.games} win_rate={self.win_rate:.4f} clicks/game={self.clicks_per_game:.2f} "
+                f"ms/game={self.seconds_per_game * 1000:.3f} max_ms={self.max_seconds * 1000:.3f}")
+
+def play_game(seed, rows, cols, mines, policy="random", max_moves=None, record_dir=None, backend=DEFAULT_BACKEND):
+    """Play one game to the end with the named policy and return its GameResult"""
+    start = time.perf_counter()
+    game = new_game(seed, rows, cols, mines, backend)
+
+    # Optionally keep an event log of the game so it can be replayed later
+    if record_dir is not None:
+        record_game(game, os.path.join(record_dir, f"game-{seed}.mslog"))
+    mover = POLICIES[policy](game, random.Random(seed))
+    clicks = 0
+
+    # Keep asking the policy for moves until the game is decided or the policy gives up
+    while game.game_status in (GameStatus.WELCOME, GameStatus.PLAYING):
+        if max_moves is not None and clicks >= max_moves:
+            break
+        move = mover.next_move()
+        if move is None:
+            break
+        action, r, c = move
+        clicks += 1
+        if action == "flag":
+            game.place_flag(r, c)
+        else:
+            mover.observe(game.handle_clicked_cell(r, c))
+
+    if game.event_log is not None:
+        game.event_log.close()
+    return GameResult(seed, game.game_status == GameStatus.WIN, clicks, time.perf_counter() - start)
+
+def play_batch(seeds, rows, cols, mines, policy="random", max_moves=None, record_dir=None, backend=DEFAULT_BACKEND):
+    """Worker entry point: play every seed in the range and return one Summary (keeps IPC small)"""
+    summary = Summary()
+    for seed in seeds:
+        summary.add(play_game(seed, rows, cols, mines, policy, max_moves, record_dir, backend))
+    return summary
+
+def simulate(games, rows, cols, mines, policy="random", seed=0, workers=None, batch_size=1000, max_moves=None,
+             record_dir=None, backend=DEFAULT_BACKEND):
+    """
+    Play `games` games with seeds seed, seed+1, ... and yield the running Summary after each batch.
+
+    With workers=1 everything runs in this process. Otherwise batches are spread over a process pool
+    (workers=None uses one process per CPU). Only a few batches per worker are in flight at once,
+    so memory stays flat however many games are requested.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}, expected one of {sorted(POLICIES)}")
+
+    total = Summary()
+    batches = (range(start, min(start + batch_size, seed + games)) for start in range(seed, seed + games, batch_size))
+
+    if workers == 1:
+        for seeds in batches:
+            total.merge(play_batch(seeds, rows, cols, mines, policy, max_moves, record_dir, backend))
+            yield total
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        max_in_flight = 4 * workers
+        pending = set()
+        for seeds in batches:
+            pending.add(pool.submit(play_batch, seeds, rows, cols, mines, policy, max_moves, record_dir, backend))
+
+            # Wait for a batch to finish before queuing more work once enough is in flight
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total.merge(future.result())
+                yield total
+
+        # Collect whatever is still running
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                total.merge(future.result())
+            yield total
+
+def add_arguments(parser):
+    """Add the simulation options to an argument parser (shared with the src CLI)"""
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--mines", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game (games use seed, seed+1, ...)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="games per worker task")
+    parser.add_argument("--max-moves", type=int, default=None, help="stop a game after this many moves")
+    parser.add_argument("--record-dir", default=None, help="write an event log per game into this directory")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND, help="board storage backend")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="write a sampling profile (collapsed stacks, plus PATH.top.txt) of this process; "
+                             "use --workers 1 to profile the games themselves")
+
+def run(args):
+    """Run a simulation from parsed arguments, printing progress as batches complete"""
+    start = time.perf_counter()
+    summary = Summary()
+    for summary in simulate(args.games, args.rows, args.cols, args.mines, args.policy, args.seed,
+                            args.workers, args.batch_size, args.max_moves, args.record_dir, args.backend):
+        print(f"\r{summary}", end="", flush=True)
+    elapsed = time.perf_counter() - start
+    print(f"\n{summary.games} games in {elapsed:.2f}s ({summary.games / elapsed if elapsed else 0:.0f} games/s)")
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Minesweeper batch simulation")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    with profiled(args.profile):
+        run(args)
+
+if __name__ == "__main__":
+    main()
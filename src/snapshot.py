@@ -0,0 +1,106 @@
+"""
+File: snapshot.py
+Module: src
+Function: Save a running game to a small versioned binary snapshot and restore it later.
+Inputs:
+    - A GameManager to save, or a snapshot file to load
+Outputs:
+    - Snapshot files / bytes, and GameManager objects restored from them
+
+File format (little endian):
+    header (56 bytes): magic b"MSWS", version (u16), game_status (u8), options (u8), seed (i64),
+                       rows, cols, total_mines, remaining_mine_count, placed_flags, total_flags,
+                       remaining_flag_count, hidden_safe_cells (u32 each), backend (u8), 3 padding bytes,
+                       start_cell (u32, the row-major index of the no-guess start cell, if OPTION_START_CELL is set)
+    followed by three bitsets of (rows * cols + 7) // 8 bytes each: mines, hidden, flagged.
+    Adjacency counts are not stored; they are recomputed from the mines in one batched step on load.
+    The backend byte and start cell take the space that was reserved (and zero) in the first files, so those
+    still load: as bytes-backend games without a start cell.
+"""
+import struct
+
+from src.backends import backend_name, new_game_manager
+from src.bitpack import pack_layer, unpack_layer
+from src.classes import GameStatus, count_adjacent
+
+MAGIC = b"MSWS"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBqIIIIIIIIB3xI")
+
+# Option bits
+OPTION_FIRST_CLICK_PENDING = 1
+OPTION_SAFE_FIRST_CLICK = 2
+OPTION_PREGENERATE = 4
+OPTION_START_CELL = 8
+
+# Backend codes stored in the header (fixed, so files keep loading if backends are added)
+BACKEND_CODES = {"bytes": 0, "bitboard": 1}
+BACKEND_NAMES = {code: name for name, code in BACKEND_CODES.items()}
+
+def dumps(game):
+    """Return the snapshot of a game as bytes"""
+    options = (OPTION_FIRST_CLICK_PENDING if game.is_first_click else 0) | \
+              (OPTION_SAFE_FIRST_CLICK if game.safe_first_click else 0) | \
+              (OPTION_PREGENERATE if game.pregenerate else 0) | \
+              (OPTION_START_CELL if game.start_cell is not None else 0)
+    start_cell = game.start_cell[0] * game.cols + game.start_cell[1] if game.start_cell is not None else 0
+    header = HEADER.pack(MAGIC, VERSION, game.game_status.value, options, game.seed,
+                         game.rows, game.cols, game.total_mines, game.remaining_mine_count,
+                         game.placed_flags, game.total_flags, game.remaining_flag_count,
+                         game.hidden_safe_cells, BACKEND_CODES[backend_name(game)], start_cell)
+    # bytes() copies the layers into plain buffers for every backend (the bitboard layers are views over ints)
+    return b"".join((header, pack_layer(bytes(game.mines)), pack_layer(bytes(game.hidden)),
+                     pack_layer(bytes(game.flagged))))
+
+def loads(data):
+    """Rebuild a game manager, with the backend it was saved from, from snapshot bytes"""
+    data = memoryview(data)
+    if len(data) < HEADER.size:
+        raise ValueError("snapshot is too short to hold a header")
+    (magic, version, status, options, seed, rows, cols, total_mines, remaining_mine_count, placed_flags,
+     total_flags, remaining_flag_count, hidden_safe_cells, backend, start_cell) = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a Minesweeper snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    if backend not in BACKEND_NAMES:
+        raise ValueError(f"unknown backend code {backend} in snapshot")
+
+    size = rows * cols
+    layer_bytes = (size + 7) // 8
+    if len(data) != HEADER.size + 3 * layer_bytes:
+        raise ValueError("snapshot size does not match its board dimensions")
+
+    game = new_game_manager(BACKEND_NAMES[backend], seed=seed, rows=rows, cols=cols)
+    game.game_status = GameStatus(status)
+    game.is_first_click = bool(options & OPTION_FIRST_CLICK_PENDING)
+    game.safe_first_click = bool(options & OPTION_SAFE_FIRST_CLICK)
+    game.pregenerate = bool(options & OPTION_PREGENERATE)
+    game.total_mines = total_mines
+    game.remaining_mine_count = remaining_mine_count
+    game.placed_flags = placed_flags
+    game.total_flags = total_flags
+    game.remaining_flag_count = remaining_flag_count
+    game.hidden_safe_cells = hidden_safe_cells
+    if options & OPTION_START_CELL:
+        game.start_cell = divmod(start_cell, cols)
+
+    # Decode the bitsets straight into the board buffers
+    offset = HEADER.size
+    mines = unpack_layer(data[offset:offset + layer_bytes], size)
+    offset += layer_bytes
+    game.hidden = unpack_layer(data[offset:offset + layer_bytes], size)
+    offset += layer_bytes
+    game.flagged = unpack_layer(data[offset:offset + layer_bytes], size)
+    game.set_layout(mines, count_adjacent(mines, rows, cols))
+    return game
+
+def save_snapshot(game, path):
+    """Write a snapshot of the game to path"""
+    with open(path, "wb") as f:
+        f.write(dumps(game))
+
+def load_snapshot(path):
+    """Read a snapshot file and return the restored game manager"""
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,173 @@
+"""
+File: solver.py
+Module: src
+Function: Deterministic constraint-propagation solver and hint engine working on GameManager state.
+          Finds hidden cells that are certainly safe and certainly mines from the revealed numbers.
+Inputs:
+    - A GameManager, plus the (row, col) cells revealed by each move (from handle_clicked_cell)
+Outputs:
+    - Sets of certainly-safe and certainly-mined cells, and single-cell hints
+
+How it works:
+    Every revealed number with unresolved hidden neighbors is a constraint: "exactly k of these cells are mines".
+    These numbered cells form the frontier. The solver keeps the frontier up to date incrementally: observe()
+    only looks at the cells a move revealed and their neighbors, and only constraints that changed are
+    re-examined. Two rules are applied until nothing changes:
+        - Single constraint: k == 0 means every cell is safe, k == number of cells means every cell is a mine.
+        - Subset: if constraint A's cells are a subset of B's, then B's extra cells hold exactly kB - kA mines.
+    Player flags are ignored (they may be wrong); the solver tracks its own deduced mines.
+"""
+
+class Solver:
+    """
+    Solver Class:
+        Keeps an incremental frontier of constraints for one GameManager and deduces safe cells and mines.
+    """
+    def __init__(self, game):
+        """Constructor function for the Solver class. Scans the board once to pick up already revealed cells."""
+        self.game = game
+        self.known_mines = set()    # Cells (flat indices) deduced to hold a mine
+        self.known_safe = set()     # Hidden cells deduced to be safe
+        self.frontier = set()       # Revealed numbered cells that still have unresolved hidden neighbors
+        self.dirty = set()          # Frontier cells whose constraint changed since they were last examined
+        self.subset_queue = set()   # Frontier cells still waiting for the (more expensive) subset rule
+
+        # Offsets of the 8 neighbors of a cell that is not on the board edge
+        cols = game.cols
+        self.offsets = [-cols - 1, -cols, -cols + 1, -1, 1, cols - 1, cols, cols + 1]
+
+        # One-time scan so a solver can be attached to a game that is already in progress
+        hidden = game.hidden
+        self.observe([divmod(index, game.cols) for index in range(game.size) if not hidden[index]])
+
+    def neighbors(self, index):
+        """Flat indices of the in-bounds neighbors of a cell"""
+        cols = self.game.cols
+        row, col = divmod(index, cols)
+
+        # Fast path for cells away from the edges
+        if 0 < row < self.game.rows - 1 and 0 < col < cols - 1:
+            return [index + offset for offset in self.offsets]
+
+        return [r * cols + c
+                for r in range(max(row - 1, 0), min(row + 2, self.game.rows))
+                for c in range(max(col - 1, 0), min(col + 2, cols))
+                if r != row or c != col]
+
+    def constraint(self, index):
+        """Return (unresolved hidden neighbors, mines among them) for a revealed numbered cell"""
+        hidden = self.game.hidden
+        unknown = []
+        mines = self.game.adjacent[index]
+        for n in self.neighbors(index):
+            if n in self.known_mines:
+                mines -= 1
+            elif hidden[n] and n not in self.known_safe:
+                unknown.append(n)
+        return frozenset(unknown), mines
+
+    def observe(self, revealed):
+        """Update the frontier with the (row, col) cells a move newly revealed"""
+        cols = self.game.cols
+        adjacent = self.game.adjacent
+        for r, c in revealed:
+            index = r * cols + c
+            self.known_safe.discard(index)
+
+            # A revealed number becomes a constraint (dropped later if it has nothing left to resolve)
+            if adjacent[index] > 0:
+                self.frontier.add(index)
+                self.dirty.add(index)
+
+            # Neighboring constraints just lost an unresolved cell
+            for n in self.neighbors(index):
+                if n in self.frontier:
+                    self.dirty.add(n)
+
+    def resolve(self, cells, is_mine):
+        """Record cells as known mines or known safe cells and mark the constraints that touch them dirty"""
+        target = self.known_mines if is_mine else self.known_safe
+        for cell in cells:
+            if cell in target:
+                continue
+            target.add(cell)
+            for n in self.neighbors(cell):
+                if n in self.frontier:
+                    self.dirty.add(n)
+
+    def solve(self):
+        """
+        Apply the deduction rules to every changed constraint until nothing more follows.
+        The cheap single-constraint rule runs on everything changed first; the subset rule only
+        runs on constraints it could not settle, once no single-constraint work is left.
+        """
+        while self.dirty or self.subset_queue:
+            if not self.dirty:
+                self.apply_subset_rule(self.subset_queue.pop())
+                continue
+
+            # Take the whole dirty set at once; anything that changes meanwhile lands in a fresh set
+            batch, self.dirty = self.dirty, set()
+            for index in batch:
+                if index not in self.frontier:
+                    continue
+                unknown, mines = self.constraint(index)
+
+                # Nothing left to resolve around this number: it leaves the frontier
+                if not unknown:
+                    self.frontier.discard(index)
+                    self.subset_queue.discard(index)
+                    continue
+
+                # Single constraint rule
+                if mines == 0:
+                    self.resolve(unknown, is_mine=False)
+                elif mines == len(unknown):
+                    self.resolve(unknown, is_mine=True)
+                else:
+                    self.subset_queue.add(index)
+
+        return self.known_safe, self.known_mines
+
+    def apply_subset_rule(self, index):
+        """Compare one constraint with the other frontier constraints that share an unresolved cell with it"""
+        if index not in self.frontier:
+            return
+        unknown, mines = self.constraint(index)
+        others = set()
+        for cell in unknown:
+            others.update(n for n in self.neighbors(cell) if n in self.frontier and n != index)
+        for other in others:
+            other_unknown, other_mines = self.constraint(other)
+            if unknown < other_unknown:
+                self.apply_subset(unknown, mines, other_unknown, other_mines)
+            elif other_unknown < unknown:
+                self.apply_subset(other_unknown, other_mines, unknown, mines)
+
+    def apply_subset(self, small, small_mines, big, big_mines):
+        """The cells in big but not small hold exactly big_mines - small_mines mines"""
+        extra = big - small
+        extra_mines = big_mines - small_mines
+        if extra_mines == 0:
+            self.resolve(extra, is_mine=False)
+        elif extra_mines == len(extra):
+            self.resolve(extra, is_mine=True)
+
+    def safe_cells(self):
+        """Return the (row, col) hidden cells that are certainly safe"""
+        self.solve()
+        return [divmod(index, self.game.cols) for index in sorted(self.known_safe)]
+
+    def mine_cells(self):
+        """Return the (row, col) cells that certainly hold a mine"""
+        self.solve()
+        return [divmod(index, self.game.cols) for index in sorted(self.known_mines)]
+
+    def hint(self):
+        """Return one (row, col) cell that is certainly safe to reveal, or None if no safe move is known"""
+        self.solve()
+        hidden = self.game.hidden
+        for index in self.known_safe:
+            if hidden[index]:
+                return divmod(index, self.game.cols)
+        return None
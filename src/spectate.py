@@ -0,0 +1,271 @@
+"""
+File: spectate.py
+Module: src
+Function: Spectator mode: the game publishes compact board diffs over a local Unix socket, and spectator
+          clients apply them to their own copy of the board.
+Inputs:
+    - Game side: the messages the Frontend publishes after each frame
+    - Spectator side: the socket path of a running game
+Outputs:
+    - A stream of line-delimited JSON messages to every connected spectator
+Usage:
+    python -m src.main --spectate /tmp/minesweeper.sock      (play, publishing to spectators)
+    python -m src.spectate /tmp/minesweeper.sock             (watch in another terminal)
+
+Messages (one JSON object per line):
+    {"type": "snapshot", "rows": R, "cols": C, "cells": "<R*C cell codes, row by row>",
+     "cursor": [r, c], "status": "PLAYING", "flags": 10}
+    {"type": "diff", "cells": [[r, c, "<code>"], ...], "cursor": [r, c], "status": "PLAYING", "flags": 9}
+Cell codes: "#" hidden, "F" flagged, "*" revealed mine, "." empty, "1"-"8" adjacent mine count.
+
+A spectator gets a snapshot when it connects, then every diff. A diff carries the current code of each
+changed cell, so a spectator converges on the game's board whatever state its snapshot was taken in.
+
+The broadcaster runs its own asyncio loop on a background thread. publish() only encodes the message and hands
+it to that loop, so the player's input loop never waits on a socket. Each spectator has a bounded buffer of
+pending messages. If a slow spectator fills it, its backlog is dropped and replaced by a fresh snapshot.
+"""
+import argparse
+import asyncio
+import json
+import os
+import stat
+import sys
+import threading
+
+from src.classes import GameStatus
+
+# Pending messages a spectator may fall behind by before its backlog is replaced with a snapshot
+BUFFER_MESSAGES = 256
+
+# Longest message line a spectator accepts (a snapshot of a big board)
+LINE_LIMIT = 64 << 20
+
+# Cell codes of the adjacency counts 0-8, and byte translation tables marking each layer's set cells with 0xff
+DIGITS = bytes(range(256)).translate(bytes.maketrans(bytes(range(9)), b".12345678"))
+SET_CELLS = bytes([0]) + bytes([255]) * 255
+
+def board_codes(game):
+    """The code of every cell, row by row, as one string (see the module docstring)"""
+    size = game.size
+    if not size:
+        return ""
+    # Layers are combined as big integers, one byte per cell, so the whole board is done by a few C operations
+    codes = int.from_bytes(bytes(game.adjacent).translate(DIGITS), "little")
+    for layer, code in ((game.mines, b"*"), (game.hidden, b"#"), (game.flagged, b"F")):
+        mask = int.from_bytes(bytes(layer).translate(SET_CELLS), "little")
+        codes = (codes & ~mask) | (mask & int.from_bytes(code * size, "little"))
+    return codes.to_bytes(size, "little").decode("ascii")
+
+def cell_code(game, r, c):
+    """The code of one cell"""
+    index = r * game.cols + c
+    if game.flagged[index]:
+        return "F"
+    if game.hidden[index]:
+        return "#"
+    if game.mines[index]:
+        return "*"
+    return chr(DIGITS[game.adjacent[index]])
+
+def snapshot_message(game, cursor):
+    return {"type": "snapshot", "rows": game.rows, "cols": game.cols, "cells": board_codes(game),
+            "cursor": list(cursor), "status": game.game_status.name, "flags": game.remaining_flag_count}
+
+def diff_message(game, cells, cursor):
+    return {"type": "diff", "cells": [[r, c, cell_code(game, r, c)] for r, c in cells], "cursor": list(cursor),
+            "status": game.game_status.name, "flags": game.remaining_flag_count}
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+def remove_socket(path):
+    """Remove the socket file at path, if there is one. Any other kind of file is left alone and refused."""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{path} exists and is not a socket; pick another path for the spectator socket")
+    os.unlink(path)
+
+# Subscriber Class:
+    # One connected spectator: its socket writer and bounded queue of encoded messages
+class Subscriber:
+    def __init__(self, writer, buffer_messages):
+        """Constructor function for the Subscriber Class"""
+        self.writer = writer
+        self.queue = asyncio.Queue(buffer_messages)
+        self.resyncs = 0
+
+# Broadcaster Class:
+    # Publishes messages to every spectator connected to a Unix socket, from a background thread
+class Broadcaster:
+    def __init__(self, path, snapshot, buffer_messages=BUFFER_MESSAGES):
+        """
+        Constructor function for the Broadcaster Class.
+        snapshot is called (on the broadcaster thread) for the snapshot message sent to a joining or lagging spectator.
+        """
+        self.path = path
+        self.snapshot = snapshot
+        self.buffer_messages = buffer_messages
+        self.subscribers = set()
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+
+        # The exception that stopped the broadcaster thread from listening, re-raised by start()
+        self.error = None
+
+        # Messages published, and spectators whose backlog was replaced by a snapshot
+        self.published = 0
+        self.resyncs = 0
+
+    def start(self):
+        """
+        Start listening on the socket (replacing a stale socket file) and return once spectators can connect.
+        Raises the error if the socket cannot be created, and ValueError if something other than a socket is in the way.
+        """
+        remove_socket(self.path)
+        self.error = None
+        self.ready.clear()
+        self.thread = threading.Thread(target=self.run, name="spectate", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            self.thread.join()
+            self.thread = None
+            raise self.error
+
+    def run(self):
+        # The loop is made this thread's current one, so the shutdown below can gather with no spectator tasks
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_unix_server(self.serve_spectator, self.path, limit=LINE_LIMIT))
+        except Exception as error:
+            # Handed to start(), which would otherwise wait for ready forever
+            self.error = error
+            self.loop.close()
+            return
+        finally:
+            self.ready.set()
+        self.loop.run_forever()
+
+        # Stopped by close(): shut the server and every spectator connection down
+        self.server.close()
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, self.server.wait_closed(), return_exceptions=True))
+        self.loop.close()
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.thread = None
+        remove_socket(self.path)
+
+    def publish(self, message):
+        """Send a message to every spectator. Thread-safe, and never waits on a spectator."""
+        if self.thread is None:
+            return
+        self.published += 1
+        self.loop.call_soon_threadsafe(self.fan_out, encode(message))
+
+    def fan_out(self, line):
+        for subscriber in self.subscribers:
+            self.offer(subscriber, line)
+
+    def offer(self, subscriber, line):
+        """Queue a message for one spectator. A full queue is dropped and replaced by a snapshot."""
+        try:
+            subscriber.queue.put_nowait(line)
+        except asyncio.QueueFull:
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(encode(self.snapshot()))
+            subscriber.resyncs += 1
+            self.resyncs += 1
+
+    async def serve_spectator(self, reader, writer):
+        """Send a joining spectator a snapshot, then its queued messages until it disconnects"""
+        subscriber = Subscriber(writer, self.buffer_messages)
+        subscriber.queue.put_nowait(encode(self.snapshot()))
+        self.subscribers.add(subscriber)
+        try:
+            while True:
+                writer.write(await subscriber.queue.get())
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # The spectator left, or the broadcaster is closing
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            writer.close()
+
+# Spectator Class:
+    # A spectator's copy of the board, built from a snapshot and kept up to date by diffs
+class Spectator:
+    def __init__(self):
+        """Constructor function for the Spectator Class"""
+        self.rows = 0
+        self.cols = 0
+        self.cells = bytearray()
+        self.cursor = (0, 0)
+        self.status = GameStatus.PLAYING.name
+        self.flags = 0
+
+    def apply(self, message):
+        """Apply one message (a decoded line) to the board"""
+        if message["type"] == "snapshot":
+            self.rows = message["rows"]
+            self.cols = message["cols"]
+            self.cells = bytearray(message["cells"].encode("ascii"))
+        else:
+            for r, c, code in message["cells"]:
+                self.cells[r * self.cols + c] = ord(code)
+        self.cursor = tuple(message["cursor"])
+        self.status = message["status"]
+        self.flags = message["flags"]
+
+    def render(self):
+        """The board as text, one line per row, followed by a status line"""
+        rows = [self.cells[r * self.cols:(r + 1) * self.cols].decode("ascii") for r in range(self.rows)]
+        return "\n".join(rows + [f"status={self.status} flags={self.flags} cursor={self.cursor}"])
+
+async def watch(path, out=sys.stdout, frame_interval=1 / 30):
+    """Follow a game: print the board once the stream has been quiet for a frame interval"""
+    reader, writer = await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+    spectator = Spectator()
+    pending = False
+    while True:
+        # While there is an update not yet on screen, wait only one frame interval for the next message
+        try:
+            line = await (asyncio.wait_for(reader.readline(), frame_interval) if pending else reader.readline())
+        except asyncio.TimeoutError:
+            out.write("\x1b[H\x1b[2J" + spectator.render() + "\n")
+            out.flush()
+            pending = False
+            continue
+        if not line:
+            break
+        spectator.apply(json.loads(line))
+        pending = True
+    writer.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a Minesweeper game started with --spectate")
+    parser.add_argument("path", help="the game's spectator socket")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(watch(args.path))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
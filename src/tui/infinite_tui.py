@@ -0,0 +1,204 @@
+"""
+File: infinite_tui.py
+Module: tui
+Function: Curses frontend for the unbounded board of src/infinite.py: a scrolling viewport that follows the
+          cursor in every direction, with chunks created as the viewport first shows them.
+Inputs:
+    - An InfiniteBoard, and player input from the keyboard or mouse
+Outputs:
+    - Updates the screen (board window, status line, messages)
+Usage:
+    python -m src.main --infinite [--seed N]
+
+Only the cells inside the viewport are drawn, read a whole window at a time with InfiniteBoard.view, so a frame
+costs the same however far the player has wandered. Like Frontend, a frame normally redraws only the cells that
+changed, and everything when the viewport scrolls or the terminal is resized.
+"""
+import curses
+
+from src.classes import GameStatus
+from src.tui.screen import CountingScreen
+from src.tui.run_tui import CELL_W, CELL_H
+
+# Screen character of each board.view() code
+CELL_CHARS = {"#": "H", "F": "⚑", "*": "M", ".": " "}
+
+# Width of the row labels on the left (room for a sign and six digits)
+LABEL_W = 8
+
+class InfiniteFrontend:
+    """
+    InfiniteFrontend Class:
+        Interfaces between player input and an InfiniteBoard. Board coordinates are unbounded and may be negative;
+        the viewport's top-left board cell is (view_r, view_c).
+    """
+    def __init__(self, stdscr, board):
+        """Constructor function for the InfiniteFrontend class"""
+        self.stdscr = CountingScreen(stdscr)
+        self.board = board
+
+        # Cursor, starting on the origin (always an open area), and the top-left cell of the viewport
+        self.cur_r = 0
+        self.cur_c = 0
+        sh, sw = self.stdscr.getmaxyx()
+        _, _, view_rows, view_cols = self.viewport(sh, sw)
+        self.view_r = -(view_rows // 2)
+        self.view_c = -(view_cols // 2)
+
+        # Render state, as in Frontend.draw_frame
+        self.full_redraw = True
+        self.dirty_cells = set()
+        self.drawn_cursor = None
+        self.drawn_size = None
+        self.drawn_message = None
+        self.frame_calls = 0
+        self.message = "Space=Reveal  f=Flag  Arrows/hjkl=Move  Mouse: L=Reveal R=Flag  q=Quit"
+        self.should_quit = False
+
+    def viewport(self, scr_h, scr_w):
+        """Return (off_y, off_x, view_rows, view_cols): where the viewport is drawn and how many cells it shows"""
+        # Leave the top line for the status and the bottom two for the message line and a gap
+        view_rows = max((scr_h - 3) // CELL_H, 1)
+        view_cols = max((scr_w - LABEL_W) // CELL_W, 1)
+        return 1, LABEL_W, view_rows, view_cols
+
+    def scroll_to_cursor(self, view_rows, view_cols):
+        """Scroll the viewport just enough to keep the cursor visible. Returns True if it moved."""
+        old_view = (self.view_r, self.view_c)
+        if self.cur_r < self.view_r:
+            self.view_r = self.cur_r
+        elif self.cur_r >= self.view_r + view_rows:
+            self.view_r = self.cur_r - view_rows + 1
+        if self.cur_c < self.view_c:
+            self.view_c = self.cur_c
+        elif self.cur_c >= self.view_c + view_cols:
+            self.view_c = self.cur_c - view_cols + 1
+        return (self.view_r, self.view_c) != old_view
+
+    def draw_status(self, sw):
+        """Draw the status line: game status, cursor position and how much of the board exists"""
+        board = self.board
+        status = f"{board.game_status.name}  cursor=({self.cur_r}, {self.cur_c})  revealed={board.revealed_cells}  " \
+                 f"flags={board.placed_flags}  chunks={len(board.chunks)}  seed={board.seed}"
+        self.stdscr.addstr(0, 0, status[:sw - 1])
+        self.stdscr.clrtoeol()
+
+    def draw_frame(self):
+        """
+        Draw the visible window of the board. Only the dirty cells and the old and new cursor cells are
+        redrawn unless the viewport scrolled or the terminal was resized.
+        """
+        calls_at_start = self.stdscr.calls
+        sh, sw = self.stdscr.getmaxyx()
+        off_y, off_x, view_rows, view_cols = self.viewport(sh, sw)
+        if (sh, sw) != self.drawn_size:
+            self.full_redraw = True
+        if self.scroll_to_cursor(view_rows, view_cols):
+            self.full_redraw = True
+
+        if self.full_redraw:
+            self.stdscr.erase()
+            lines = self.board.view(self.view_r, self.view_c, view_rows, view_cols)
+            for row, line in enumerate(lines):
+                r = self.view_r + row
+                self.stdscr.addstr(off_y + row * CELL_H, 0, f"{r:>{LABEL_W - 1}}")
+                for col, code in enumerate(line):
+                    self.draw_cell(r, self.view_c + col, code, off_y, off_x)
+            self.drawn_message = None
+        else:
+            cursor = (self.cur_r, self.cur_c)
+            if cursor != self.drawn_cursor:
+                self.dirty_cells.add(cursor)
+                if self.drawn_cursor is not None:
+                    self.dirty_cells.add(self.drawn_cursor)
+            for r, c in self.dirty_cells:
+                # Cells outside the viewport are not on screen, so skip them
+                if self.view_r <= r < self.view_r + view_rows and self.view_c <= c < self.view_c + view_cols:
+                    self.draw_cell(r, c, self.board.view(r, c, 1, 1)[0], off_y, off_x)
+        self.draw_status(sw)
+        if self.message != self.drawn_message:
+            self.stdscr.addstr(sh - 2, 0, self.message[:sw - 1])
+            self.stdscr.clrtoeol()
+            self.drawn_message = self.message
+        self.stdscr.refresh()
+
+        # Record what is now on screen for the next frame
+        self.full_redraw = False
+        self.dirty_cells.clear()
+        self.drawn_cursor = (self.cur_r, self.cur_c)
+        self.drawn_size = (sh, sw)
+        self.frame_calls = self.stdscr.calls - calls_at_start
+
+    def draw_cell(self, r, c, code, off_y, off_x):
+        """Draw one visible cell from its board.view() code, highlighted if the cursor is on it"""
+        y = off_y + (r - self.view_r) * CELL_H
+        x = off_x + (c - self.view_c) * CELL_W
+        text = f"[{CELL_CHARS.get(code, code)}]"
+        if (self.cur_r, self.cur_c) == (r, c):
+            self.stdscr.attron(curses.A_REVERSE)
+            self.stdscr.addstr(y, x, text)
+            self.stdscr.attroff(curses.A_REVERSE)
+        else:
+            self.stdscr.addstr(y, x, text)
+
+    def mouse_to_cell(self, mx, my):
+        """Return the board cell under a mouse position, or None outside the viewport"""
+        sh, sw = self.stdscr.getmaxyx()
+        off_y, off_x, view_rows, view_cols = self.viewport(sh, sw)
+        if not (off_y <= my < off_y + view_rows * CELL_H and off_x <= mx < off_x + view_cols * CELL_W):
+            return None
+        return self.view_r + (my - off_y) // CELL_H, self.view_c + (mx - off_x) // CELL_W
+
+    def reveal(self, r, c):
+        """Reveal a cell and mark what it opened for redrawing"""
+        self.dirty_cells.update(self.board.reveal(r, c))
+        if self.board.game_status == GameStatus.LOSE:
+            self.message = "You hit a mine! The board stays open to look around; q to quit."
+
+    def toggle_flag(self, r, c):
+        if self.board.is_flagged(r, c):
+            self.board.remove_flag(r, c)
+        else:
+            self.board.place_flag(r, c)
+        self.dirty_cells.add((r, c))
+
+    def process_input(self, ch, mouse=None):
+        """Handle one key or mouse event. Returns False once the player quits."""
+        if ch == ord('q'):
+            self.should_quit = True
+            return False
+        if ch == curses.KEY_RESIZE:
+            self.full_redraw = True
+            return True
+
+        if ch == curses.KEY_MOUSE:
+            try:
+                _, mx, my, _, bstate = mouse if mouse is not None else curses.getmouse()
+            except curses.error:
+                return True
+            pos = self.mouse_to_cell(mx, my)
+            if pos is None:
+                return True
+            self.cur_r, self.cur_c = pos
+            if bstate & (curses.BUTTON1_CLICKED | curses.BUTTON1_PRESSED):
+                ch = ord(' ')
+            elif bstate & (curses.BUTTON3_CLICKED | curses.BUTTON3_PRESSED):
+                ch = ord('f')
+            else:
+                return True
+
+        # Keyboard navigation has no edges to wrap at
+        if ch in (curses.KEY_UP, ord('k')): self.cur_r -= 1
+        elif ch in (curses.KEY_DOWN, ord('j')): self.cur_r += 1
+        elif ch in (curses.KEY_LEFT, ord('h')): self.cur_c -= 1
+        elif ch in (curses.KEY_RIGHT, ord('l')): self.cur_c += 1
+        elif self.board.game_status == GameStatus.LOSE: pass                         # Only moving around after a loss
+        elif ch in (ord(' '), ord('\n')): self.reveal(self.cur_r, self.cur_c)        # Reveal with space or Enter
+        elif ch in (ord('f'), ord('F')): self.toggle_flag(self.cur_r, self.cur_c)   # Flag/unflag with 'f/F'
+        return True
+
+    def run(self):
+        """Draw a frame after every input event until the player quits"""
+        self.draw_frame()
+        while self.process_input(self.stdscr.getch()):
+            self.draw_frame()
@@ -3,7 +3,7 @@ File: run_tui.py
 Module: tui
 Function: Provides the terminal-based (curses) text user interface (TUI) for the Minesweeper game.
 Inputs:
-    - User keystrokes (arrow keys = move, space = reveal, f/F = flag, Enter = next/reveal, q = quit)
+    - User keystrokes (arrow keys = move, space = reveal, f/F = flag, ? = hint, o = probability overlay, Enter = next/reveal, q = quit)
     - User mouse clicks (left = reveal, right = flag)
 Outputs:
     - Updates the screen (board, flags, messages)
@@ -22,12 +22,28 @@ NOTE: All code in the file was authored by 1 or more of the authors. No outside
 # Imports:
 import curses
 from curses.textpad import Textbox, rectangle
-import platform
-from src.classes import GameManager, Cell, CellState, GameStatus
+import os
+import sys
+import time
+from src.backends import DEFAULT_BACKEND, new_game_manager
+from src.engine import DEFAULT_ROWS, DEFAULT_COLS
+from src.classes import GameStatus
+from src.event_log import record_game
+from src.events import CellsRevealed, FlagChanged, StatusChanged
+from src.snapshot import load_snapshot, save_snapshot
+from src.probability import ProbabilityEngine
+from src.solver import Solver
+from src.tui.screen import CountingScreen
 
 # Global variables:
-ROWS, COLS = 10, 10     # 10 rows & columns to create 10x10 board
+ROWS, COLS = DEFAULT_ROWS, DEFAULT_COLS     # Default board size: 10 rows & columns to create 10x10 board
 CELL_W, CELL_H = 3, 1   # 3 chars per cell, 1 row high
+NO_GUESS_MIN_POOL, NO_GUESS_POOL_SIZE = 5, 20   # Refill the no-guess pool to 20 boards once it drops below 5
+TARGET_FPS = 60            # At most this many frames per second are drawn while input keeps arriving
+MAX_BATCH = 256            # Most input events applied before a frame is drawn
+PREGENERATE_MIN_CELLS = 100_000    # Boards at least this big are generated in the background before the first click
+PREGENERATE_POLL = 0.1     # Seconds between checks on a background board generation while input is idle
+MIN_VIEW = 10           # The terminal must fit at least this many rows/columns of cells (or the whole board if smaller)
 
 class Frontend():
     """
@@ -35,14 +51,75 @@ class Frontend():
         Manages the terminal based UI using the curses library
         Interfaces between player input and the GameManager backend    
     """
-    def __init__(self, stdscr):
+    def __init__(self, stdscr, rows=ROWS, cols=COLS, record_path=None, backend=DEFAULT_BACKEND, no_guess_dir=None,
+                 spectate_path=None):
         """Constructor function for the Frontend class"""
-        self.stdscr = stdscr
-        self.game_manager = GameManager()
+        # Every curses call goes through a counter so the cost of each frame can be measured
+        self.stdscr = CountingScreen(stdscr)
+
+        # Board dimensions. Boards bigger than the terminal are shown through a scrolling viewport.
+        self.rows = rows
+        self.cols = cols
+
+        # Board storage backend of every game (see src/backends.py)
+        self.backend = backend
+        self.attach_game(new_game_manager(backend, rows=rows, cols=cols))
         self.cur_r = 0
         self.cur_c = 0
+
+        # Where to write the event log of each game (None = do not record). Later games get "-2", "-3", ... suffixes.
+        self.record_path = record_path
+        self.games_recorded = 0
+
+        # Spectator stream (see src/spectate.py): None unless spectate_path is given. published is the
+            # (game, cursor, status, flags) state the spectators were last sent.
+        self.broadcaster = None
+        self.published = None
+        if spectate_path is not None:
+            # Imported here: the broadcaster pulls in asyncio
+            from src.spectate import Broadcaster
+            self.broadcaster = Broadcaster(spectate_path, self.spectator_snapshot)
+            self.broadcaster.start()
+
+        # Directory of the no-guess board pools (None = ordinary random boards), and the pool in use
+        self.no_guess_dir = no_guess_dir
+        self.no_guess_pool = None
+
+        # Top-left board cell shown in the viewport
+        self.view_r = 0
+        self.view_c = 0
+
+        # Allowed mine counts scale with the board area (10-20 on the default 10x10 board)
+        self.min_mines = max(rows * cols // 10, 1)
+        self.max_mines = max(rows * cols // 5, self.min_mines)
         self.alphabet = "abcdefghijklmnopqrstuvwxyz"
 
+        # Render state: draw_board only redraws the cells in dirty_cells unless a full redraw is needed
+        self.full_redraw = True     # Erase and redraw everything on the next frame
+        self.dirty_cells = set()    # (row, col) cells that changed since the last frame
+        self.drawn_cursor = None    # Cursor position highlighted in the last frame
+        self.drawn_size = None      # Terminal size the last frame was drawn for
+        self.drawn_status = None    # Game status shown in the last frame
+        self.drawn_flags = None     # Remaining flag count shown in the last frame
+        self.frame_calls = 0        # Number of curses calls made by the last draw_board frame
+
+        # Input coalescing: every queued event is applied before one frame is drawn, at most TARGET_FPS frames a second
+        self.frame_interval = 1 / TARGET_FPS
+        self.last_frame = 0.0       # perf_counter() time the last frame of the game loop was drawn
+
+        # Hint engine (created the first time a hint is asked for) and the message line below the board
+        self.solver = None
+        self.message = ""
+        self.drawn_message = None
+
+        # A reveal clicked while the board is still generating, applied once the board is ready
+        self.pending_click = None
+
+        # Mine probability overlay (toggled with 'o'): hidden cells show their chance of a mine in tenths
+        self.overlay = False
+        self.probability_engine = None
+        self.probabilities = None
+
     def draw_game_status(self):
         """Display the current game status"""
         
@@ -98,8 +175,8 @@ class Frontend():
         try:
             num_mines = int(num_mines)
 
-            # Check valid range [10-20]
-            if num_mines < 10 or num_mines > 20:
+            # Check valid range [min_mines-max_mines]
+            if num_mines < self.min_mines or num_mines > self.max_mines:
                 raise ValueError("Invalid number of mines.")
             
             # Update game settings in backend
@@ -107,15 +184,126 @@ class Frontend():
             self.game_manager.total_flags = num_mines
             self.game_manager.remaining_flag_count = num_mines
 
+            # No-guess boards come from the pool. Otherwise huge boards start building in the background
+                # so the first reveal does not stall the interface.
+            if self.no_guess_dir is not None:
+                self.start_no_guess_game(num_mines)
+            elif self.rows * self.cols >= PREGENERATE_MIN_CELLS:
+                self.game_manager.start_pregeneration()
+
+            # The settings are final now, so the game's event log can start
+            self.start_recording()
+
         # If the value entered cannot be converted, display error
         except ValueError:
-            self.stdscr.addstr(8, 0, "Error: Please enter a valid number between 10 and 20.")
+            self.stdscr.addstr(8, 0, f"Error: Please enter a valid number between {self.min_mines} and {self.max_mines}.")
             self.stdscr.refresh()
             curses.napms(1500)
 
             # Restart input prompt
             self.set_num_mines()
 
+    def start_no_guess_game(self, num_mines):
+        """Set the game up with a no-guess board from the pool and put the cursor on its start cell"""
+        # Imported here: the pool's process-pool machinery is only needed in no-guess mode
+        from src.no_guess import NoGuessPool
+
+        pool = self.no_guess_pool
+        if pool is None or pool.mines != num_mines:
+            pool = self.no_guess_pool = NoGuessPool(self.no_guess_dir, self.rows, self.cols, num_mines)
+
+        # An empty pool means searching for a board right now, which can take a moment
+        if not len(pool):
+            self.stdscr.addstr(8, 0, "Generating a no-guess board...")
+            self.stdscr.refresh()
+        seed, start = pool.take()
+
+        gm = self.game_manager
+        gm.seed = seed
+        gm.safe_first_click = True
+        gm.start_cell = start
+        self.cur_r, self.cur_c = start
+        self.message = (f"No-guess board: the first reveal opens {self.column_label(start[1])}{start[0] + 1} (S)"
+                        f"  [pool hit rate {pool.hit_rate:.0%}]")
+
+        # Top the pool back up in the background for the next games
+        pool.refill_async(NO_GUESS_MIN_POOL, NO_GUESS_POOL_SIZE)
+
+    def start_recording(self):
+        """Start logging the current game's actions, if recording was requested"""
+        if self.record_path is None:
+            return
+        self.stop_recording()
+        self.games_recorded += 1
+        path = self.record_path
+        if self.games_recorded > 1:
+            root, ext = os.path.splitext(path)
+            path = f"{root}-{self.games_recorded}{ext}"
+        # Flush every record so the log is complete even if the program crashes
+        record_game(self.game_manager, path, autoflush=True)
+
+    def stop_recording(self):
+        """Close the current game's event log, if there is one"""
+        if self.game_manager.event_log is not None:
+            self.game_manager.event_log.close()
+            self.game_manager.event_log = None
+
+    def resume_game(self, path):
+        """
+        Load the game saved at path, if there is one. Returns True if a game was resumed.
+        The game keeps the backend it was saved with; games started after it use self.backend.
+        """
+        if not os.path.exists(path):
+            return False
+        game = load_snapshot(path)
+
+        # The saved board decides the board size
+        self.rows, self.cols = game.rows, game.cols
+        self.min_mines = max(self.rows * self.cols // 10, 1)
+        self.max_mines = max(self.rows * self.cols // 5, self.min_mines)
+
+        # A no-guess board saved before its first reveal still opens at its start cell
+        if game.is_first_click and game.start_cell is not None:
+            self.cur_r, self.cur_c = game.start_cell
+        self.attach_game(game)
+        return True
+
+    def attach_game(self, game):
+        """Make game the one shown, following its events to learn which cells to redraw"""
+        game.subscribe(self.on_game_events)
+        self.game_manager = game
+        self.full_redraw = True
+
+    def on_game_events(self, events):
+        """
+        React to the events of one game action (see src/events.py): mark the changed cells for redrawing and
+        keep the hint engine and probability overlay up to date with just the newly revealed cells.
+        """
+        revealed = False
+        for event in events:
+            match event:
+                case CellsRevealed(cells):
+                    self.dirty_cells.update(cells)
+                    if self.solver is not None:
+                        self.solver.observe(cells)
+                    revealed = revealed or bool(cells)
+                case FlagChanged(row, col, _):
+                    self.dirty_cells.add((row, col))
+                case StatusChanged():
+                    # A win or loss reveals the whole board
+                    self.full_redraw = True
+
+        # Probabilities can change anywhere on the board, so the overlay is recomputed and fully redrawn
+        if self.overlay and revealed:
+            self.update_overlay()
+
+    def save_game(self, path):
+        """Save an unfinished game to path so it can be resumed; remove a stale save once the game is over"""
+        if self.game_manager.game_status == GameStatus.PLAYING:
+            save_snapshot(self.game_manager, path)
+        elif os.path.exists(path):
+            os.remove(path)
+
     def center_offsets(self, scr_h, scr_w, rows, cols, cw, ch):
         """Calculate vertical and horizontal offsets to center the board on screen"""
 
@@ -132,12 +320,63 @@ class Frontend():
         # Return the offsets used for board drawing
         return off_y, off_x
 
-    def correct_terminal_size(self, scr_h, sch_w, required_h = (ROWS + 1) * CELL_H + 9, required_w = (COLS + 1) * CELL_W):
+    def correct_terminal_size(self, scr_h, sch_w):
         """Return whether the terminal window is large enough to display the game"""
+        # The viewport must fit at least MIN_VIEW rows and columns, or the whole board if it is smaller
+        required_h = (min(self.rows, MIN_VIEW) + 1) * CELL_H + 9
+        required_w = min(self.cols, MIN_VIEW) * CELL_W + self.row_label_width()
         if scr_h < required_h or sch_w < required_w:
             return False
         return True
 
+    def row_label_width(self):
+        """Number of columns reserved left of the board for row numbers"""
+        return len(str(self.rows)) + 1
+
+    def column_label(self, c):
+        """Spreadsheet-style column label: a..z, then aa, ab, ..."""
+        label = ""
+        c += 1
+        while c > 0:
+            c, rem = divmod(c - 1, len(self.alphabet))
+            label = self.alphabet[rem] + label
+        return label
+
+    def viewport(self, scr_h, scr_w):
+        """
+        Return (off_y, off_x, view_rows, view_cols): where the viewport is drawn on screen and how many
+        board rows/columns it shows. The viewport is as large as the terminal allows, up to the whole board.
+        """
+        label_w = self.row_label_width()
+
+        # Leave room for the status line, column labels and the messages/footer below the board
+        view_rows = max(min(self.rows, (scr_h - 10) // CELL_H), 1)
+        view_cols = max(min(self.cols, (scr_w - label_w) // CELL_W), 1)
+
+        # Center the visible part of the board, keeping room for the row labels on the left
+        off_y, off_x = self.center_offsets(scr_h, scr_w, view_rows, view_cols, CELL_W, CELL_H)
+        return off_y, max(off_x, label_w), view_rows, view_cols
+
+    def scroll_to_cursor(self, view_rows, view_cols):
+        """Scroll the viewport just enough to keep the cursor visible. Returns True if it moved."""
+        old_view = (self.view_r, self.view_c)
+
+        # Move the top-left corner so the cursor lies inside the window
+        if self.cur_r < self.view_r:
+            self.view_r = self.cur_r
+        elif self.cur_r >= self.view_r + view_rows:
+            self.view_r = self.cur_r - view_rows + 1
+        if self.cur_c < self.view_c:
+            self.view_c = self.cur_c
+        elif self.cur_c >= self.view_c + view_cols:
+            self.view_c = self.cur_c - view_cols + 1
+
+        # Keep the viewport on the board (this matters after the terminal grows)
+        self.view_r = min(max(self.view_r, 0), self.rows - view_rows)
+        self.view_c = min(max(self.view_c, 0), self.cols - view_cols)
+
+        return (self.view_r, self.view_c) != old_view
+
     def display_size_warning(self):
         """Display a warning message when the terminal window is too small"""
 
@@ -156,11 +395,8 @@ class Frontend():
     def find_start_key(self):
         """Determine the correct label for the Enter/Return key based on OS"""
 
-        # Get the OS of the player
-        os_name = platform.system()
-
-        # If the OS is Darwin, use "Return"
-        if os_name == "Darwin": 
+        # If the OS of the player is Darwin (macOS), use "Return"
+        if sys.platform == "darwin":
             return "Return"
         # Otherwise, use enter
         return "Enter"
@@ -186,12 +422,12 @@ class Frontend():
             return False
 
         # Calculate vertical offset for centering
-        off_y, _ = self.center_offsets(sh, sw, ROWS, COLS, CELL_W, CELL_H)
+        off_y, _, _, _ = self.viewport(sh, sw)
 
         # Text for title, prompt, and controls
         title = "MINESWEEPER"
         prompt = f"Press {start_key} to start with {self.game_manager.total_mines} mines"
-        controls = "Arrows=move  Space=Reveal  f=Flag  Mouse: Left=Reveal Right=Flag  q=Quit"
+        controls = "Arrows=move  Space=Reveal  f=Flag  ?=Hint  Mouse: Left=Reveal Right=Flag  q=Quit"
 
         # Calculate starting locations on x-axis (padding)
         title_scr_x = max((sw - len(title)) // 2, 0)
@@ -240,82 +476,99 @@ class Frontend():
         # Draw initial board
         self.draw_board()
 
-        # Main game loop
+        # Main game loop: one batch of input events and one frame per step
+        while self.step():
+            pass
+
+    def step(self):
+        """Apply one batch of input events in order, then draw a single frame. Returns False once the game should stop."""
+        success = True
+        for ch, mouse in self.read_events():
+            success = self.process_input(ch, mouse)
+            if success:
+                self.apply_pending_click()
+
+            # Stop at a quit or a finished game; the end screen reads its own input
+            if not success or self.game_manager.should_quit or \
+                    self.game_manager.game_status in (GameStatus.WIN, GameStatus.LOSE):
+                break
+
+        # Spectators get the batch's changes before the frame (and any end screen waiting for input) is drawn
+        self.publish_changes()
+        self.draw_board()
+        self.last_frame = time.perf_counter()
+        return success and not self.game_manager.should_quit
+
+    def read_events(self):
+        """
+        Wait for the next input event, then collect every event that is already queued (key auto-repeat and the
+        scroll wheel send them in bursts) without blocking. If the last frame was drawn less than a frame interval
+        ago, events arriving before the next frame is due are collected too. Returns a list of (key, mouse) pairs,
+        where mouse is the curses.getmouse() result of a KEY_MOUSE event (read right away, while it is current).
+        """
+        events = []
+
+        # While the board generates in the background, stop waiting every PREGENERATE_POLL seconds so the progress
+            # line stays current and a click waiting for the board is applied as soon as it is ready
+        if self.pending_click is not None:
+            self.stdscr.timeout(int(PREGENERATE_POLL * 1000))
+        ch = self.get_input()
+        if ch == -1:
+            self.stdscr.timeout(-1)
+            self.apply_pending_click()
+            return events
         while True:
-            ch = self.get_input()
-            success = self.process_input(ch)
-            self.draw_board()
-            if self.game_manager.should_quit or not success:
-                break      
+            mouse = None
+            if ch == curses.KEY_MOUSE:
+                try:
+                    mouse = curses.getmouse()
+                except curses.error:
+                    mouse = None
+            events.append((ch, mouse))
+            if len(events) >= MAX_BATCH:
+                break
 
-    def draw_board(self):
-        """Draw the game board on the screen"""
+            # Wait at most until the next frame is due (a timeout of 0 only drains what is queued)
+            remaining = self.last_frame + self.frame_interval - time.perf_counter()
+            self.stdscr.timeout(max(int(remaining * 1000), 0))
+            ch = self.stdscr.getch()
+            if ch == -1:
+                break
 
-        # Clear the screen for fresh drawing
-        self.stdscr.erase()
-        sh, sw = self.stdscr.getmaxyx()
-        self.draw_game_status()
+        # Back to blocking input for the next batch and for the other screens
+        self.stdscr.timeout(-1)
+        return events
 
-        # Handle incorrect terminal size
-        if not self.correct_terminal_size(sh, sw):
-            self.display_size_warning()
+    def spectator_snapshot(self):
+        """The snapshot message for a spectator that joins or falls behind (called on the broadcaster thread)"""
+        from src.spectate import snapshot_message
+        return snapshot_message(self.game_manager, (self.cur_r, self.cur_c))
+
+    def publish_changes(self):
+        """
+        Send spectators what changed since the last publish: a diff of the dirty cells, cursor and counters,
+        or a whole snapshot when a new game started or the status changed (a loss reveals every cell).
+        """
+        if self.broadcaster is None:
             return
+        from src.spectate import diff_message, snapshot_message
+        gm = self.game_manager
+        cursor = (self.cur_r, self.cur_c)
+        state = (gm, cursor, gm.game_status, gm.remaining_flag_count)
+        if self.published is None or self.published[0] is not gm or self.published[2] != gm.game_status:
+            self.broadcaster.publish(snapshot_message(gm, cursor))
+        elif self.dirty_cells or state != self.published:
+            self.broadcaster.publish(diff_message(gm, self.dirty_cells, cursor))
+        self.published = state
+
+    def stop_spectating(self):
+        """Disconnect every spectator and remove the socket"""
+        if self.broadcaster is not None:
+            self.broadcaster.close()
 
-        # Calculate offsets for centering board
-        off_y, off_x = self.center_offsets(sh, sw, ROWS, COLS, CELL_W, CELL_H)
-
-        # Draw column letters
-        for c in range(COLS):
-            x = off_x + c * CELL_W
-            self.stdscr.addstr(off_y - 1, x + 1, f"{self.alphabet[c]}")
-
-        # Draw row numbers
-        for r in range(ROWS):
-            y = off_y + r * CELL_H
-            self.stdscr.addstr(y, off_x - 2, f"{r+1}")
-
-        # Draw the cells of the board
-        for r in range(ROWS):
-            for c in range(COLS):
-                # Get cell and render output depending on cell status
-                cell = self.game_manager.grid[r % ROWS][c % COLS]
-
-                # Calculate screen coordinates for this cell
-                y = off_y + r * CELL_H
-                x = off_x + c * CELL_W
-
-                # Handle per-cell display
-                if cell.flagged:
-                    ch = "⚑"
-                elif cell.hidden:
-                    ch = "H"
-                elif cell.state == CellState.MINED:
-                    ch = "M"
-                elif cell.adjacent != 0:
-                    ch = str(cell.adjacent)
-                elif cell.state == CellState.NONEADJACENT:
-                    ch = " "
-                elif cell.state is None:
-                    ch = " "
-
-                # Highlight cursor (mostly for keyboard input)
-                if (self.cur_r, self.cur_c) == (r, c):
-                    self.stdscr.attron(curses.A_REVERSE)   # turn on reverse video
-                    self.stdscr.addstr(y, x, f"[{ch}]")    # draw highlighted cell
-                    self.stdscr.attroff(curses.A_REVERSE)  # turn highlight back off
-                else:
-                    self.stdscr.addstr(y, x, f"[{ch}]")    # draw normal cell
-
-        # Show remaining flags/mines counter
-        self.stdscr.addstr(sh - 1, 0,
-            f"Remaining Flags/Mines: {self.game_manager.remaining_flag_count}"
-        )
-         # Show control instructions
-        self.stdscr.addstr(sh - 3, 0,
-            "Arrows=Move  Space=Reveal  f=Flag  Mouse: Left=Reveal Right=Flag  q=Quit  ",
-        )
-        self.stdscr.clrtoeol()  # Clear the rest of the line to keep output clean
-        self.stdscr.refresh()   # Refresh the screen to apply all drawing operations
+    def draw_board(self):
+        """Draw a frame of the game board, then show the win/loss screen if the game just ended"""
+        self.draw_frame()
 
         # AFTER drawing the board, check if game over
         result = self.check_game_status()
@@ -328,36 +581,237 @@ class Frontend():
             self.reset_game()
             return True # Restart game loop
 
+    def draw_frame(self):
+        """
+        Draw the game board on the screen.
+        Only the cells marked dirty (plus the old and new cursor cells) are redrawn. Everything is
+        erased and redrawn when the terminal size or game status changes, or full_redraw is set.
+        """
+
+        # Remember the call count so the number of curses calls in this frame can be measured
+        calls_at_start = self.stdscr.calls
+        sh, sw = self.stdscr.getmaxyx()
+        status = self.game_manager.game_status
+
+        # A new terminal size or game status changes more than single cells, so draw everything again
+        if (sh, sw) != self.drawn_size or status != self.drawn_status:
+            self.full_redraw = True
+
+        # Calculate offsets for centering board and the part of the board that fits on screen
+        off_y, off_x, view_rows, view_cols = self.viewport(sh, sw)
+
+        # Scrolling shifts every visible cell, so it needs a full redraw as well
+        if self.scroll_to_cursor(view_rows, view_cols):
+            self.full_redraw = True
+
+        if self.full_redraw:
+            # Clear the screen for fresh drawing
+            self.stdscr.erase()
+            self.draw_game_status()
+
+            # Handle incorrect terminal size
+            if not self.correct_terminal_size(sh, sw):
+                self.display_size_warning()
+                self.drawn_size = None  # Make sure the next frame is a full redraw
+                self.frame_calls = self.stdscr.calls - calls_at_start
+                return
+
+            # Only the cells inside the viewport are drawn, so this costs the same for any board size
+            visible_rows = range(self.view_r, self.view_r + view_rows)
+            visible_cols = range(self.view_c, self.view_c + view_cols)
+            label_w = self.row_label_width()
+
+            # Draw column letters
+            for c in visible_cols:
+                x = off_x + (c - self.view_c) * CELL_W
+                label = self.column_label(c)[-CELL_W:]
+                self.stdscr.addstr(off_y - 1, x + 1 if len(label) == 1 else x, label)
+
+            # Draw row numbers
+            for r in visible_rows:
+                y = off_y + (r - self.view_r) * CELL_H
+                self.stdscr.addstr(y, off_x - label_w, f"{r+1:>{label_w - 1}}")
+
+            # Draw the cells of the board
+            for r in visible_rows:
+                for c in visible_cols:
+                    self.draw_cell(r, c, off_y, off_x)
+
+             # Show control instructions
+            self.stdscr.addstr(sh - 3, 0,
+                "Arrows=Move  Space=Reveal  f=Flag  c=Chord  ?=Hint  o=Odds  Mouse: L=Reveal M=Chord R=Flag  q=Quit  ",
+            )
+            self.stdscr.clrtoeol()  # Clear the rest of the line to keep output clean
+            self.drawn_flags = None
+            self.drawn_message = None
+        else:
+            # Redraw only what changed: dirty cells plus the cells the cursor left and moved onto
+            cursor = (self.cur_r, self.cur_c)
+            if cursor != self.drawn_cursor:
+                self.dirty_cells.add(cursor)
+                if self.drawn_cursor is not None:
+                    self.dirty_cells.add(self.drawn_cursor)
+            for r, c in self.dirty_cells:
+                # Cells scrolled out of the viewport are not on screen, so skip them
+                if self.view_r <= r < self.view_r + view_rows and self.view_c <= c < self.view_c + view_cols:
+                    self.draw_cell(r, c, off_y, off_x)
+
+        # Show remaining flags/mines counter (only when it changed)
+        if self.game_manager.remaining_flag_count != self.drawn_flags:
+            self.stdscr.addstr(sh - 1, 0,
+                f"Remaining Flags/Mines: {self.game_manager.remaining_flag_count}"
+            )
+            self.stdscr.clrtoeol()
+            self.drawn_flags = self.game_manager.remaining_flag_count
+
+        # Show the hint/message line (only when it changed)
+        if self.message != self.drawn_message:
+            self.stdscr.addstr(sh - 2, 0, self.message[:sw - 1])
+            self.stdscr.clrtoeol()
+            self.drawn_message = self.message
+
+        self.stdscr.refresh()   # Refresh the screen to apply all drawing operations
+
+        # Record what is now on screen for the next frame
+        self.full_redraw = False
+        self.dirty_cells.clear()
+        self.drawn_cursor = (self.cur_r, self.cur_c)
+        self.drawn_size = (sh, sw)
+        self.drawn_status = status
+        self.frame_calls = self.stdscr.calls - calls_at_start
+
+    def cell_char(self, r, c):
+        """Return the character shown for the cell at row r, column c"""
+        gm = self.game_manager
+        index = r * gm.cols + c
+
+        # Handle per-cell display
+        if gm.flagged[index]:
+            return "⚑"
+        elif gm.is_first_click and gm.start_cell == (r, c):
+            return "S"
+        elif gm.hidden[index]:
+            if self.overlay and self.probabilities is not None:
+                chance = self.probabilities.probability(r, c)
+                return "*" if chance >= 1 else str(min(int(chance * 10), 9))
+            return "H"
+        elif gm.mines[index]:
+            return "M"
+        elif gm.adjacent[index] != 0:
+            return str(gm.adjacent[index])
+        return " "
+
+    def draw_cell(self, r, c, off_y, off_x):
+        """Draw a single (visible) cell of the board, highlighted if the cursor is on it"""
+
+        # Calculate screen coordinates for this cell, relative to the viewport
+        y = off_y + (r - self.view_r) * CELL_H
+        x = off_x + (c - self.view_c) * CELL_W
+        ch = self.cell_char(r, c)
+
+        # Highlight cursor (mostly for keyboard input)
+        if (self.cur_r, self.cur_c) == (r, c):
+            self.stdscr.attron(curses.A_REVERSE)   # turn on reverse video
+            self.stdscr.addstr(y, x, f"[{ch}]")    # draw highlighted cell
+            self.stdscr.attroff(curses.A_REVERSE)  # turn highlight back off
+        else:
+            self.stdscr.addstr(y, x, f"[{ch}]")    # draw normal cell
+
     def mouse_to_cell(self, mx, my):
         """Processes player any-click on cell"""
 
         # Get the screen height/width
         sh, sw = self.stdscr.getmaxyx()
 
-        # Calculate offsets to determine where the board is centered
-        off_y, off_x = self.center_offsets(sh, sw, ROWS, COLS, CELL_W, CELL_H)
+        # Calculate offsets to determine where the viewport is drawn
+        off_y, off_x, view_rows, view_cols = self.viewport(sh, sw)
 
         # Check if the mouse position is above/left of the board 
         if my < off_y or mx < off_x:
             return None
         
         # Check if the mouse position is below/right of the board
-        if my >= off_y + ROWS * CELL_H or mx >= off_x + COLS * CELL_W:
+        if my >= off_y + view_rows * CELL_H or mx >= off_x + view_cols * CELL_W:
             return None
         
-        # Convert screen coordinates to cell indices
-        r = (my - off_y) // CELL_H
-        c = (mx - off_x) // CELL_W
+        # Convert screen coordinates to cell indices, shifted by the viewport's scroll offset
+        r = self.view_r + (my - off_y) // CELL_H
+        c = self.view_c + (mx - off_x) // CELL_W
 
         # Return the cell indices if they are valid
-        if 0 <= r < ROWS and 0 <= c < COLS:
+        if 0 <= r < self.rows and 0 <= c < self.cols:
             return (r, c)
         
         return None
 
     def handle_left_click(self, r, c):
         """Handle a left-click on the game board"""
+        # The first reveal needs the board. If it is still generating, the click waits for it while input goes on.
+        if self.game_manager.pregeneration_running():
+            self.pending_click = (r, c)
+            self.show_generation_progress()
+            return
+
+        # The cells this click revealed reach on_game_events, which marks them for redrawing
         self.game_manager.handle_clicked_cell(r, c)
+        self.message = ""
+
+    def handle_chord(self, r, c):
+        """Chord on a revealed number: reveal all its unflagged neighbors at once when its flags are complete"""
+        # The whole batch is one backend action, so on_game_events gets all the cells it revealed at once
+        self.game_manager.chord(r, c)
+
+    def show_generation_progress(self):
+        """Put the progress of the background board generation on the message line"""
+        self.message = f"Generating board... {self.game_manager.pregen_progress:.0%} (the reveal follows when it is done)"
+
+    def apply_pending_click(self):
+        """Reveal the cell clicked while the board was generating, once it is ready; until then update the progress"""
+        if self.pending_click is None:
+            return
+        if self.game_manager.pregeneration_running():
+            self.show_generation_progress()
+            return
+        r, c = self.pending_click
+        self.pending_click = None
+        self.handle_left_click(r, c)
+
+    def get_solver(self):
+        """Return the hint engine for this game, creating it the first time it is needed"""
+        if self.solver is None:
+            self.solver = Solver(self.game_manager)
+        return self.solver
+
+    def toggle_overlay(self):
+        """Turn the mine probability overlay on or off"""
+        self.overlay = not self.overlay
+        if self.overlay:
+            self.update_overlay()
+            self.message = "Overlay: digit = chance of a mine in tenths, * = certain mine (o to hide)"
+        else:
+            self.message = ""
+        self.full_redraw = True
+
+    def update_overlay(self):
+        """Recompute the probabilities shown by the overlay"""
+        if self.probability_engine is None:
+            self.probability_engine = ProbabilityEngine(self.game_manager, self.get_solver())
+        self.probabilities = self.probability_engine.compute()
+        self.full_redraw = True
+
+    def show_hint(self):
+        """Move the cursor to a cell the solver proves safe, or say that no safe move is known"""
+        if self.game_manager.is_first_click:
+            self.message = "Hint: the first reveal is always safe"
+            return
+
+        hint = self.get_solver().hint()
+        if hint is None:
+            self.message = "Hint: no certain safe move - you will have to guess"
+            return
+
+        self.cur_r, self.cur_c = hint
+        self.message = f"Hint: {self.column_label(hint[1])}{hint[0] + 1} is safe"
 
     def handle_right_click(self, r, c):
         """Handle a right-click action on the game board"""
@@ -389,16 +843,17 @@ class Frontend():
         
         return None
     
-    def process_input(self, ch):
-        """Handle player input from keyboard or mouse"""
+    def process_input(self, ch, mouse=None):
+        """Handle player input from keyboard or mouse. mouse is the getmouse() result if it was already read."""
 
         # Quit the game if 'q' is pressed
         if ch == ord('q'):
             self.game_manager.should_quit = True
             return False
 
-        # Redraw board if the terminal window is resized
+        # Redraw the whole board if the terminal window is resized
         if ch == curses.KEY_RESIZE:
+            self.full_redraw = True
             self.draw_board()
             return True
 
@@ -406,8 +861,8 @@ class Frontend():
         if ch == curses.KEY_MOUSE:
             # Get mouse event info (x,y coords + button state)
             try:
-                _, mx, my, _, bstate = curses.getmouse() 
-           
+                _, mx, my, _, bstate = mouse if mouse is not None else curses.getmouse()
+
            # Ignore errors if no mouse event captured
             except curses.error:
                 return True 
@@ -429,25 +884,42 @@ class Frontend():
             elif bstate & curses.BUTTON3_CLICKED or bstate & curses.BUTTON3_PRESSED:
                 self.handle_right_click(r, c)
 
+            # Middle-click
+            elif bstate & curses.BUTTON2_CLICKED or bstate & curses.BUTTON2_PRESSED:
+                self.handle_chord(r, c)
+
             return True
 
         # Keyboard navigation
-        if ch in (curses.KEY_UP, ord('k')): self.cur_r = (self.cur_r - 1) % ROWS            # Up or 'k'
-        elif ch in (curses.KEY_DOWN, ord('j')): self.cur_r = (self.cur_r + 1) % ROWS        # Down or 'j'
-        elif ch in (curses.KEY_LEFT, ord('h')): self.cur_c = (self.cur_c - 1) % COLS        # Left or 'h'
-        elif ch in (curses.KEY_RIGHT, ord('l')): self.cur_c = (self.cur_c + 1) % COLS       # Right or 'l'
+        if ch in (curses.KEY_UP, ord('k')): self.cur_r = (self.cur_r - 1) % self.rows            # Up or 'k'
+        elif ch in (curses.KEY_DOWN, ord('j')): self.cur_r = (self.cur_r + 1) % self.rows        # Down or 'j'
+        elif ch in (curses.KEY_LEFT, ord('h')): self.cur_c = (self.cur_c - 1) % self.cols        # Left or 'h'
+        elif ch in (curses.KEY_RIGHT, ord('l')): self.cur_c = (self.cur_c + 1) % self.cols       # Right or 'l'
         elif ch in (ord(' '), ord('\n')): self.handle_left_click(self.cur_r, self.cur_c)    # Reveal cell at cursor with space or Enter
         elif ch in (ord('f'), ord('F')): self.handle_right_click(self.cur_r, self.cur_c)    # Flag/unflag cell at cursor with 'f/F'
+        elif ch in (ord('c'), ord('C')): self.handle_chord(self.cur_r, self.cur_c)          # Chord on the number at cursor with 'c/C'
+        elif ch == ord('?'): self.show_hint()                                               # Move to a safe cell with '?'
+        elif ch in (ord('o'), ord('O')): self.toggle_overlay()                              # Show/hide mine probabilities with 'o/O'
 
         return True
     
     def reset_game(self):
         """Reset the game frontend & backend to its initial state"""
         self.stdscr.erase()
-        self.game_manager = GameManager()
+        self.stop_recording()
+        self.attach_game(new_game_manager(self.backend, rows=self.rows, cols=self.cols))
         self.cur_r = 0
         self.cur_c = 0
+        self.view_r = 0
+        self.view_c = 0
+        self.solver = None
+        self.message = ""
+        self.pending_click = None
+        self.overlay = False
+        self.probability_engine = None
+        self.probabilities = None
         self.set_num_mines()
+        self.full_redraw = True
         self.draw_board()
 
     def display_game_update(self, message_object):
@@ -483,10 +955,10 @@ class Frontend():
                 continue      # Otherwise, keep looping
             
             # Calculate vertical offset to center board + messages
-            off_y, _ = self.center_offsets(sh, sw, ROWS, COLS, CELL_W, CELL_H)
+            off_y, _, view_rows, _ = self.viewport(sh, sw)
 
             # Place messages just below the board
-            msg_y = off_y + ROWS * CELL_H + 1
+            msg_y = off_y + view_rows * CELL_H + 1
 
             # Calculate x-coordinates to center each message line
             main_message_x = max((sw - len(main_message)) // 2, 0)
@@ -0,0 +1,31 @@
+"""
+File: screen.py
+Module: tui
+Function: Wraps a curses window so the frontend can count how many curses calls each frame makes.
+Inputs:
+    - A curses window (normally stdscr)
+Outputs:
+    - The same window interface, plus a running count of calls made through it
+"""
+
+class CountingScreen:
+    """
+    CountingScreen Class:
+        Passes every attribute through to the wrapped window and counts each method call.
+        The Frontend takes the difference of `calls` around a frame to measure the cost of that frame.
+    """
+    def __init__(self, window):
+        """Constructor function for the CountingScreen class"""
+        self.window = window
+        self.calls = 0
+
+    def __getattr__(self, name):
+        """Look up the attribute on the real window, wrapping methods so their calls are counted"""
+        attr = getattr(self.window, name)
+        if not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return attr(*args, **kwargs)
+        return counted
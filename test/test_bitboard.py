@@ -0,0 +1,70 @@
+"""
+File: test_bitboard.py
+Module: test
+Function: Unit tests for the big-integer bitboard backend and the backend selector.
+Inputs:
+    - src.bitboard, src.backends, src.classes
+Outputs:
+    - When run with pytest, the test results.
+"""
+import random
+import pytest
+from src.backends import new_game_manager
+from src.bitboard import BitboardGameManager
+from src.bitpack import layer_to_int
+from src.classes import GameManager, count_adjacent
+
+def play_both(seed):
+    """Play the same random clicks, flags and chords on both backends, checking they agree after every move."""
+    rng = random.Random(seed)
+    rows, cols = rng.randint(1, 25), rng.randint(1, 25)
+    mines = rng.randint(0, rows * cols // 4)
+    games = []
+    for backend in ("bytes", "bitboard"):
+        game = new_game_manager(backend, seed=seed, rows=rows, cols=cols, debug=True)
+        game.set_total_mines(mines)
+        game.total_flags = game.remaining_flag_count = mines
+        games.append(game)
+
+    byte_game, bit_game = games
+    for _ in range(40):
+        r, c = rng.randrange(rows), rng.randrange(cols)
+        choice = rng.random()
+        if choice < 0.2:
+            byte_game.place_flag(r, c)
+            bit_game.place_flag(r, c)
+        elif choice < 0.35:
+            assert sorted(byte_game.chord(r, c)) == sorted(bit_game.chord(r, c))
+        else:
+            assert sorted(byte_game.handle_clicked_cell(r, c)) == sorted(bit_game.handle_clicked_cell(r, c))
+        assert bytes(bit_game.hidden) == byte_game.hidden
+        assert bytes(bit_game.flagged) == byte_game.flagged
+        assert bit_game.game_status == byte_game.game_status
+        assert bit_game.hidden_safe_cells == byte_game.hidden_safe_cells
+    assert bytes(bit_game.mines) == byte_game.mines
+
+@pytest.mark.parametrize("seed", range(50))
+def test_bitboard_matches_byte_backend(seed):
+    """The bitboard backend gives the same board, reveals, flags and outcome as the byte backend."""
+    play_both(seed)
+
+def test_flood_fill_stops_at_row_edges():
+    """Dilation must not wrap from the end of one row onto the start of the next."""
+    # Only the first column is mined, so the right half is open and the last column of each row
+        # sits right before a mined cell of the next row
+    game = BitboardGameManager(seed=0, rows=4, cols=6)
+    game.set_total_mines(4)
+    game.mines = bytearray([1, 0, 0, 0, 0, 0] * 4)
+    game.adjacent = count_adjacent(bytearray([1, 0, 0, 0, 0, 0] * 4), 4, 6)
+    game.zero_mask = layer_to_int(bytearray([0, 0, 1, 1, 1, 1] * 4))
+    game.is_first_click = False
+    revealed = game.rec_reveal(0, 5)
+    assert sorted(revealed) == [(r, c) for r in range(4) for c in range(1, 6)]
+    assert game.check_win()
+
+def test_backend_selector():
+    """The selector builds the requested backend and rejects unknown names."""
+    assert type(new_game_manager("bytes")) is GameManager
+    assert type(new_game_manager("bitboard", rows=5, cols=7)) is BitboardGameManager
+    with pytest.raises(ValueError):
+        new_game_manager("numpy")
@@ -0,0 +1,54 @@
+"""
+File: test_engine.py
+Module: test
+Function: Tests for the import-light engine entry point and the headless `python -m src` command line.
+Inputs:
+    - src.engine, src.__main__
+Outputs:
+    - When run with pytest, the test results.
+"""
+import subprocess
+import sys
+import pytest
+from src import engine
+from src.__main__ import main
+
+# Importing the engine in a fresh interpreter must stay below this many seconds
+IMPORT_BUDGET = 0.3
+
+def test_engine_import_is_fast_and_headless():
+    """A fresh `import src.engine` stays within its time budget and never loads curses or process pools."""
+    code = ("import sys, time\n"
+            "start = time.perf_counter()\n"
+            "import src.engine\n"
+            "elapsed = time.perf_counter() - start\n"
+            "print(elapsed, 'curses' in sys.modules, 'multiprocessing' in sys.modules)\n")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+    assert float(output[0]) < IMPORT_BUDGET
+    assert output[1:] == ["False", "False"]
+
+def test_cli_imports_only_what_the_command_uses():
+    """`python -m src play` leaves the infinite board, profiler, simulator and curses unimported."""
+    code = ("import sys\n"
+            "from src.__main__ import main\n"
+            "main(['play', '--rows', '5', '--cols', '5', '--mines', '3', '/dev/null'])\n"
+            "print(*(name in sys.modules for name in ('src.infinite', 'src.profiler', 'src.simulate', 'curses')))\n")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+    assert output[-4:] == ["False", "False", "False", "False"]
+
+def test_play_moves_and_render():
+    """Parsed moves are applied in order and render shows their result; unknown moves are rejected."""
+    game = engine.new_game(seed=7, rows=9, cols=9, mines=10)
+    engine.play_moves(game, engine.parse_moves(["# opening", "reveal 4 4", "", "flag 0 0"]))
+    board = engine.render(game).splitlines()
+    assert len(board) == 9 and board[0][0] == "F"
+    assert board[4][4] != "#"
+    with pytest.raises(ValueError):
+        list(engine.parse_moves(["explode 1 1"]))
+
+def test_cli_play_from_file(tmp_path, capsys):
+    """`python -m src play` reads moves from a file and prints the game's status."""
+    moves = tmp_path / "moves.txt"
+    moves.write_text("reveal 4 4\n")
+    main(["play", "--seed", "7", "--rows", "9", "--cols", "9", "--mines", "10", str(moves)])
+    assert "status=PLAYING" in capsys.readouterr().out
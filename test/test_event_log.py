@@ -0,0 +1,77 @@
+"""
+File: test_event_log.py
+Module: test
+Function: Unit tests for the binary event log and deterministic replay.
+Inputs:
+    - src.event_log, src.simulate
+Outputs:
+    - When run with pytest, the test results.
+"""
+import random
+from src import event_log, simulate
+
+def play_recorded(path, seed=5):
+    """Play a game with random reveals, flags and chords while recording it"""
+    game = simulate.new_game(seed, 12, 12, 20)
+    log = event_log.record_game(game, path)
+    rng = random.Random(seed)
+    for _ in range(60):
+        r, c = rng.randrange(12), rng.randrange(12)
+        choice = rng.random()
+        if choice < 0.2:
+            game.place_flag(r, c)
+        elif choice < 0.3:
+            game.remove_flag(r, c)
+        elif choice < 0.4:
+            game.chord(r, c)
+        else:
+            game.handle_clicked_cell(r, c)
+    log.close()
+    return game
+
+def test_replay_rebuilds_the_same_game(tmp_path):
+    """Replaying the log reproduces the board, flags, counters and outcome exactly."""
+    path = tmp_path / "game.mslog"
+    played = play_recorded(path)
+    replayed = event_log.replay(path)
+    assert replayed.mines == played.mines
+    assert replayed.hidden == played.hidden
+    assert replayed.flagged == played.flagged
+    assert replayed.remaining_flag_count == played.remaining_flag_count
+    assert replayed.game_status == played.game_status
+    assert path.stat().st_size == event_log.HEADER.size + 60 * event_log.RECORD.size
+
+def test_seek_and_torn_records(tmp_path):
+    """Seeking backwards replays from the start, and a partly written last record is ignored."""
+    path = tmp_path / "game.mslog"
+    play_recorded(path)
+    with open(path, "ab") as f:
+        f.write(b"\x01\x00")
+    with event_log.Replayer(path) as replayer:
+        assert replayer.records == 60
+        partial = bytes(replayer.seek(10).hidden)
+        replayer.advance()
+        assert bytes(replayer.seek(10).hidden) == partial
+
+def test_actions_that_change_nothing_are_recorded_and_replayed(tmp_path):
+    """No-op reveals, chords and flag calls get records like any other call, and replay to the same game."""
+    path = tmp_path / "game.mslog"
+    game = simulate.new_game(5, 12, 12, 20)
+    log = event_log.record_game(game, path)
+    game.handle_clicked_cell(6, 6)
+    opened = next(divmod(index, 12) for index in range(game.size) if not game.hidden[index])
+    hidden = next(divmod(index, 12) for index in range(game.size) if game.hidden[index])
+    game.handle_clicked_cell(*opened)   # already revealed
+    game.chord(*hidden)                 # chord on a hidden cell
+    game.remove_flag(*hidden)           # not flagged
+    game.place_flag(*hidden)
+    game.place_flag(*hidden)            # already flagged
+    game.handle_clicked_cell(*hidden)   # flagged
+    log.close()
+    with event_log.Replayer(path) as replayer:
+        assert replayer.records == 7
+        replayed = replayer.advance()
+    assert replayed.hidden == game.hidden
+    assert replayed.flagged == game.flagged
+    assert replayed.placed_flags == game.placed_flags == 1
+    assert replayed.game_status == game.game_status
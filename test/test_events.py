@@ -0,0 +1,74 @@
+"""
+File: test_events.py
+Module: test
+Function: Tests for the GameManager event API: typed events, one batch per action, and the frontend
+          redrawing from events.
+Inputs:
+    - src.events, src.classes, src.tui.run_tui
+Outputs:
+    - When run with pytest, the test results.
+"""
+import pytest
+from src import engine
+from src.classes import GameStatus
+from src.events import CellsRevealed, FlagChanged, MinesGenerated, StatusChanged
+from test.test_tui import make_frontend
+
+def watched_game(backend="bytes"):
+    """A game with a subscriber that keeps every batch of events it is handed"""
+    game = engine.new_game(seed=11, rows=12, cols=12, mines=20, backend=backend, safe_first_click=True)
+    batches = []
+    game.subscribe(batches.append)
+    return game, batches
+
+@pytest.mark.parametrize("backend", ["bytes", "bitboard"])
+def test_first_click_is_one_batch(backend):
+    """The first reveal hands over the status change, mine placement and revealed cells as one batch."""
+    game, batches = watched_game(backend)
+    revealed = game.handle_clicked_cell(6, 6)
+    assert batches == [[StatusChanged(GameStatus.WELCOME, GameStatus.PLAYING), MinesGenerated(6, 6),
+                        CellsRevealed(revealed)]]
+
+def test_flags_and_ignored_actions():
+    """Each flag change is its own batch, and actions that change nothing emit no events."""
+    game, batches = watched_game()
+    game.handle_clicked_cell(6, 6)
+    batches.clear()
+    hidden = next(divmod(index, 12) for index in range(game.size) if game.hidden[index])
+    game.place_flag(*hidden)
+    game.place_flag(*hidden)        # already flagged: nothing changes, no event
+    game.handle_clicked_cell(*hidden)   # flagged: ignored
+    game.remove_flag(*hidden)
+    assert batches == [[FlagChanged(*hidden, True)], [FlagChanged(*hidden, False)]]
+
+def test_loss_reveals_the_mine_then_changes_status():
+    """Clicking a mine hands over the revealed mine before the change to LOSE, in one batch."""
+    game, batches = watched_game()
+    game.handle_clicked_cell(6, 6)
+    batches.clear()
+    mine = next(divmod(index, 12) for index in range(game.size) if game.mines[index])
+    game.handle_clicked_cell(*mine)
+    assert batches == [[CellsRevealed([mine]), StatusChanged(GameStatus.PLAYING, GameStatus.LOSE)]]
+
+def test_unsubscribed_games_collect_nothing():
+    """After the only subscriber leaves, actions neither deliver nor collect events."""
+    game, batches = watched_game()
+    game.unsubscribe(batches.append)
+    game.handle_clicked_cell(6, 6)
+    assert batches == [] and game.pending_events is None
+
+def test_actions_take_keyword_arguments():
+    """Batched actions pass keyword arguments through to the method they wrap."""
+    game, batches = watched_game()
+    revealed = game.handle_clicked_cell(i=6, j=6)
+    assert revealed and batches[0][-1] == CellsRevealed(revealed)
+    hidden = next(divmod(index, 12) for index in range(game.size) if game.hidden[index])
+    game.place_flag(r=hidden[0], c=hidden[1])
+    assert batches[-1] == [FlagChanged(*hidden, True)]
+
+def test_frontend_redraws_changes_made_outside_it():
+    """Cells revealed by code that bypasses the frontend's handlers are still marked for redrawing."""
+    frontend = make_frontend(rows=12, cols=12, mines=20)
+    frontend.draw_board()
+    revealed = frontend.game_manager.handle_clicked_cell(6, 6)
+    assert frontend.full_redraw and frontend.dirty_cells == set(revealed)
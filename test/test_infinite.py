@@ -0,0 +1,128 @@
+"""
+File: test_infinite.py
+Module: test
+Function: Unit tests for the lazily generated, chunked infinite board.
+Inputs:
+    - src.infinite, src.__main__, src.tui.infinite_tui, bench.fake_screen
+Outputs:
+    - When run with pytest, the test results.
+"""
+import curses
+import io
+import sys
+from bench.fake_screen import FakeScreen
+from src.__main__ import main
+from src.classes import GameStatus
+from src.infinite import InfiniteBoard
+from src.main import parse_args
+from src.tui.infinite_tui import InfiniteFrontend
+
+def test_adjacency_is_correct_across_chunk_borders():
+    """Counts near chunk borders (including negative coordinates) match a brute-force count of the mines."""
+    with InfiniteBoard(seed=5, chunk_size=8, mines_per_chunk=12) as board:
+        for r in range(-12, 12):
+            for c in range(-12, 12):
+                expected = sum(board.has_mine(r + dr, c + dc)
+                               for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+                assert board.adjacent_count(r, c) == expected
+
+def test_same_seed_gives_same_board_and_origin_is_safe():
+    """Chunks depend only on the seed and their position, and the first click at the origin opens an area."""
+    with InfiniteBoard(seed=9) as first, InfiniteBoard(seed=9) as second:
+        assert first.view(-50, 70, 20, 40) == second.view(-50, 70, 20, 40)
+        revealed = first.reveal(0, 0)
+        assert len(revealed) > 1
+        assert first.game_status == GameStatus.PLAYING
+
+def test_evicted_chunks_keep_the_players_state(tmp_path):
+    """Memory stays bounded, and revealed/flagged cells survive a chunk's round trip through the disk store."""
+    with InfiniteBoard(seed=2, chunk_size=8, mines_per_chunk=10, max_chunks=4, store_dir=tmp_path) as board:
+        board.reveal(0, 0)
+        board.place_flag(3, 5)
+        before = board.view(-8, -8, 16, 16)
+
+        # Touch chunks far away so the ones around the origin are evicted
+        for far in range(10):
+            board.view(100 * far, 100, 1, 1)
+        assert len(board.chunks) <= 4
+        assert board.chunks_evicted > 0
+
+        assert board.view(-8, -8, 16, 16) == before
+        assert board.is_flagged(3, 5)
+        assert board.chunks_loaded > 0
+
+def test_fill_limit_leaves_pending_cells_later_reveals_finish():
+    """A fill cut short by the limit is continued by later reveals until it matches an unlimited fill,
+    even when the chunks holding its pending cells are evicted in between."""
+    with InfiniteBoard(seed=7, chunk_size=8, mines_per_chunk=8) as full, \
+            InfiniteBoard(seed=7, chunk_size=8, mines_per_chunk=8, fill_limit=50, max_chunks=4) as limited:
+        expected = set(full.reveal(0, 0))
+        revealed = limited.reveal(0, 0)
+        assert len(revealed) < len(expected)
+        assert limited.pending_chunks
+        while limited.pending_chunks:
+            limited.view(500, 500, 1, 40)       # pushes the chunks around the fill out to disk
+            more = limited.reveal(0, 0)
+            assert more and len(more) <= 50 + 8
+            revealed += more
+        assert len(revealed) == len(set(revealed)) == limited.revealed_cells
+        assert set(revealed) == expected
+        assert limited.chunks_loaded > 0
+        assert limited.view(-30, -30, 60, 60) == full.view(-30, -30, 60, 60)
+
+def test_cli_plays_an_infinite_board(tmp_path, capsys):
+    """`python -m src infinite` plays the moves and prints the window asked for."""
+    moves = tmp_path / "moves.txt"
+    moves.write_text("reveal 0 0\n")
+    main(["infinite", "--seed", "9", "--top", "-3", "--left", "-4", "--height", "6", "--width", "8", str(moves)])
+    lines = capsys.readouterr().out.splitlines()
+    assert [len(line) for line in lines[:6]] == [8] * 6
+    assert lines[3][4] == "."
+    assert lines[6].startswith("status=PLAYING")
+
+def test_cli_reads_moves_from_stdin_without_closing_it(monkeypatch, capsys):
+    """With moves from stdin, the subcommand leaves stdin open for whoever runs it."""
+    stdin = io.StringIO("reveal 0 0\n")
+    monkeypatch.setattr(sys, "stdin", stdin)
+    main(["infinite", "--seed", "9", "--height", "2", "--width", "2"])
+    assert not stdin.closed
+    assert "status=PLAYING" in capsys.readouterr().out
+
+def test_tui_viewport_scrolls_past_the_origin_in_any_direction():
+    """The cursor can wander into negative coordinates, and a frame there costs the same as at the origin."""
+    with InfiniteBoard(seed=4, chunk_size=8, mines_per_chunk=10) as board:
+        frontend = InfiniteFrontend(FakeScreen(30, 80), board)
+        frontend.process_input(ord(' '))
+        frontend.draw_frame()
+        first = frontend.frame_calls
+        assert frontend.view_r < 0 < frontend.view_r + 27
+
+        for _ in range(100):
+            frontend.process_input(curses.KEY_UP)
+            frontend.process_input(curses.KEY_LEFT)
+        frontend.draw_frame()
+        assert (frontend.cur_r, frontend.cur_c) == (-100, -100)
+        assert frontend.view_r == -100 and frontend.view_c == -100
+        assert abs(frontend.frame_calls - first) <= 2
+
+def test_tui_reveal_redraws_only_what_opened():
+    """A reveal redraws just the cells it opened that are on screen, and the mouse maps through the scroll."""
+    with InfiniteBoard(seed=4, chunk_size=8, mines_per_chunk=10) as board:
+        frontend = InfiniteFrontend(FakeScreen(30, 80), board)
+        frontend.draw_frame()
+        frontend.process_input(ord(' '))
+        opened = set(frontend.dirty_cells)
+        frontend.draw_frame()
+        visible = sum(1 for r, c in opened if frontend.view_r <= r < frontend.view_r + 27
+                      and frontend.view_c <= c < frontend.view_c + 24)
+        assert opened and frontend.frame_calls <= 4 * visible + 10
+
+        off_y, off_x, _, _ = frontend.viewport(30, 80)
+        assert frontend.mouse_to_cell(off_x + 3 * 2, off_y + 1) == (frontend.view_r + 1, frontend.view_c + 2)
+        assert frontend.mouse_to_cell(0, 0) is None
+
+def test_infinite_option():
+    """--infinite picks the unbounded board, with an optional seed."""
+    args = parse_args(["--infinite", "--seed", "3"])
+    assert args.infinite and args.seed == 3
+    assert not parse_args([]).infinite
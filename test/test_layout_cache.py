@@ -0,0 +1,82 @@
+"""
+File: test_layout_cache.py
+Module: test
+Function: Unit tests for the LRU cache of generated board layouts.
+Inputs:
+    - src.layout_cache, src.classes, src.event_log, src.simulate
+Outputs:
+    - When run with pytest, the test results.
+"""
+from src import event_log, simulate
+from src.classes import CellState
+from src.layout_cache import LayoutCache
+
+def cached_game(cache, seed=4, rows=20, cols=30, mines=90):
+    game = simulate.new_game(seed, rows, cols, mines, layout_cache=cache)
+    game.handle_clicked_cell(rows // 2, cols // 2)
+    return game
+
+def test_games_share_cached_layouts():
+    """The second game with the same key is a hit, gets the first game's layout and matches an uncached board."""
+    cache = LayoutCache()
+    first = cached_game(cache)
+    second = cached_game(cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second.mines == first.mines and second.adjacent == first.adjacent
+
+    # Each game has its own buffers
+    assert second.mines is not first.mines and second.hidden is not first.hidden
+
+    uncached = cached_game(None)
+    assert uncached.mines == first.mines and uncached.adjacent == first.adjacent
+
+def test_cached_games_stay_writable():
+    """Writing through Cell after a cache hit changes that game only, not the cache or other games."""
+    cache = LayoutCache()
+    first = cached_game(cache)
+    second = cached_game(cache)
+    mines, adjacent = bytes(first.mines), bytes(first.adjacent)
+    cell = second.grid[0][0]
+    cell.adjacent = 9
+    cell.state = CellState.MINED
+    assert second.adjacent[0] == 9 and second.mines[0] == 1
+    assert (first.mines, first.adjacent) == (mines, adjacent)
+    third = cached_game(cache)
+    assert (third.mines, third.adjacent) == (mines, adjacent)
+    assert cache.hits == 2
+
+def test_different_first_click_is_a_different_layout():
+    cache = LayoutCache()
+    cached_game(cache)
+    game = simulate.new_game(4, 20, 30, 90, layout_cache=cache)
+    game.handle_clicked_cell(0, 0)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+def test_memory_cap_evicts_least_recently_used():
+    """Layouts are evicted oldest-use first once the cap is reached, and the byte count stays under the cap."""
+    cache = LayoutCache(max_bytes=3 * 2 * (20 * 30 + 64))
+    for seed in range(5):
+        cached_game(cache, seed)
+    assert len(cache) < 5 and cache.evictions == 5 - len(cache)
+    assert cache.current_bytes <= cache.max_bytes
+
+    # The newest layout is still cached; the oldest is gone
+    cached_game(cache, 4)
+    assert cache.hits == 1
+    cached_game(cache, 0)
+    assert cache.hits == 1
+
+def test_replayer_seek_reuses_the_layout(tmp_path):
+    """Seeking backwards in a replay rebuilds the game without regenerating its board."""
+    path = tmp_path / "game.mslog"
+    game = simulate.new_game(2, 16, 16, 40, layout_cache=None)
+    event_log.record_game(game, path)
+    for r, c in ((8, 8), (0, 0), (15, 15)):
+        game.handle_clicked_cell(r, c)
+    game.event_log.close()
+
+    with event_log.Replayer(path) as replayer:
+        replayer.advance()
+        replayer.seek(1)
+        assert replayer.layouts.hits == 1 and replayer.layouts.misses == 1
+        assert replayer.game.mines == game.mines
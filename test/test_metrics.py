@@ -0,0 +1,94 @@
+"""
+File: test_metrics.py
+Module: test
+Function: Tests for the optional hot-path instrumentation and its JSON / Prometheus exports.
+Inputs:
+    - src.metrics
+Outputs:
+    - When run with pytest, the test results.
+"""
+import curses
+import json
+import time
+import pytest
+from src import engine, metrics
+from src.bitboard import BitboardGameManager
+from src.classes import GameManager
+from src.tui.run_tui import Frontend
+from test.test_tui import make_frontend
+
+@pytest.fixture
+def session():
+    """An instrumented session, always switched off again afterwards"""
+    yield metrics.enable()
+    metrics.disable()
+
+def test_disabled_leaves_original_methods():
+    """Switching instrumentation off puts back the exact original functions, so it costs nothing while off."""
+    originals = (GameManager.rec_reveal, BitboardGameManager.generate_mines, Frontend.draw_frame)
+    metrics.enable()
+    assert GameManager.rec_reveal is not originals[0]
+    metrics.disable()
+    assert (GameManager.rec_reveal, BitboardGameManager.generate_mines, Frontend.draw_frame) == originals
+    assert metrics.METRICS is None
+
+@pytest.mark.parametrize("backend", ["bytes", "bitboard"])
+def test_game_calls_are_counted_once(session, backend):
+    """A first click is one generate_mines, one handle_clicked_cell and one flood fill, on either backend."""
+    game = engine.new_game(seed=3, rows=20, cols=20, mines=40, backend=backend, safe_first_click=True)
+    revealed = game.handle_clicked_cell(10, 10)
+    histograms = session.histograms
+    assert histograms["generate_mines_seconds"].count == 1
+    assert histograms["handle_clicked_cell_seconds"].count == 1
+    assert histograms["rec_reveal_seconds"].count == 1
+    assert histograms["rec_reveal_cells"].sum == len(revealed)
+    assert histograms["rec_reveal_depth"].max == max(max(abs(r - 10), abs(c - 10)) for r, c in revealed)
+
+def test_measured_methods_keep_keywords_and_names(session):
+    """Instrumented methods accept keyword arguments and keep the wrapped method's name and docstring."""
+    game = engine.new_game(seed=3, rows=20, cols=20, mines=40, safe_first_click=True)
+    revealed = game.handle_clicked_cell(i=10, j=10)
+    assert session.histograms["rec_reveal_cells"].sum == len(revealed)
+    assert GameManager.handle_clicked_cell.__name__ == "handle_clicked_cell"
+    assert GameManager.handle_clicked_cell.__doc__ == GameManager.handle_clicked_cell.__wrapped__.__doc__
+
+def test_frontend_frames_and_input(session):
+    """Each frame and each input event is measured once."""
+    frontend = make_frontend()
+    frontend.draw_board()
+    frontend.process_input(curses.KEY_RIGHT)
+    frontend.draw_board()
+    histograms = session.histograms
+    assert histograms["draw_board_seconds"].count == 2
+    assert histograms["draw_board_curses_calls"].count == 2
+    assert histograms["draw_board_curses_calls"].max > frontend.frame_calls
+    assert histograms["process_input_seconds"].count == 1
+
+def test_end_screen_is_not_frame_time(session):
+    """The time the player spends on the win/loss screen is not counted as frame time."""
+    frontend = make_frontend()
+    frontend.check_game_status = lambda: time.sleep(0.2)
+    frontend.draw_board()
+    assert session.histograms["draw_board_seconds"].count == 1
+    assert session.histograms["draw_board_seconds"].max < 0.2
+
+def test_exports(session, tmp_path):
+    engine.new_game(seed=1, rows=9, cols=9, mines=10).handle_clicked_cell(4, 4)
+    data = json.loads(session.to_json())
+    assert data["handle_clicked_cell_seconds"]["count"] == 1
+
+    text = session.to_prometheus()
+    assert "# TYPE minesweeper_rec_reveal_cells histogram" in text
+    assert 'minesweeper_handle_clicked_cell_seconds_bucket{le="+Inf"} 1' in text
+    assert "minesweeper_handle_clicked_cell_seconds_count 1" in text
+
+    session.write(str(tmp_path / "metrics.json"))
+    assert json.loads((tmp_path / "metrics.json").read_text()) == data
+
+def test_histogram_buckets():
+    histogram = metrics.Histogram((1, 10, 100))
+    for value in (0.5, 1, 5, 50, 500):
+        histogram.observe(value)
+    assert histogram.buckets == [2, 1, 1, 1]
+    assert histogram.quantile(0.5) == 10
+    assert histogram.quantile(1.0) == 500
@@ -0,0 +1,53 @@
+"""
+File: test_no_guess.py
+Module: test
+Function: Unit tests for no-guess board generation and the on-disk board pool.
+Inputs:
+    - src.no_guess, src.solver, src.event_log
+Outputs:
+    - When run with pytest, the test results.
+"""
+from src import event_log
+from src.classes import GameStatus
+from src.no_guess import NoGuessPool, RECORD
+from src.solver import Solver
+
+def test_pool_boards_are_solved_without_guessing(tmp_path):
+    """Boards filled into the pool are won by the solver alone, starting from wherever the player clicks first."""
+    pool = NoGuessPool(tmp_path, 9, 9, 10)
+    pool.fill(3, workers=1, batch_size=10, seed=0)
+    assert len(pool) == 3
+    assert (tmp_path / "no_guess-9x9-10.pool").stat().st_size == 3 * RECORD.size
+
+    for _ in range(3):
+        game = pool.new_game()
+        solver = Solver(game)
+        # The first reveal goes to the start cell whatever is clicked
+        solver.observe(game.handle_clicked_cell(0, 0))
+        while game.game_status == GameStatus.PLAYING:
+            hint = solver.hint()
+            assert hint is not None
+            solver.observe(game.handle_clicked_cell(*hint))
+        assert game.game_status == GameStatus.WIN
+    assert (pool.hits, pool.misses, len(pool)) == (3, 0, 0)
+
+def test_empty_pool_generates_on_the_spot(tmp_path):
+    """Taking from an empty pool still gives a board, counted as a miss."""
+    pool = NoGuessPool(tmp_path, 8, 8, 8)
+    seed, start = pool.take()
+    assert (pool.hits, pool.misses, pool.generated) == (0, 1, 1)
+    assert pool.hit_rate == 0.0
+
+def test_start_cell_is_logged_for_replay(tmp_path):
+    """The redirected first reveal is what the event log records, so the replay opens the same board."""
+    pool = NoGuessPool(tmp_path, 9, 9, 10)
+    pool.add([(12345, 4, 6)])
+    game = pool.new_game()
+    path = tmp_path / "game.mslog"
+    event_log.record_game(game, path)
+    game.handle_clicked_cell(0, 0)
+    game.event_log.close()
+
+    replayed = event_log.replay(path)
+    assert replayed.mines == game.mines and replayed.hidden == game.hidden
+    assert not game.hidden[4 * 9 + 6]
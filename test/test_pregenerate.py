@@ -0,0 +1,66 @@
+"""
+File: test_pregenerate.py
+Module: test
+Function: Unit tests for background board pregeneration and the first-click fix-up.
+Inputs:
+    - src.classes, src.event_log
+Outputs:
+    - When run with pytest, the test results.
+"""
+import pytest
+from src import event_log
+from src.classes import GameManager, GameStatus, count_adjacent
+
+def pregenerated_game(seed, rows=30, cols=40, mines=400, safe=False, background=True):
+    game = GameManager(seed=seed, rows=rows, cols=cols)
+    game.safe_first_click = safe
+    game.set_total_mines(mines)
+    game.total_flags = game.remaining_flag_count = mines
+    if background:
+        game.start_pregeneration()
+    else:
+        game.pregenerate = True
+    return game
+
+@pytest.mark.parametrize("safe", [False, True])
+def test_fix_up_keeps_the_first_click_clear(safe):
+    """After the fix-up the mine count is unchanged, the click (or its 3x3 block) is clear and counts are exact."""
+    for seed in range(20):
+        game = pregenerated_game(seed, safe=safe)
+        game.handle_clicked_cell(15, 20)
+        assert game.game_status != GameStatus.LOSE
+        assert sum(game.mines) == 400
+        assert game.adjacent == count_adjacent(game.mines, 30, 40)
+        zone = [(r, c) for r in (14, 15, 16) for c in (19, 20, 21)] if safe else [(15, 20)]
+        assert not any(game.mines[r * 40 + c] for r, c in zone)
+
+def test_background_and_synchronous_builds_match():
+    """The board depends only on the seed, settings and first click, not on when the layout was built."""
+    background = pregenerated_game(3)
+    synchronous = pregenerated_game(3, background=False)
+    background.handle_clicked_cell(0, 0)
+    synchronous.handle_clicked_cell(0, 0)
+    assert background.mines == synchronous.mines
+    assert background.pregen_progress == 1.0
+
+def test_pregenerated_game_replays_from_its_log(tmp_path):
+    """The log header records pregeneration, so a replay rebuilds the same board."""
+    game = pregenerated_game(6)
+    path = tmp_path / "game.mslog"
+    event_log.record_game(game, path)
+    game.handle_clicked_cell(10, 10)
+    game.event_log.close()
+    assert event_log.replay(path).mines == game.mines
+
+@pytest.mark.parametrize("rows, cols, mines, games", [(2, 3, 3, 3000), (4, 4, 3, 4000)])
+def test_fix_up_spreads_mines_evenly(rows, cols, mines, games):
+    """Every cell but the click ends up with a mine equally often, on dense and sparse boards alike."""
+    counts = [0] * (rows * cols)
+    for seed in range(games):
+        game = pregenerated_game(seed, rows, cols, mines, background=False)
+        game.handle_clicked_cell(0, 0)
+        for pos, mine in enumerate(game.mines):
+            counts[pos] += mine
+    expected = games * mines / (rows * cols - 1)
+    assert counts[0] == 0
+    assert all(abs(count - expected) < 0.08 * expected for count in counts[1:])
@@ -0,0 +1,52 @@
+"""
+File: test_probability.py
+Module: test
+Function: Unit tests for the exact mine-probability engine.
+Inputs:
+    - src.probability, src.classes
+Outputs:
+    - When run with pytest, the test results.
+"""
+from itertools import combinations
+import pytest
+from src import classes, probability
+
+def brute_force(game):
+    """Probability of each hidden cell by enumerating every mine placement consistent with the revealed numbers."""
+    hidden = [i for i in range(game.size) if game.hidden[i]]
+    shown = [i for i in range(game.size) if not game.hidden[i]]
+    counts = dict.fromkeys(hidden, 0)
+    total = 0
+    for placement in combinations(hidden, game.total_mines):
+        mines = bytearray(game.size)
+        for i in placement:
+            mines[i] = 1
+        adjacent = classes.count_adjacent(mines, game.rows, game.cols)
+        if all(adjacent[i] == game.adjacent[i] for i in shown):
+            total += 1
+            for i in placement:
+                counts[i] += 1
+    return {i: counts[i] / total for i in hidden}
+
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_brute_force(seed):
+    """On small boards every hidden cell's probability equals the exact enumerated value."""
+    game = classes.GameManager(seed=seed, rows=5, cols=5)
+    game.set_total_mines(5)
+    game.handle_clicked_cell(2, 2)
+    if game.game_status != classes.GameStatus.PLAYING:
+        pytest.skip("the first click finished the game")
+    result = probability.ProbabilityEngine(game).compute()
+    for index, expected in brute_force(game).items():
+        assert result.probability(*divmod(index, game.cols)) == pytest.approx(expected)
+
+def test_unchanged_components_hit_the_cache():
+    """Asking again without new reveals reuses every component count."""
+    game = classes.GameManager(seed=11, rows=16, cols=30)
+    game.set_total_mines(99)
+    game.handle_clicked_cell(8, 15)
+    engine = probability.ProbabilityEngine(game)
+    engine.compute()
+    misses = engine.misses
+    engine.compute()
+    assert engine.misses == misses
@@ -0,0 +1,62 @@
+"""
+File: test_profiler.py
+Module: test
+Function: Tests for the opt-in sampling profiler and its collapsed-stack and summary files.
+Inputs:
+    - src.profiler
+Outputs:
+    - When run with pytest, the test results.
+"""
+import time
+from src import engine, event_log, no_guess, server, simulate
+from src.__main__ import main
+from src.profiler import profiled
+
+def busy_loop(seconds):
+    """Keep the interpreter busy in this function for a while"""
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+def test_profiled_writes_collapsed_stacks_and_summary(tmp_path, capsys):
+    path = str(tmp_path / "run.folded")
+    with profiled(path, interval=0.001) as profiler:
+        busy_loop(0.2)
+    assert profiler.samples > 0
+    assert capsys.readouterr().out == ""
+
+    lines = (tmp_path / "run.folded").read_text().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert stack.startswith("MainThread;") and int(count) > 0
+    assert any("test/test_profiler.py:busy_loop" in line for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == profiler.samples
+    assert "test/test_profiler.py:busy_loop" in (tmp_path / "run.folded.top.txt").read_text()
+
+def test_profiled_without_path_does_nothing():
+    with profiled(None) as profiler:
+        engine.new_game(seed=1, rows=9, cols=9, mines=10).handle_clicked_cell(4, 4)
+    assert profiler is None
+
+def test_cli_profile_option(tmp_path):
+    path = tmp_path / "bench.folded"
+    main(["--profile", str(path), "bench", "--rows", "300", "--cols", "300", "--mines", "20000", "--games", "3"])
+    assert path.exists() and (tmp_path / "bench.folded.top.txt").exists()
+
+def test_entry_point_profile_options(tmp_path, monkeypatch, capsys):
+    """The no-guess pool filler, log replayer and server take the same --profile option."""
+    game = simulate.new_game(3, 9, 9, 10)
+    log = event_log.record_game(game, tmp_path / "game.mslog")
+    game.handle_clicked_cell(4, 4)
+    log.close()
+    event_log.main(["--profile", str(tmp_path / "replay.folded"), str(tmp_path / "game.mslog")])
+    no_guess.main([str(tmp_path / "pools"), "--rows", "9", "--cols", "9", "--mines", "10", "--count", "2",
+                   "--workers", "1", "--seed", "0", "--profile", str(tmp_path / "fill.folded")])
+
+    async def serve(args):
+        busy_loop(0.05)
+    monkeypatch.setattr(server, "serve", serve)
+    server.main(["--profile", str(tmp_path / "server.folded")])
+    for name in ("replay", "fill", "server"):
+        assert (tmp_path / f"{name}.folded").exists() and (tmp_path / f"{name}.folded.top.txt").exists()
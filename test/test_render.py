@@ -0,0 +1,53 @@
+"""
+File: test_render.py
+Module: test
+Function: Tests for the frontend's dirty-cell rendering: which frames redraw only changed cells, which fall back
+          to a full redraw, and the per-frame curses call counter.
+Inputs:
+    - src.tui.run_tui, bench.fake_screen
+Outputs:
+    - When run with pytest, the test results.
+"""
+import curses
+from test.test_tui import make_frontend
+
+def test_cursor_move_only_redraws_changed_cells():
+    """After the first frame, moving the cursor costs a handful of curses calls instead of a full redraw."""
+    frontend = make_frontend()
+    frontend.draw_board()
+    full = frontend.frame_calls
+    frontend.process_input(curses.KEY_RIGHT)
+    frontend.draw_board()
+    assert frontend.frame_calls < full // 10
+
+def test_flag_redraws_only_its_cell():
+    """Flagging a cell (cursor unchanged) redraws just that cell."""
+    frontend = make_frontend()
+    frontend.process_input(ord(' '))
+    frontend.draw_board()
+    hidden = next(divmod(index, 10) for index in range(100) if frontend.game_manager.hidden[index])
+    frontend.cur_r, frontend.cur_c = hidden
+    frontend.draw_board()
+    frontend.stdscr.window.cells.clear()
+    frontend.process_input(ord('f'))
+    assert frontend.dirty_cells == {hidden}
+    frontend.draw_board()
+    assert "⚑" in frontend.stdscr.window.text_at(*screen_position(frontend, *hidden))
+    assert not frontend.dirty_cells
+
+def test_resize_forces_a_full_redraw():
+    """A KEY_RESIZE redraws every visible cell and the labels, not just dirty cells."""
+    frontend = make_frontend()
+    frontend.draw_board()
+    full = frontend.frame_calls
+    frontend.process_input(curses.KEY_RIGHT)
+    frontend.draw_board()
+    assert frontend.frame_calls < full
+    frontend.process_input(curses.KEY_RESIZE)
+    assert frontend.frame_calls == full
+    assert not frontend.full_redraw
+
+def screen_position(frontend, r, c):
+    """Screen (y, x) of a visible cell"""
+    off_y, off_x, _, _ = frontend.viewport(*frontend.stdscr.getmaxyx())
+    return off_y + r - frontend.view_r, off_x + (c - frontend.view_c) * 3
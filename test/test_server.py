@@ -0,0 +1,108 @@
+"""
+File: test_server.py
+Module: test
+Function: Tests for the line-delimited JSON game server: the request handlers, idle eviction, memory
+          accounting, and a round trip over a Unix socket.
+Inputs:
+    - src.server
+Outputs:
+    - When run with pytest, the test results.
+"""
+import asyncio
+import json
+import logging
+import sys
+from src import engine
+from src.server import GameServer, session_memory
+
+def new_session(server, **settings):
+    request = {"op": "new", "rows": 9, "cols": 9, "mines": 10, "seed": 7, "safe_first_click": True}
+    request.update(settings)
+    return server.handle(request)["session"]
+
+def test_batched_moves_match_a_local_game():
+    """A batch of moves gives the same board as playing them directly on an engine game."""
+    server = GameServer()
+    session = new_session(server)
+    moves = [["reveal", 4, 4], ["flag", 0, 0], ["reveal", 8, 8]]
+    response = server.handle({"op": "moves", "session": session, "moves": moves, "id": "a"})
+
+    game = engine.new_game(7, 9, 9, 10, safe_first_click=True)
+    revealed = [cell for move in moves for cell in engine.apply_move(game, *move)]
+    assert response["id"] == "a"
+    assert response["revealed"] == revealed
+    assert response["status"] == game.game_status.name
+    state = server.handle({"op": "state", "session": session})
+    assert state["board"] == engine.render(game).split("\n")
+
+def test_errors_are_responses():
+    server = GameServer()
+    assert "error" in server.handle({"op": "explode"})
+    assert "error" in server.handle({"op": "moves", "session": 99, "moves": []})
+    assert "error" in server.handle({"op": "new", "rows": 3, "cols": 3, "mines": 9})
+    assert "error" in json.loads(server.handle_line(b"{not json"))
+    session = new_session(server)
+    assert "error" in server.handle({"op": "moves", "session": session, "moves": [["reveal", 50, 50]]})
+
+def test_idle_sessions_are_evicted_least_recently_used_first():
+    server = GameServer(idle_timeout=10)
+    first, second, third = (new_session(server) for _ in range(3))
+    server.sessions[first].last_used = server.sessions[second].last_used = 0.0
+    # Using the first session moves it behind the others
+    server.handle({"op": "state", "session": first})
+    server.sessions[first].last_used = 0.0
+    server.sessions[third].last_used = 100.0
+    assert server.evict_idle(now=50.0) == 1
+    assert list(server.sessions) == [third, first]
+
+def test_memory_accounting_and_limit():
+    """Thousands of sessions are accounted for, closing frees their memory, and the limit refuses new ones."""
+    server = GameServer()
+    sessions = [new_session(server, seed=seed) for seed in range(2000)]
+    for session in sessions:
+        server.handle({"op": "moves", "session": session, "moves": [["reveal", 4, 4]]})
+    assert server.memory == sum(session.memory for session in server.sessions.values()) > 0
+    for session in sessions:
+        server.handle({"op": "close", "session": session})
+    assert server.memory == 0 and server.handle({"op": "stats"})["sessions"] == 0
+
+    server.max_memory = 1
+    new_session(server)
+    assert "memory limit" in server.handle({"op": "new"})["error"]
+
+def test_session_memory_counts_the_board_buffers():
+    """A bytes session accounts for its four byte layers, a bitboard session for its masks and counts."""
+    game = engine.new_game(seed=1, rows=30, cols=30, mines=90)
+    assert session_memory(game) == sum(sys.getsizeof(layer) for layer in
+                                       (game.mines, game.adjacent, game.hidden, game.flagged))
+    assert session_memory(game) >= 4 * 900
+    bitboard = engine.new_game(seed=1, rows=30, cols=30, mines=90, backend="bitboard")
+    assert sys.getsizeof(bitboard.adjacent) < session_memory(bitboard) < session_memory(game)
+
+def test_unexpected_errors_are_answered_and_logged(caplog):
+    """A handler that fails with any exception still gets an error response, and the traceback is logged."""
+    server = GameServer()
+    def broken(request):
+        raise RuntimeError("boom")
+    server.handlers["stats"] = broken
+    with caplog.at_level(logging.ERROR, logger="src.server"):
+        response = server.handle({"op": "stats", "id": 3})
+    assert response == {"error": "internal error: RuntimeError: boom", "id": 3}
+    assert "Traceback" in caplog.text and "boom" in caplog.text
+
+def test_unix_socket_round_trip(tmp_path):
+    """Pipelined requests on one connection are answered in order."""
+    async def run():
+        server = await GameServer().start(unix_path=str(tmp_path / "server.sock"))
+        reader, writer = await asyncio.open_unix_connection(str(tmp_path / "server.sock"))
+        requests = [{"op": "new", "id": 1, "seed": 3}, {"op": "moves", "id": 2, "session": 1, "moves": [["reveal", 5, 5]]},
+                    {"op": "close", "id": 3, "session": 1}]
+        writer.write(b"".join(json.dumps(request).encode() + b"\n" for request in requests))
+        responses = [json.loads(await reader.readline()) for _ in requests]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+    responses = asyncio.run(run())
+    assert [response["id"] for response in responses] == [1, 2, 3]
+    assert responses[1]["applied"] == 1 and responses[2]["closed"]
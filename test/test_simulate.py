@@ -0,0 +1,33 @@
+"""
+File: test_simulate.py
+Module: test
+Function: Unit tests for the headless batch simulator.
+Inputs:
+    - src.simulate
+Outputs:
+    - When run with pytest, the test results.
+"""
+import random
+import pytest
+from src import simulate
+
+def test_games_are_reproducible():
+    """The same seed and policy always play out the same game."""
+    first = simulate.play_game(42, 9, 9, 10)
+    second = simulate.play_game(42, 9, 9, 10)
+    assert (first.won, first.clicks) == (second.won, second.clicks)
+    assert first.clicks >= 1
+
+def test_pool_matches_single_process():
+    """Spreading games over worker processes gives the same totals as playing them in-process."""
+    local = list(simulate.simulate(40, 8, 8, 6, workers=1, batch_size=7))[-1]
+    pooled = list(simulate.simulate(40, 8, 8, 6, workers=2, batch_size=7))[-1]
+    assert local.games == pooled.games == 40
+    assert (local.wins, local.clicks) == (pooled.wins, pooled.clicks)
+
+def test_policies_must_implement_next_move():
+    """MovePolicy is abstract: only subclasses with a next_move can be created."""
+    game = simulate.new_game(1, 9, 9, 10)
+    with pytest.raises(TypeError):
+        simulate.MovePolicy(game, random.Random(1))
+    assert simulate.RandomPolicy(game, random.Random(1)).next_move()[0] == "reveal"
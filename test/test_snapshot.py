@@ -0,0 +1,87 @@
+"""
+File: test_snapshot.py
+Module: test
+Function: Unit tests for bit-packed game snapshots.
+Inputs:
+    - src.snapshot, src.bitpack, src.simulate, src.backends
+Outputs:
+    - When run with pytest, the test results.
+"""
+import random
+import pytest
+from src import bitpack, snapshot, simulate
+from src.backends import new_game_manager
+from src.classes import GameStatus
+
+@pytest.mark.parametrize("size", [0, 1, 7, 8, 9, 1000])
+def test_bitpack_round_trip(size):
+    """Packing and unpacking a layer gives back the same cells, for sizes on and off byte boundaries."""
+    layer = bytearray(random.Random(size).getrandbits(1) for _ in range(size))
+    packed = bitpack.pack_layer(layer)
+    assert len(packed) == (size + 7) // 8
+    assert bitpack.unpack_layer(packed, size) == layer
+    assert bitpack.int_to_layer(bitpack.layer_to_int(layer), size) == layer
+
+def test_bitpack_bit_order():
+    """Cell 0 is the top bit of the first packed byte and bit 0 of the integer mask."""
+    layer = bytearray([1, 0, 0, 0, 0, 0, 0, 1, 0, 1])
+    assert bitpack.pack_layer(layer) == bytes([0b10000001, 0b01000000])
+    assert bitpack.layer_to_int(layer) == 0b1010000001
+    assert bitpack.unpack_layer(memoryview(b"\x81\x40"), 10) == layer
+
+def test_snapshot_restores_a_running_game(tmp_path):
+    """A saved game in progress loads back with identical board, flags, counters and status."""
+    game = simulate.new_game(8, 40, 70, 400)
+    game.handle_clicked_cell(20, 35)
+    for r in range(0, 40, 3):
+        game.place_flag(r, (r * 7) % 70)
+    path = tmp_path / "game.snap"
+    snapshot.save_snapshot(game, path)
+    restored = snapshot.load_snapshot(path)
+
+    for name in ("mines", "adjacent", "hidden", "flagged"):
+        assert getattr(restored, name) == getattr(game, name)
+    for name in ("seed", "game_status", "is_first_click", "placed_flags", "remaining_flag_count", "hidden_safe_cells"):
+        assert getattr(restored, name) == getattr(game, name)
+    assert path.stat().st_size == snapshot.HEADER.size + 3 * ((40 * 70 + 7) // 8)
+
+def test_snapshot_keeps_the_backend(tmp_path):
+    """A bitboard game loads back as a bitboard game and plays on exactly like the original."""
+    game = new_game_manager("bitboard", seed=11, rows=30, cols=30)
+    game.safe_first_click = True
+    game.handle_clicked_cell(15, 15)
+    path = tmp_path / "game.snap"
+    snapshot.save_snapshot(game, path)
+    restored = snapshot.load_snapshot(path)
+
+    assert type(restored) is type(game)
+    assert restored.zero_mask == game.zero_mask
+    for r in range(30):
+        for c in range(30):
+            assert restored.handle_clicked_cell(r, c) == game.handle_clicked_cell(r, c)
+            assert restored.game_status == game.game_status
+            if game.game_status != GameStatus.PLAYING:
+                return
+
+def test_snapshot_keeps_the_start_cell(tmp_path):
+    """A no-guess board saved before its first reveal still opens at its start cell after loading."""
+    game = simulate.new_game(3, 20, 20, 50)
+    game.start_cell = (7, 12)
+    path = tmp_path / "game.snap"
+    snapshot.save_snapshot(game, path)
+    restored = snapshot.load_snapshot(path)
+
+    assert restored.start_cell == (7, 12)
+    assert restored.is_first_click
+    assert restored.handle_clicked_cell(0, 0) == game.handle_clicked_cell(0, 0)
+
+def test_old_snapshots_load_as_bytes_games(tmp_path):
+    """Files written before the backend byte and start cell existed (zeros there) load as bytes games."""
+    game = simulate.new_game(5, 10, 10, 15)
+    game.handle_clicked_cell(5, 5)
+    data = snapshot.dumps(game)
+    # The backend byte, padding and start cell sit where the old reserved u64 was
+    assert data[snapshot.HEADER.size - 8:snapshot.HEADER.size] == bytes(8)
+    restored = snapshot.loads(data)
+    assert type(restored) is type(game)
+    assert restored.start_cell is None
@@ -0,0 +1,60 @@
+"""
+File: test_solver.py
+Module: test
+Function: Unit tests for the constraint-propagation solver and hint engine.
+Inputs:
+    - src.solver, src.classes
+Outputs:
+    - When run with pytest, the test results.
+"""
+import random
+import pytest
+from src import classes, solver
+
+def play_with_solver(seed, rows=9, cols=9, mines=10):
+    """Play a seeded game using solver hints (random guesses when stuck), checking every deduction."""
+    game = classes.GameManager(seed=seed, rows=rows, cols=cols)
+    game.set_total_mines(mines)
+    rng = random.Random(seed)
+    engine = solver.Solver(game)
+    engine.observe(game.handle_clicked_cell(rows // 2, cols // 2))
+    while game.game_status == classes.GameStatus.PLAYING:
+        engine.solve()
+        assert all(not game.mines[index] for index in engine.known_safe)
+        assert all(game.mines[index] for index in engine.known_mines)
+        move = engine.hint()
+        if move is None:
+            move = divmod(rng.choice([i for i in range(game.size) if game.hidden[i] and i not in engine.known_mines]), cols)
+        engine.observe(game.handle_clicked_cell(*move))
+    return game, engine
+
+@pytest.mark.parametrize("seed", range(15))
+def test_deductions_are_always_correct(seed):
+    """Cells the solver calls safe never hold a mine and cells it calls mines always do."""
+    play_with_solver(seed)
+
+def test_incremental_frontier_matches_fresh_scan():
+    """Feeding reveals one move at a time finds the same safe cells and mines as a solver built from scratch."""
+    game = classes.GameManager(seed=3, rows=30, cols=30)
+    game.set_total_mines(120)
+    engine = solver.Solver(game)
+    engine.observe(game.handle_clicked_cell(15, 15))
+    for _ in range(5):
+        hint = engine.hint()
+        if hint is None or game.game_status != classes.GameStatus.PLAYING:
+            break
+        engine.observe(game.handle_clicked_cell(*hint))
+    fresh = solver.Solver(game)
+    assert set(engine.safe_cells()) == set(fresh.safe_cells())
+    assert set(engine.mine_cells()) == set(fresh.mine_cells())
+
+def test_subset_rule():
+    """A 1-1 pattern along an edge proves the third cell safe even though no single number does."""
+    game = classes.GameManager(seed=0, rows=2, cols=3)
+    game.mines[:] = bytes([1, 0, 0, 0, 0, 0])
+    game.adjacent = classes.count_adjacent(game.mines, 2, 3)
+    for index in (3, 4):
+        game.hidden[index] = 0
+    engine = solver.Solver(game)
+    # (1,0) sees {(0,0), (0,1)} with 1 mine; (1,1) sees those plus (0,2) and (1,2) with 1 mine, so both extras are safe
+    assert {(0, 2), (1, 2)} <= set(engine.safe_cells())
@@ -0,0 +1,113 @@
+"""
+File: test_spectate.py
+Module: test
+Function: Tests for spectator mode: board codes, a spectator following a Frontend over a Unix socket,
+          and slow spectators being resynchronized instead of blocking the game.
+Inputs:
+    - src.spectate, src.tui.run_tui, bench.fake_screen
+Outputs:
+    - When run with pytest, the test results.
+"""
+import curses
+import json
+import socket
+import time
+import pytest
+from bench.fake_screen import FakeScreen
+from src import engine
+from src.spectate import Broadcaster, Spectator, board_codes, cell_code
+from src.tui.run_tui import Frontend
+
+def follow(sock_file, spectator, until):
+    """Apply messages from the socket until until(spectator) holds"""
+    while not until(spectator):
+        spectator.apply(json.loads(sock_file.readline()))
+
+@pytest.mark.parametrize("backend", ["bytes", "bitboard"])
+def test_board_codes_match_render(backend):
+    game = engine.new_game(seed=5, rows=12, cols=15, mines=30, backend=backend, safe_first_click=True)
+    engine.play_moves(game, [("reveal", 6, 7), ("flag", 0, 0)])
+    codes = board_codes(game)
+    assert codes == engine.render(game).replace("\n", "")
+    assert all(codes[r * 15 + c] == cell_code(game, r, c) for r in range(12) for c in range(15))
+
+def test_spectator_follows_the_game(tmp_path):
+    """A spectator gets a snapshot on joining, then diffs that keep its board equal to the game's."""
+    path = str(tmp_path / "game.sock")
+    frontend = Frontend(FakeScreen(40, 120), 12, 12, spectate_path=path)
+    gm = frontend.game_manager
+    gm.set_total_mines(20)
+    gm.remaining_flag_count = 20
+    try:
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(path)
+            sock_file = sock.makefile("rb")
+            spectator = Spectator()
+            follow(sock_file, spectator, lambda s: s.rows == 12)
+
+            for key in (curses.KEY_DOWN, curses.KEY_RIGHT, ord(' '), curses.KEY_RIGHT, ord('f')):
+                frontend.process_input(key)
+                frontend.publish_changes()
+                frontend.draw_board()
+            expected = board_codes(gm)
+            follow(sock_file, spectator, lambda s: s.cells.decode() == expected)
+            assert spectator.cursor == (frontend.cur_r, frontend.cur_c)
+            assert spectator.flags == gm.remaining_flag_count
+    finally:
+        frontend.stop_spectating()
+
+def test_slow_spectator_is_resynced_without_blocking(tmp_path):
+    """A spectator that stops reading has its backlog replaced by a snapshot; publishing never waits on it."""
+    path = str(tmp_path / "slow.sock")
+    state = {"cells": "#" * 4}
+    broadcaster = Broadcaster(path, lambda: {"type": "snapshot", "rows": 2, "cols": 2, "cells": state["cells"],
+                                             "cursor": [0, 0], "status": "PLAYING", "flags": 0},
+                              buffer_messages=4)
+    broadcaster.start()
+    try:
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(path)
+            sock_file = sock.makefile("rb")
+            spectator = Spectator()
+            follow(sock_file, spectator, lambda s: s.rows == 2)
+
+            # Large messages fill the socket buffers while the spectator is not reading
+            padding = [[0, 0, "#"]] * 2_000
+            start = time.perf_counter()
+            for _ in range(300):
+                broadcaster.publish({"type": "diff", "cells": padding, "cursor": [0, 0], "status": "PLAYING", "flags": 0})
+            state["cells"] = "1F.."
+            broadcaster.publish({"type": "diff", "cells": [[0, 0, "1"], [0, 1, "F"], [1, 0, "."], [1, 1, "."]],
+                                 "cursor": [1, 1], "status": "PLAYING", "flags": 0})
+            assert time.perf_counter() - start < 1.0
+
+            follow(sock_file, spectator, lambda s: s.cells == b"1F..")
+            assert broadcaster.resyncs > 0
+    finally:
+        broadcaster.close()
+
+def test_unusable_socket_path_raises_instead_of_hanging(tmp_path):
+    """A socket that cannot be created fails start() with the error instead of blocking it forever."""
+    broadcaster = Broadcaster(str(tmp_path / "missing" / "game.sock"), dict)
+    with pytest.raises(OSError):
+        broadcaster.start()
+    assert broadcaster.thread is None
+
+def test_regular_file_at_the_socket_path_is_kept(tmp_path):
+    """start() refuses to replace a file that is not a socket, and leaves it untouched."""
+    notes = tmp_path / "notes.txt"
+    notes.write_text("keep me")
+    with pytest.raises(ValueError, match="not a socket"):
+        Broadcaster(str(notes), dict).start()
+    assert notes.read_text() == "keep me"
+
+def test_stale_socket_is_replaced(tmp_path):
+    """A socket file left behind by an earlier game is removed and listened on again."""
+    path = str(tmp_path / "game.sock")
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(path)
+    stale.close()
+    broadcaster = Broadcaster(path, dict)
+    broadcaster.start()
+    broadcaster.close()
+    assert not (tmp_path / "game.sock").exists()
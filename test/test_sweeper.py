@@ -13,6 +13,8 @@ Date: 9/4/2025
 NOTE: All code in the file was authored by 1 or more of the authors. No outside sources were used for code
 """
 from src import main, classes
+from src.backends import new_game_manager
+import random
 import pytest # Our testing library
 
 @pytest.fixture
@@ -25,7 +27,33 @@ def fresh_game():
 def test_new_game(fresh_game):
     """When a new game starts, ensure that we initialize to the WELCOME state."""
     assert fresh_game.game_status == classes.GameStatus.WELCOME
-    
+
+def test_grid_views_share_board_buffers(fresh_game):
+    """Cells handed out by grid[r][c] read and write the GameManager's flat buffers."""
+    cell = fresh_game.grid[2][3]
+    cell.flagged = True
+    cell.state = classes.CellState.MINED
+    assert fresh_game.flagged[2 * fresh_game.cols + 3] == 1
+    assert fresh_game.grid[2][3].has_mine()
+    assert len(fresh_game.grid) == fresh_game.rows and len(fresh_game.grid[0]) == fresh_game.cols
+    assert sum(1 for row in fresh_game.grid for cell in row if cell.is_hidden()) == fresh_game.rows * fresh_game.cols
+
+def test_mine_generation_avoids_first_click():
+    """Mines are placed after the first click, never on the clicked cell, and counted by their neighbors."""
+    game = classes.GameManager(seed=1234)
+    game.set_total_mines(20)
+    game.handle_clicked_cell(4, 4)
+    assert sum(game.mines) == 20
+    assert not game.grid[4][4].has_mine()
+    for r in range(game.rows):
+        for c in range(game.cols):
+            if game.grid[r][c].has_mine():
+                continue
+            around = sum(game.grid[r + dr][c + dc].has_mine()
+                         for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                         if (dr or dc) and 0 <= r + dr < game.rows and 0 <= c + dc < game.cols)
+            assert game.grid[r][c].adjacent == around
+
 # # TESTS TO WRITE
 #
 # - random mine generation 
@@ -39,3 +67,131 @@ def test_new_game(fresh_game):
 #     - display remaining flag count 
 # - mine count reduces correctly 
 # - check initial game setup 
+
+def reference_rec_reveal(game, i, j):
+    """The original recursive reveal, kept here to check the iterative flood fill against it."""
+    cell = game.grid[i][j]
+    if not cell.hidden or cell.has_flag():
+        return
+    cell.hidden = False
+    if cell.adjacent > 0:
+        return
+    for adj_row in (-1, 0, 1):
+        for adj_col in (-1, 0, 1):
+            if (adj_row or adj_col) and 0 <= i + adj_row < game.rows and 0 <= j + adj_col < game.cols:
+                reference_rec_reveal(game, i + adj_row, j + adj_col)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_flood_fill_matches_recursive_reveal(seed):
+    """The iterative flood fill reveals exactly what the old recursive version did, and reports it."""
+    game = classes.GameManager(seed=seed, rows=16, cols=16)
+    game.set_total_mines(30)
+    game.handle_first_click(0, 0)
+    game.remaining_flag_count = 30
+    game.place_flag(8, 8)
+
+    expected = classes.GameManager(seed=seed, rows=16, cols=16)
+    expected.mines[:], expected.adjacent[:], expected.flagged[:] = game.mines, game.adjacent, game.flagged
+    reference_rec_reveal(expected, 0, 0)
+
+    revealed = game.rec_reveal(0, 0)
+    assert game.hidden == expected.hidden
+    assert sorted(revealed) == sorted(divmod(i, 16) for i in range(16 * 16) if not game.hidden[i])
+    assert len(set(revealed)) == len(revealed)
+
+def test_flood_fill_has_no_recursion_limit():
+    """A board with a single mine opens almost entirely in one click without a RecursionError."""
+    game = classes.GameManager(seed=7, rows=300, cols=300)
+    game.set_total_mines(1)
+    revealed = game.handle_clicked_cell(150, 150)
+    assert game.game_status == classes.GameStatus.WIN
+    assert len(revealed) == 300 * 300 - 1
+
+@pytest.mark.parametrize("seed", range(10))
+def test_hidden_safe_counter_tracks_board(seed):
+    """The running hidden safe cell count matches a full scan after every click, with debug checks on."""
+    game = classes.GameManager(seed=seed, debug=True)
+    game.set_total_mines(12)
+    order = random.Random(seed).sample(range(game.size), game.size)
+    for index in order:
+        if game.game_status not in (classes.GameStatus.WELCOME, classes.GameStatus.PLAYING):
+            break
+        if game.is_first_click or not game.mines[index]:
+            game.handle_clicked_cell(*divmod(index, game.cols))
+        assert game.hidden_safe_cells == game.count_hidden_safe_cells()
+    assert game.game_status == classes.GameStatus.WIN
+
+@pytest.mark.parametrize("backend", ["bytes", "bitboard"])
+def test_lost_game_is_not_a_win(backend):
+    """Losing reveals the board but keeps the count of safe cells never found, so check_win stays False."""
+    game = new_game_manager(backend, seed=4, rows=9, cols=9, debug=True)
+    game.set_total_mines(10)
+    game.handle_clicked_cell(4, 4)
+    left = game.hidden_safe_cells
+    mine = next(divmod(index, 9) for index in range(game.size) if game.mines[index])
+    game.handle_clicked_cell(*mine)
+    assert game.game_status == classes.GameStatus.LOSE
+    assert game.hidden_safe_cells == left > 0
+    assert not game.check_win()
+
+def test_debug_mode_catches_counter_drift(fresh_game):
+    """In debug mode a counter that disagrees with the board raises instead of reporting a bad result."""
+    fresh_game.debug = True
+    fresh_game.hidden_safe_cells -= 1
+    with pytest.raises(RuntimeError):
+        fresh_game.check_win()
+
+def test_generation_is_deterministic_and_respects_safe_zone():
+    """The same seed gives the same board every time, and safe_first_click keeps the 3x3 block clear."""
+    boards = []
+    for _ in range(2):
+        game = classes.GameManager(seed=99, rows=9, cols=9)
+        game.set_total_mines(72)
+        game.safe_first_click = True
+        game.generate_mines(0, 8)
+        boards.append((bytes(game.mines), bytes(game.adjacent)))
+        assert sum(game.mines) == 72
+        assert not any(game.mines[pos] for pos in classes.surrounding_positions(0, 8, 9, 9))
+    assert boards[0] == boards[1]
+
+def test_sample_mine_positions_skips_excluded():
+    """Every allowed position can be drawn and excluded positions never are."""
+    positions = classes.sample_mine_positions(random.Random(0), 12, 9, excluded=[0, 5, 11])
+    assert sorted(positions) == [1, 2, 3, 4, 6, 7, 8, 9, 10]
+
+def opened_game(seed=3):
+    """A 12x12 game with its first click made, plus a revealed number whose neighbors are not all revealed"""
+    game = classes.GameManager(seed=seed, rows=12, cols=12)
+    game.set_total_mines(20)
+    game.total_flags = game.remaining_flag_count = 20
+    game.handle_clicked_cell(6, 6)
+    for index in range(game.size):
+        r, c = divmod(index, 12)
+        around = classes.surrounding_positions(r, c, 12, 12)
+        if not game.hidden[index] and game.adjacent[index] and any(game.hidden[n] for n in around):
+            return game, (r, c), around
+    raise AssertionError("no numbered frontier cell")
+
+def test_chord_reveals_unflagged_neighbors():
+    """With the right flags in place, a chord reveals every other neighbor and nothing happens without them."""
+    game, (r, c), around = opened_game()
+    assert game.chord(r, c) == []
+    for n in around:
+        if game.mines[n]:
+            game.place_flag(*divmod(n, 12))
+    revealed = game.chord(r, c)
+    assert revealed
+    assert all(not game.hidden[n] for n in around if not game.mines[n])
+    assert game.hidden_safe_cells == game.count_hidden_safe_cells()
+
+def test_chord_with_a_wrong_flag_loses():
+    """A flag on a safe cell means the chord reveals a mine."""
+    game, (r, c), around = opened_game()
+    safe = [n for n in around if game.hidden[n] and not game.mines[n]]
+    mines = [n for n in around if game.mines[n]]
+    if not safe:
+        pytest.skip("no hidden safe neighbor to misflag")
+    for n in [safe[0]] + mines[1:]:
+        game.place_flag(*divmod(n, 12))
+    game.chord(r, c)
+    assert game.game_status == classes.GameStatus.LOSE
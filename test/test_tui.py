@@ -0,0 +1,97 @@
+"""
+File: test_tui.py
+Module: test
+Function: Tests for the curses frontend, driven through an in-memory screen instead of a terminal.
+Inputs:
+    - src.tui.run_tui, bench.fake_screen
+Outputs:
+    - When run with pytest, the test results.
+"""
+import curses
+import threading
+from bench.fake_screen import FakeScreen
+from src.tui.run_tui import Frontend
+
+def make_frontend(rows=10, cols=10, mines=10, height=40, width=120):
+    """A Frontend on a FakeScreen with the mine count already chosen"""
+    frontend = Frontend(FakeScreen(height, width), rows, cols)
+    frontend.game_manager.set_total_mines(mines)
+    frontend.game_manager.remaining_flag_count = mines
+    return frontend
+
+def test_chord_key_reveals_neighbors_in_one_frame():
+    """'c' on a satisfied number reveals its neighbors and only those cells are redrawn."""
+    frontend = make_frontend(rows=12, cols=12, mines=20)
+    gm = frontend.game_manager
+    frontend.cur_r, frontend.cur_c = 6, 6
+    frontend.process_input(ord(' '))
+    frontend.draw_board()
+
+    # Flag the mines around the first number bordering hidden cells, then chord on it
+    for index in range(gm.size):
+        r, c = divmod(index, 12)
+        around = [(rr, cc) for rr in range(max(r - 1, 0), min(r + 2, 12)) for cc in range(max(c - 1, 0), min(c + 2, 12))]
+        if not gm.hidden[index] and gm.adjacent[index] and any(gm.hidden[rr * 12 + cc] for rr, cc in around):
+            break
+    for rr, cc in around:
+        if gm.mines[rr * 12 + cc]:
+            gm.place_flag(rr, cc)
+    frontend.cur_r, frontend.cur_c = r, c
+    frontend.process_input(ord('c'))
+    assert frontend.dirty_cells
+    assert all(not gm.hidden[rr * 12 + cc] for rr, cc in around if not gm.mines[rr * 12 + cc])
+
+def test_step_applies_a_burst_of_keys_in_one_frame():
+    """All queued keys are applied in order before a single frame is drawn, and blocking input is restored."""
+    frontend = make_frontend()
+    frontend.draw_board()
+    frames = []
+    draw = frontend.draw_board
+    frontend.draw_board = lambda: frames.append(draw())
+    frontend.stdscr.push_keys([curses.KEY_RIGHT] * 3 + [curses.KEY_DOWN] * 2)
+    assert frontend.step()
+    assert (frontend.cur_r, frontend.cur_c) == (2, 3)
+    assert len(frames) == 1
+    assert not frontend.stdscr.keys
+
+def test_step_stops_the_batch_at_quit():
+    """Keys after a quit are not applied."""
+    frontend = make_frontend()
+    frontend.stdscr.push_keys([curses.KEY_RIGHT, ord('q'), curses.KEY_RIGHT])
+    assert not frontend.step()
+    assert frontend.cur_c == 1
+
+def generating_frontend():
+    """A frontend whose board generation runs in the background until the returned event is set"""
+    frontend = make_frontend(rows=20, cols=20, mines=40)
+    ready = threading.Event()
+    frontend.game_manager.pregenerate = True
+    frontend.game_manager.pregen_thread = threading.Thread(target=ready.wait, daemon=True)
+    frontend.game_manager.pregen_thread.start()
+    return frontend, ready
+
+def test_click_during_generation_waits_without_blocking_input():
+    """A reveal clicked while the board generates is held back while the cursor keeps moving, then applied."""
+    frontend, ready = generating_frontend()
+    gm = frontend.game_manager
+    frontend.stdscr.push_keys([ord(' '), curses.KEY_RIGHT, curses.KEY_DOWN])
+    assert frontend.step()
+    assert frontend.pending_click == (0, 0)
+    assert (frontend.cur_r, frontend.cur_c) == (1, 1)
+    assert gm.is_first_click
+    assert "Generating board" in frontend.stdscr.window.text_at(frontend.stdscr.getmaxyx()[0] - 2, 0)
+
+    # Once the board is ready, the next (idle) step applies the held click
+    ready.set()
+    gm.pregen_thread.join()
+    assert frontend.step()
+    assert frontend.pending_click is None
+    assert not gm.is_first_click and not gm.hidden[0]
+
+def test_quit_during_generation():
+    """'q' quits right away while the board is still generating."""
+    frontend, ready = generating_frontend()
+    frontend.stdscr.push_keys([ord(' '), ord('q')])
+    assert not frontend.step()
+    assert frontend.game_manager.is_first_click
+    ready.set()
@@ -0,0 +1,50 @@
+"""
+File: test_viewport.py
+Module: test
+Function: Tests for configurable board sizes and the scrolling viewport that shows boards bigger than the terminal.
+Inputs:
+    - src.tui.run_tui, src.main, bench.fake_screen
+Outputs:
+    - When run with pytest, the test results.
+"""
+import curses
+import pytest
+from src.main import parse_args
+from test.test_tui import make_frontend
+
+def test_viewport_scrolls_and_maps_mouse_through_offset():
+    """On a board bigger than the screen the viewport follows the cursor and clicks map to board cells."""
+    frontend = make_frontend(rows=200, cols=200, mines=4000, height=30, width=80)
+    frontend.draw_board()
+    for _ in range(150):
+        frontend.process_input(curses.KEY_DOWN)
+    frontend.draw_board()
+    off_y, off_x, view_rows, _ = frontend.viewport(30, 80)
+    assert frontend.view_r == 150 - view_rows + 1
+    assert frontend.mouse_to_cell(off_x, off_y) == (frontend.view_r, 0)
+
+def test_frame_cost_depends_on_the_screen_not_the_board():
+    """A full redraw of a 1000x1000 board costs the same curses calls as a 100x100 board on the same screen."""
+    costs = []
+    for size in (100, 1000):
+        frontend = make_frontend(rows=size, cols=size, mines=size * size // 10, height=30, width=80)
+        frontend.draw_board()
+        costs.append(frontend.frame_calls)
+    assert costs[0] == costs[1]
+
+def test_mouse_outside_the_viewport_is_ignored():
+    frontend = make_frontend(rows=200, cols=200, mines=4000, height=30, width=80)
+    frontend.draw_board()
+    off_y, off_x, view_rows, view_cols = frontend.viewport(30, 80)
+    assert frontend.mouse_to_cell(off_x - 1, off_y) is None
+    assert frontend.mouse_to_cell(off_x, off_y + view_rows) is None
+    assert frontend.mouse_to_cell(off_x + (view_cols - 1) * 3, off_y + view_rows - 1) == (view_rows - 1, view_cols - 1)
+
+def test_board_size_options():
+    """--rows/--cols size the board; a board needs at least one row and column."""
+    args = parse_args(["--rows", "500", "--cols", "300"])
+    assert (args.rows, args.cols) == (500, 300)
+    frontend = make_frontend(rows=args.rows, cols=args.cols, mines=1000)
+    assert (frontend.game_manager.rows, frontend.game_manager.cols) == (500, 300)
+    with pytest.raises(SystemExit):
+        parse_args(["--rows", "0"])